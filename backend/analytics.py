@@ -0,0 +1,235 @@
+import threading
+from collections import Counter
+from datetime import datetime
+
+from candidates import to_number
+from matching import normalize_skills
+
+# ============================
+# Recruitment Analytics
+# ============================
+# Running aggregates over every application: counts per status and per
+# job, applications per day, positions, skills, experience buckets and
+# time spent in each pipeline stage. Each application's contribution is
+# remembered, so when the store's write sequence shows a record changed,
+# its old contribution is subtracted and the new one added. Aggregates
+# catch up lazily on read: each analytics request syncs first, so writes
+# never pay for them. Syncing costs O(changed records).
+#
+# Time-in-stage comes from the statusHistory the store keeps on every
+# status change; only finished stages (ones the application has moved
+# out of) are counted. rebuild() recomputes everything from scratch, with
+# pandas when it is installed, for backfills or after changing buckets.
+EXPERIENCE_BUCKETS = ((0, 1, "0-1"), (1, 3, "1-3"), (3, 5, "3-5"), (5, 10, "5-10"), (10, None, "10+"))
+
+
+def experience_bucket(value):
+    years = to_number(value)
+    if years is None:
+        return None
+    for low, high, label in EXPERIENCE_BUCKETS:
+        if years >= low and (high is None or years < high):
+            return label
+    return None
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def stage_durations(record):
+    """[(status, seconds)] for each stage the application has already left"""
+    history = record.get("statusHistory") or []
+    stages = []
+    for entered, left in zip(history, history[1:]):
+        start, end = _parse_time(entered.get("at")), _parse_time(left.get("at"))
+        if start and end and end >= start:
+            stages.append((entered.get("status"), (end - start).total_seconds()))
+    return stages
+
+
+def hire_seconds(record):
+    """Seconds from applying to being hired, or None"""
+    for entry in record.get("statusHistory") or []:
+        if entry.get("status") == "hired":
+            start, end = _parse_time(record.get("appliedDate")), _parse_time(entry.get("at"))
+            if start and end:
+                return (end - start).total_seconds()
+    return None
+
+
+def contribution(record):
+    data = record.get("structured_data") or {}
+    return {
+        "status": record.get("status") or "unknown",
+        "job": record.get("jobId"),
+        "day": str(record.get("appliedDate") or "")[:10] or None,
+        "position": record.get("position"),
+        "skills": tuple(sorted(normalize_skills(data.get("Skills")))) if data else (),
+        "experience": experience_bucket(data.get("Years of Experience")) if data else None,
+        "stages": tuple(stage_durations(record)),
+        "hire": hire_seconds(record),
+    }
+
+
+class RecruitmentAnalytics:
+    def __init__(self):
+        self.seq = 0
+        self._contributions = {}  # application id -> contribution
+        self._lock = threading.RLock()
+        # One sync at a time, so an older read can't overwrite a newer one or move seq back
+        self._sync_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.statuses = Counter()
+        self.jobs = {}              # job id -> Counter(status)
+        self.daily = Counter()
+        self.positions = Counter()
+        self.skills = Counter()
+        self.experience = Counter()
+        self.stage_seconds = Counter()
+        self.stage_counts = Counter()
+        self.hire_total = 0.0
+        self.hire_count = 0
+
+    # ----- maintenance -----
+    def sync(self, store):
+        """Fold in applications written since the last sync"""
+        with self._sync_lock:
+            records, seq = store.applications_changed_since(self.seq)
+            if records:
+                with self._lock:
+                    for record in records:
+                        self.upsert(record)
+                    self.seq = seq
+        return len(records)
+
+    def upsert(self, record):
+        with self._lock:
+            old = self._contributions.get(record["id"])
+            if old:
+                self._apply(old, -1)
+            new = contribution(record)
+            self._contributions[record["id"]] = new
+            self._apply(new, 1)
+
+    def _apply(self, c, sign):
+        self.statuses[c["status"]] += sign
+        job = self.jobs.setdefault(c["job"], Counter())
+        job[c["status"]] += sign
+        if c["day"]:
+            self.daily[c["day"]] += sign
+        if c["position"]:
+            self.positions[c["position"]] += sign
+        for skill in c["skills"]:
+            self.skills[skill] += sign
+        if c["experience"]:
+            self.experience[c["experience"]] += sign
+        for status, seconds in c["stages"]:
+            self.stage_seconds[status] += sign * seconds
+            self.stage_counts[status] += sign
+        if c["hire"] is not None:
+            self.hire_total += sign * c["hire"]
+            self.hire_count += sign
+
+    def rebuild(self, store):
+        """Recompute every aggregate from the full store; returns the method used"""
+        with self._sync_lock, self._lock:
+            records, seq = store.applications_changed_since(0)
+            self._contributions = {r["id"]: contribution(r) for r in records}
+            self._reset()
+            try:
+                import pandas  # noqa: F401
+            except ImportError:
+                for c in self._contributions.values():
+                    self._apply(c, 1)
+                method = "python"
+            else:
+                self._rebuild_frame(list(self._contributions.values()))
+                method = "pandas"
+            self.seq = seq
+            return {"method": method, "applications": len(records)}
+
+    def _rebuild_frame(self, contributions):
+        import pandas as pd
+
+        if not contributions:
+            return
+        df = pd.DataFrame(contributions)
+        self.statuses = _counts(df["status"])
+        for (job, status), count in df.groupby(["job", "status"], dropna=False).size().items():
+            self.jobs.setdefault(None if pd.isna(job) else job, Counter())[status] = int(count)
+        self.daily = _counts(df["day"])
+        self.positions = _counts(df["position"])
+        self.skills = _counts(df["skills"].explode())
+        self.experience = _counts(df["experience"])
+        stages = df["stages"].explode().dropna()
+        if len(stages):
+            frame = pd.DataFrame(stages.tolist(), columns=["status", "seconds"])
+            grouped = frame.groupby("status")["seconds"]
+            self.stage_seconds = Counter({k: float(v) for k, v in grouped.sum().items()})
+            self.stage_counts = Counter({k: int(v) for k, v in grouped.size().items()})
+        hires = df["hire"].dropna()
+        self.hire_total = float(hires.sum())
+        self.hire_count = int(hires.size)
+
+    # ----- reading -----
+    def summary(self):
+        with self._lock:
+            total = sum(self.statuses.values())
+            return {
+                "totalApplications": total,
+                "activeJobs": sum(1 for job, counts in self.jobs.items() if job and +counts),
+                "candidatesHired": self.statuses["hired"],
+                "averageDaysToHire": round(self.hire_total / self.hire_count / 86400, 1) if self.hire_count else None,
+                "statusDistribution": _distribution(self.statuses, total, "status"),
+            }
+
+    def job(self, job_id):
+        with self._lock:
+            counts = +self.jobs.get(job_id, Counter())
+            return {"jobId": job_id, "total": sum(counts.values()), "statuses": dict(counts)}
+
+    def time_in_stage(self):
+        with self._lock:
+            return [
+                {"status": status, "transitions": count, "averageHours": round(self.stage_seconds[status] / count / 3600, 2)}
+                for status, count in self.stage_counts.items() if count > 0
+            ]
+
+    def per_day(self, days=None):
+        with self._lock:
+            items = sorted((day, count) for day, count in self.daily.items() if count > 0)
+            if days:
+                items = items[-days:]
+            return [{"date": day, "count": count} for day, count in items]
+
+    def top_skills(self, limit=20):
+        with self._lock:
+            return [{"skill": s, "count": c} for s, c in self.skills.most_common(limit) if c > 0]
+
+    def experience_distribution(self):
+        with self._lock:
+            return [{"range": label, "count": self.experience[label]} for _, _, label in EXPERIENCE_BUCKETS]
+
+    def roles(self, limit=20):
+        with self._lock:
+            return [{"role": r, "count": c} for r, c in self.positions.most_common(limit) if c > 0]
+
+
+def _counts(series):
+    return Counter({key: int(count) for key, count in series.dropna().value_counts().items()})
+
+
+def _distribution(counts, total, label):
+    return [
+        {label: key, "count": count, "percentage": round(100 * count / total) if total else 0}
+        for key, count in counts.most_common() if count > 0
+    ]
+
+
+recruitment_analytics = RecruitmentAnalytics()
@@ -0,0 +1,384 @@
+"""
+End-to-end benchmark of the HireEase API against stubbed upstreams.
+
+Starts local stand-ins for LlamaParse, Gemini and the Apps Script web app
+(with configurable latency and error injection), boots the backend under
+uvicorn on a fresh database, and runs each scenario with a pool of
+concurrent clients:
+
+    apply          concurrent /apply/ uploads, plus the time to drain the pipeline
+    reads_<n>      paged /applications reads at each dataset size
+    full_<n>       unpaged /applications at each dataset size
+    shortlist_<n>  /shortlist filters at each dataset size
+    search_<n>     /search free-text queries at each dataset size (after /search/reindex)
+    rounds         rounds CRUD (bulk create, list, move, reorder, delete)
+
+Results (req/s and latency percentiles per scenario) are printed and
+written as JSON; --compare prints the change against an earlier run.
+
+    python benchmarks/bench_api.py --sizes 1000,10000,100000 --concurrency 16
+    python benchmarks/bench_api.py --scenarios apply --gemini-latency 0.8 --error-rate 0.05
+    python benchmarks/bench_api.py --compare benchmarks/results/bench-<old>.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+from uuid import uuid4
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, HERE)
+
+from storage import SQLiteStore
+from bench_shortlist import synthetic_candidate, POSITIONS
+from stub_llamaparse import StubLlamaParse
+from stub_gemini import StubGemini
+from stub_apps_script import StubAppsScript
+
+JOB_IDS = [f"bench-job-{i}" for i in range(20)]
+SHORTLIST_FILTERS = [
+    {"Years of Experience": {">=": 5}},
+    {"Skills": {"contains": "python"}},
+    {"Skills": {"contains": "python"}, "Years of Experience": {">=": 3, "<=": 6}},
+    {"Preferred Location": {"=": "Remote"}},
+]
+SEARCH_QUERIES = [
+    "backend engineer python kafka streaming",
+    "react typescript frontend developer",
+    "data scientist machine learning sql",
+    "devops kubernetes docker aws",
+]
+
+
+# ============================
+# Load generation
+# ============================
+def run_load(name, request, total, concurrency):
+    """Call ``request(session, i)`` ``total`` times from ``concurrency`` clients"""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    local = threading.local()
+    counter = iter(range(total))
+
+    def client():
+        nonlocal errors
+        local.session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            try:
+                request(local.session, i)
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    return summarize(name, latencies, errors, time.perf_counter() - start, concurrency)
+
+
+def summarize(name, latencies, errors, seconds, concurrency):
+    ordered = sorted(latencies) or [0.0]
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+    }
+
+
+def check(resp):
+    resp.raise_for_status()
+    return resp
+
+
+# ============================
+# Scenarios
+# ============================
+def seed(store, start, count):
+    """Insert applications ``start``..``start + count`` with structured data"""
+    now = datetime.now().isoformat()
+    batch = []
+    for i in range(start, start + count):
+        data = synthetic_candidate(i)
+        batch.append({
+            "id": f"bench-{i}",
+            "jobId": random.choice(JOB_IDS),
+            "position": data["Position Applied"],
+            "company": "HireEase",
+            "status": random.choice(["applied", "screening", "interview", "hired", "rejected"]),
+            "appliedDate": now,
+            "lastUpdate": now,
+            "structured_data": data,
+        })
+        if len(batch) == 1000:
+            store.insert_applications(batch)
+            batch = []
+    if batch:
+        store.insert_applications(batch)
+
+
+def scanned_pdf():
+    # No text layer, so local extraction scores 0 and LlamaParse is used
+    return b"%PDF-1.4\n%" + uuid4().hex.encode() + b"\n" + os.urandom(2048)
+
+
+def scenario_apply(url, args):
+    def apply(session, i):
+        check(session.post(
+            f"{url}/apply/",
+            params={"jobId": random.choice(JOB_IDS), "position": random.choice(POSITIONS), "company": "HireEase"},
+            files={"file": (f"resume-{i}.pdf", scanned_pdf(), "application/pdf")},
+            timeout=60,
+        ))
+
+    start = time.perf_counter()
+    result = run_load("apply", apply, args.applies, args.concurrency)
+    # End to end: until every queued application has been processed
+    deadline = time.monotonic() + args.drain_timeout
+    pending = None
+    while time.monotonic() < deadline:
+        pending = len(check(requests.get(f"{url}/applications", params={"status": "processing", "fields": "id"})).json())
+        if not pending:
+            break
+        time.sleep(0.25)
+    drained = time.perf_counter() - start
+    result["pipeline_seconds"] = round(drained, 3)
+    result["pipeline_per_second"] = round(args.applies / drained, 2)
+    result["pipeline_pending"] = pending
+    return [result]
+
+
+def scenario_reads(url, args, size):
+    def page(session, i):
+        params = {"limit": 50, "fields": "id,jobId,position,status,appliedDate"}
+        if i % 2:
+            params["jobId"] = random.choice(JOB_IDS)
+        check(session.get(f"{url}/applications", params=params, timeout=60))
+
+    def full(session, i):
+        check(session.get(f"{url}/applications", timeout=300))
+
+    return [
+        run_load(f"reads_{size}", page, args.requests, args.concurrency),
+        run_load(f"full_{size}", full, args.full_requests, min(args.concurrency, 4)),
+    ]
+
+
+def scenario_shortlist(url, args, size):
+    def shortlist(session, i):
+        filters = SHORTLIST_FILTERS[i % len(SHORTLIST_FILTERS)]
+        check(session.post(f"{url}/shortlist", json={"filters": filters, "limit": 50}, timeout=60))
+
+    return [run_load(f"shortlist_{size}", shortlist, args.requests, args.concurrency)]
+
+
+def scenario_search(url, args, size):
+    start = time.perf_counter()
+    embedded = check(requests.post(f"{url}/search/reindex", timeout=3600)).json()["embedded"]
+    print(f"  search reindex: {embedded} applications embedded in {time.perf_counter() - start:.1f}s")
+
+    def search(session, i):
+        params = {"q": SEARCH_QUERIES[i % len(SEARCH_QUERIES)], "k": 20}
+        check(session.get(f"{url}/search", params=params, timeout=60))
+
+    return [run_load(f"search_{size}", search, args.requests, args.concurrency)]
+
+
+def scenario_rounds(url, args):
+    round_body = {"type": "technical", "description": "Benchmark round", "duration": 45}
+
+    def cycle(session, i):
+        job_id = f"bench-rounds-{i % args.concurrency}"
+        created = check(session.post(f"{url}/rounds/bulk", json={
+            "jobId": job_id, "rounds": [{**round_body, "jobId": job_id, "name": f"R{n}"} for n in range(3)],
+        }, timeout=30)).json()
+        rounds = check(session.get(f"{url}/rounds", params={"job_id": job_id}, timeout=30)).json()
+        check(session.put(f"{url}/rounds/{created[0]['id']}", json={**round_body, "jobId": job_id, "name": "R0", "order": 2}, timeout=30))
+        ids = [r["id"] for r in rounds]
+        random.shuffle(ids)
+        check(session.post(f"{url}/rounds/reorder", json={"jobId": job_id, "roundIds": ids}, timeout=30))
+        for r in created:
+            check(session.delete(f"{url}/rounds/{r['id']}", timeout=30))
+
+    return [run_load("rounds", cycle, args.requests // 8 or 1, args.concurrency)]
+
+
+# ============================
+# Harness
+# ============================
+def start_stubs(args):
+    llamaparse = StubLlamaParse(args.llamaparse_min, args.llamaparse_max, args.error_rate)
+    gemini = StubGemini(args.gemini_latency, args.error_rate)
+    sheets = StubAppsScript(args.sheets_latency, args.error_rate)
+    return {"llamaparse": (llamaparse, llamaparse.start()), "gemini": (gemini, gemini.start()),
+            "sheets": (sheets, sheets.start())}
+
+
+def start_backend(args, workdir, stubs):
+    env = dict(os.environ)
+    env.update({
+        "HIREEASE_DB": os.path.join(workdir, "bench.db"),
+        "CACHE_DIR": os.path.join(workdir, "cache"),
+        "LLAMAPARSE_API_KEY": "stub",
+        "LLAMAPARSE_BASE_URL": stubs["llamaparse"][1],
+        "GEMINI_API_KEY": "stub",
+        "GEMINI_API_ENDPOINT": stubs["gemini"][1],
+        "SHEETS_WEBAPP_URL": stubs["sheets"][1],
+        "APPS_SCRIPT_URL": stubs["sheets"][1],
+        "LLM_RATE_PER_MINUTE": str(args.llm_rate),
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", BACKEND, "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1).raise_for_status()
+            return process, url
+        except requests.RequestException:
+            if process.poll() is not None:
+                raise SystemExit("backend exited during startup")
+            time.sleep(0.25)
+    process.terminate()
+    raise SystemExit("backend did not start within 60s")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results):
+    print(f"{'scenario':22s} {'reqs':>6s} {'err':>4s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for r in results:
+        print(f"{r['scenario']:22s} {r['requests']:6d} {r['errors']:4d} {r['rps']:8.1f} "
+              f"{r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f}")
+        if "pipeline_seconds" in r:
+            print(f"{'  pipeline drained':22s} in {r['pipeline_seconds']}s ({r['pipeline_per_second']} applications/s)")
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+    print(f"\nvs {baseline_path}")
+    for r in results:
+        old = baseline.get(r["scenario"])
+        if not old:
+            continue
+        rps = (r["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        p95 = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        print(f"{r['scenario']:22s} req/s {rps:+7.1f}%   p95 {p95:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="apply,reads,shortlist,search,rounds")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="dataset sizes for reads/shortlist/search")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per read/shortlist scenario")
+    parser.add_argument("--full-requests", type=int, default=10, help="requests for the unpaged listing")
+    parser.add_argument("--applies", type=int, default=200)
+    parser.add_argument("--drain-timeout", type=float, default=300)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--llamaparse-min", type=float, default=0.2)
+    parser.add_argument("--llamaparse-max", type=float, default=1.0)
+    parser.add_argument("--gemini-latency", type=float, default=0.3)
+    parser.add_argument("--sheets-latency", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="injected upstream failure rate")
+    parser.add_argument("--llm-rate", type=float, default=6000, help="LLM_RATE_PER_MINUTE for the backend")
+    parser.add_argument("--out", help="results file (default benchmarks/results/bench-<rev>-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    random.seed(7)
+    scenarios = args.scenarios.split(",")
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s)
+    workdir = tempfile.mkdtemp(prefix="hireease-bench-")
+    stubs = start_stubs(args)
+    process, url = start_backend(args, workdir, stubs)
+    results = []
+    try:
+        if "apply" in scenarios:
+            results += scenario_apply(url, args)
+        if {"reads", "shortlist", "search"} & set(scenarios):
+            store = SQLiteStore(os.path.join(workdir, "bench.db"))
+            seeded = 0
+            for size in sizes:
+                seed(store, seeded, size - seeded)
+                seeded = size
+                if "reads" in scenarios:
+                    results += scenario_reads(url, args, size)
+                if "shortlist" in scenarios:
+                    results += scenario_shortlist(url, args, size)
+                if "search" in scenarios:
+                    results += scenario_search(url, args, size)
+        if "rounds" in scenarios:
+            results += scenario_rounds(url, args)
+    finally:
+        process.terminate()
+        process.wait()
+
+    print_results(results)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+            "upstream_requests": {name: stub.requests for name, (stub, _) in stubs.items()},
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(HERE, "results", f"bench-{report['meta']['revision']}-{int(time.time())}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {out}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
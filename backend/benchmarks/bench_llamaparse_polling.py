@@ -0,0 +1,74 @@
+"""
+Compare the old fixed-interval LlamaParse polling with the shared
+CompletionTracker, against the local stub server (no network needed).
+
+    python benchmarks/bench_llamaparse_polling.py --jobs 50 --min-duration 0.2 --max-duration 4
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_llamaparse import StubLlamaParse
+
+
+def legacy_poll(job_url, job_id, max_retries=15):
+    """The original poll_result: fixed 2s sleep, fresh connection per request"""
+    import requests
+
+    for _ in range(max_retries):
+        r = requests.get(f"{job_url}/{job_id}", timeout=30)
+        status = r.json().get("status", "").lower()
+        if status in ["completed", "done", "success"]:
+            return requests.get(f"{job_url}/{job_id}/result/markdown", timeout=30).text
+        time.sleep(2)
+    raise TimeoutError("❌ Job did not finish in time")
+
+
+def run(label, stub, wait_fn, jobs, concurrency):
+    stub.requests = stub.connections = 0
+    job_ids = [stub.create_job() for _ in range(jobs)]
+    ready = {job_id: stub.jobs[job_id][0] for job_id in job_ids}
+
+    def wait(job_id):
+        wait_fn(job_id)
+        return time.monotonic() - ready[job_id]  # latency after the job was really done
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        overshoot = sorted(pool.map(wait, job_ids))
+    elapsed = time.monotonic() - start
+
+    print(f"{label}")
+    print(f"  wall time:          {elapsed:.2f}s ({jobs / elapsed:.1f} jobs/s)")
+    print(f"  completion latency: p50 {statistics.median(overshoot) * 1000:.0f}ms, "
+          f"p95 {overshoot[int(len(overshoot) * 0.95) - 1] * 1000:.0f}ms")
+    print(f"  http requests:      {stub.requests}, new connections: {stub.connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=50, help="callers waiting at once")
+    parser.add_argument("--min-duration", type=float, default=0.2)
+    parser.add_argument("--max-duration", type=float, default=4.0)
+    args = parser.parse_args()
+
+    stub = StubLlamaParse(args.min_duration, args.max_duration)
+    base_url = stub.start()
+    os.environ["LLAMAPARSE_BASE_URL"] = base_url
+
+    import llamaparse
+
+    run("fixed 2s polling (before)", stub,
+        lambda job_id: legacy_poll(llamaparse.JOB_URL, job_id), args.jobs, args.concurrency)
+    run("CompletionTracker (after)", stub, llamaparse.poll_result, args.jobs, args.concurrency)
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Time top-K job matching over a synthetic candidate pool.
+
+    python benchmarks/bench_matching.py --candidates 100000 --k 20
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import SkillIndex
+from bench_shortlist import synthetic_candidate
+
+JOBS = {
+    "niche (rust, kafka)": {"skills": ["Rust", "Kafka"], "minExperience": 3, "maxExperience": 8, "location": "Berlin"},
+    "broad (python, sql, aws)": {"skills": ["Python", "SQL", "AWS"], "minExperience": 2, "location": "Remote"},
+    "designer (figma)": {"skills": ["Figma"], "minExperience": 1, "maxExperience": 5, "location": "London"},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(7)
+    index = SkillIndex()
+    start = time.perf_counter()
+    for i in range(args.candidates):
+        index.add({"id": str(i), "jobId": "bench", "structured_data": synthetic_candidate(i)})
+    print(f"indexed {args.candidates} candidates in {time.perf_counter() - start:.2f}s")
+
+    for label, job in JOBS.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            top = index.match(job, args.k)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{label:26s} best {top[0][0]:.3f}  median {statistics.median(timings):7.2f}ms  max {max(timings):7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time shortlist queries against the local candidate table.
+
+    python benchmarks/bench_shortlist.py --candidates 100000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candidates import CandidateTable
+
+SKILLS = ["Python", "Java", "SQL", "React", "Docker", "Kubernetes", "AWS", "Go", "Rust", "Figma",
+          "Tableau", "Spark", "Kafka", "TypeScript", "Node.js", "Django", "FastAPI", "Terraform"]
+CITIES = ["Chennai", "Bengaluru", "Mountain View, CA", "London", "Berlin", "Remote"]
+POSITIONS = ["Backend Engineer", "UI/UX Designer", "Data Analyst", "Product Manager"]
+
+QUERIES = {
+    "experience >= 5": {"Years of Experience": {">=": 5}},
+    "skills contains python": {"Skills": {"contains": "python"}},
+    "python and 3-6 years": {"Skills": {"contains": "python"}, "Years of Experience": {">=": 3, "<=": 6}},
+    "location = remote": {"Preferred Location": {"=": "Remote"}},
+    "name contains 'an'": {"Full Name": {"contains": "an"}},
+}
+
+
+def synthetic_candidate(i):
+    return {
+        "Full Name": f"Candidate {i} {random.choice(['Ann', 'Raj', 'Li', 'Juan', 'Sam'])}",
+        "Email": f"candidate{i}@example.com",
+        "Phone": f"+1 555 {i:07d}",
+        "Position Applied": random.choice(POSITIONS),
+        "Years of Experience": str(random.randint(0, 20)),
+        "Skills": ", ".join(random.sample(SKILLS, random.randint(2, 8))),
+        "Preferred Location": random.choice(CITIES),
+        "Availability": "Immediate",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(7)
+    table = CandidateTable()
+    start = time.perf_counter()
+    for i in range(args.candidates):
+        table.upsert(str(i), synthetic_candidate(i))
+    print(f"built table of {args.candidates} candidates in {time.perf_counter() - start:.2f}s")
+
+    for label, filters in QUERIES.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            _, rows, total = table.query(filters, limit=50)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{label:28s} {total:7d} matches  median {statistics.median(timings):7.2f}ms  max {max(timings):7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Worker cold start: import time, memory and time to first response.
+
+Each run starts a fresh interpreter, so nothing is shared with earlier
+runs (or with this process):
+
+    import      time to `import app`, peak RSS afterwards, and which heavy
+                SDKs got imported along the way
+    cold_start  uvicorn on a fresh database, from spawning the process to
+                the first 200 from GET /, plus the worker's RSS at that point
+
+With --check the script exits 1 when the median import time exceeds
+--budget-ms or any module in HEAVY_MODULES was imported by `import app`
+(they must load on first use, not at startup), so it can gate CI.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --check --budget-ms 400
+    python benchmarks/bench_startup.py --out startup.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "400"))
+# SDKs that only some requests need; importing app must not pull them in
+HEAVY_MODULES = (
+    "google.generativeai", "google.protobuf", "grpc", "google.auth",
+    "numpy", "pandas", "sentence_transformers", "httpx", "requests",
+)
+
+IMPORT_PROBE = """
+import sys, time, json, resource
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "seconds": seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def backend_env(workdir, db):
+    path = os.pathsep.join(p for p in (BACKEND, os.getenv("PYTHONPATH")) if p)
+    return {**os.environ, "PYTHONPATH": path, "HIREEASE_DB": os.path.join(workdir, db)}
+
+
+def measure_import(workdir):
+    env = backend_env(workdir, "bench.db")
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE % (HEAVY_MODULES,)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def measure_cold_start(workdir, timeout=30):
+    port = free_port()
+    env = backend_env(workdir, f"cold-{port}.db")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                    if resp.status == 200:
+                        return {"seconds": time.perf_counter() - start, "rss_mb": rss_mb(server.pid)}
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"server did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(values):
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--check", action="store_true", help="exit 1 when over budget or a heavy SDK is imported")
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="hireease-startup-") as workdir:
+        imports = [measure_import(workdir) for _ in range(args.runs)]
+        cold = [] if args.skip_cold_start else [measure_cold_start(workdir) for _ in range(args.runs)]
+
+    import_ms = summarize([r["seconds"] * 1000 for r in imports])
+    heavy = sorted({m for r in imports for m in r["heavy"]})
+    results = {
+        "python": sys.version.split()[0],
+        "import_ms": import_ms,
+        "import_max_rss_mb": summarize([r["max_rss_mb"] for r in imports]),
+        "heavy_modules_imported": heavy,
+        "budget_ms": args.budget_ms,
+    }
+    print(f"import app      median {import_ms['median']:7.1f}ms  min {import_ms['min']:7.1f}ms  "
+          f"peak RSS {results['import_max_rss_mb']['median']:.1f}MB")
+    if cold:
+        results["cold_start_ms"] = summarize([r["seconds"] * 1000 for r in cold])
+        results["worker_rss_mb"] = summarize([r["rss_mb"] for r in cold])
+        print(f"cold start      median {results['cold_start_ms']['median']:7.1f}ms  "
+              f"worker RSS {results['worker_rss_mb']['median']:.1f}MB")
+    print(f"heavy SDKs imported by app: {', '.join(heavy) or 'none'}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.check:
+        failures = []
+        if import_ms["median"] > args.budget_ms:
+            failures.append(f"import took {import_ms['median']:.0f}ms, budget {args.budget_ms:.0f}ms")
+        if heavy:
+            failures.append(f"imported at startup: {', '.join(heavy)}")
+        for failure in failures:
+            print(f"❌ {failure}")
+        if failures:
+            sys.exit(1)
+        print("✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Stress benchmark for concurrent application writes.
+
+Fires N parallel applies from several worker processes (each with its own
+thread pool, like uvicorn workers serving the sync handlers) and checks
+that every single one landed in the store.
+
+    python benchmarks/stress_apply.py --workers 4 --threads 16 --applies 2000
+    python benchmarks/stress_apply.py --url http://localhost:8000 --applies 500
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from uuid import uuid4
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import SQLiteStore
+
+
+def make_application(job_id):
+    now = datetime.now().isoformat()
+    return {
+        "id": str(uuid4()),
+        "jobId": job_id,
+        "position": "Stress Test Engineer",
+        "company": "HireEase",
+        "status": "applied",
+        "appliedDate": now,
+        "lastUpdate": now,
+    }
+
+
+def _apply_direct(args):
+    db_path, job_id, count, threads = args
+    store = SQLiteStore(db_path)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: store.insert_application(make_application(job_id)), range(count)))
+    return store.writer.batches
+
+
+def _apply_http(args):
+    import requests
+
+    url, job_id, count, threads = args
+    session = requests.Session()
+
+    def post(_):
+        resp = session.post(f"{url}/applications", json=make_application(job_id), timeout=30)
+        resp.raise_for_status()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(post, range(count)))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="parallel processes")
+    parser.add_argument("--threads", type=int, default=16, help="threads per process")
+    parser.add_argument("--applies", type=int, default=2000, help="total applies to fire")
+    parser.add_argument("--db", help="database path (defaults to a fresh temp file)")
+    parser.add_argument("--url", help="hit a running backend instead of the store directly")
+    args = parser.parse_args()
+
+    job_id = f"stress-{uuid4()}"
+    per_worker = [args.applies // args.workers] * args.workers
+    per_worker[0] += args.applies % args.workers
+
+    if args.url:
+        target = args.url.rstrip("/")
+        fn = _apply_http
+    else:
+        target = args.db or os.path.join(tempfile.mkdtemp(), "stress.db")
+        SQLiteStore(target)  # create the schema before the workers race for it
+        fn = _apply_direct
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        batches = pool.map(fn, [(target, job_id, n, args.threads) for n in per_worker])
+    elapsed = time.perf_counter() - start
+
+    if args.url:
+        import requests
+        stored = [a for a in requests.get(f"{target}/applications", timeout=60).json() if a["jobId"] == job_id]
+    else:
+        stored = SQLiteStore(target).list_applications(job_id=job_id)
+
+    print(f"applies:     {args.applies} ({args.workers} workers x {args.threads} threads)")
+    print(f"elapsed:     {elapsed:.2f}s")
+    print(f"throughput:  {args.applies / elapsed:.0f} applies/s")
+    if not args.url:
+        print(f"commits:     {sum(batches)} (avg {args.applies / max(sum(batches), 1):.1f} writes per fsync)")
+    print(f"stored:      {len(stored)}")
+
+    if len(stored) != args.applies:
+        print(f"❌ Lost {args.applies - len(stored)} applications")
+        sys.exit(1)
+    print("✅ No lost writes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Local stand-in for the Google Apps Script web app behind Sheets.
+
+Understands the requests the backend sends: a bare row per POST (the
+original script, appended), UPSERT (one row upserted on a key column),
+UPSERT_BATCH (many rows upserted on a key column) and SHORTLIST, plus
+GET returning the sheet as headers and rows. Every call
+sleeps for ``--latency`` seconds, since real script invocations are slow.
+
+    python benchmarks/stub_apps_script.py --port 9002 --latency 1.5
+    SHEETS_WEBAPP_URL=http://localhost:9002/exec uvicorn app:app
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubAppsScript:
+    def __init__(self, latency=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.headers = []
+        self.rows = []       # list of dicts, in sheet order
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    def append(self, row):
+        with self.lock:
+            self._add_headers(row)
+            self.rows.append(dict(row))
+
+    def upsert(self, key, rows):
+        with self.lock:
+            positions = {r.get(key): i for i, r in enumerate(self.rows) if r.get(key)}
+            for row in rows:
+                self._add_headers(row)
+                if row.get(key) in positions:
+                    self.rows[positions[row[key]]].update(row)
+                else:
+                    positions[row.get(key)] = len(self.rows)
+                    self.rows.append(dict(row))
+
+    def _add_headers(self, row):
+        for column in row:
+            if column not in self.headers:
+                self.headers.append(column)
+
+    def table(self):
+        with self.lock:
+            return {"headers": list(self.headers),
+                    "rows": [[str(r.get(h, "")) for h in self.headers] for r in self.rows]}
+
+    def handle(self, body):
+        method = body.get("method")
+        if method == "UPSERT_BATCH":
+            self.upsert(body.get("key", "Application ID"), body.get("rows", []))
+            return {"status": "success", "upserted": len(body.get("rows", []))}
+        if method == "UPSERT":
+            self.upsert(body.get("key", "Application ID"), [body.get("row") or {}])
+            return {"status": "success", "message": "Row upserted"}
+        if method == "SHORTLIST":
+            return {"status": "success", "message": "Shortlisting done"}
+        self.append(body)
+        return {"status": "success", "message": "Row added"}
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                stub.requests += 1
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                time.sleep(stub.latency)
+                if random.random() < stub.failure_rate:
+                    self._send(500, {"status": "error", "message": "Simulated failure"})
+                    return
+                self._send(200, stub.handle(body))
+
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.latency)
+                self._send(200, stub.table())
+
+        return Handler
+
+    def start(self, port=0):
+        """Serve in a background thread; returns the web app URL"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}/exec"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9002)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubAppsScript(args.latency, args.failure_rate)
+    print(f"Stub Apps Script listening on {stub.start(args.port)}")
+    threading.Event().wait()
@@ -0,0 +1,126 @@
+"""
+Local stand-in for the Gemini generateContent REST API.
+
+Answers the prompts the backend sends: resume structuring, both single
+and batched ('### DOCUMENT n ###'), with plausible candidate JSON (about
+one in five with a local phone number, to exercise the repair prompt),
+field repairs, and interview questions as a numbered list. Latency and error injection
+(429s, which the LLM gateway retries) are configurable.
+
+    python benchmarks/stub_gemini.py --port 9003 --latency 0.8
+    GEMINI_API_KEY=stub GEMINI_API_ENDPOINT=http://localhost:9003 uvicorn app:app
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SKILLS = ["Python", "Java", "SQL", "React", "Docker", "Kubernetes", "AWS", "Go", "Figma", "TypeScript"]
+CITIES = ["Chennai", "Bengaluru", "London", "Berlin", "Remote"]
+
+BATCH_RE = re.compile(r"You will receive (\d+) separate documents")
+COUNT_RE = re.compile(r"Generate (\d+) interview questions")
+REPAIR_RE = re.compile(r"^- ([^:\n]+):", re.M)
+
+
+def fake_candidate():
+    n = random.randint(1, 10 ** 6)
+    return {
+        "Full Name": f"Stub Candidate {n}",
+        "Email": f"stub{n}@example.com",
+        "Phone": f"+1 555 {n:07d}" if random.random() < 0.8 else f"(555) {n:07d}",
+        "Position Applied": "Software Engineer",
+        "Years of Experience": str(random.randint(0, 15)),
+        "Skills": random.sample(SKILLS, random.randint(2, 6)),
+        "Preferred Location": random.choice(CITIES),
+        "Availability": "Immediate",
+    }
+
+
+def answer(prompt):
+    if "were missing or invalid" in prompt:
+        fixes = {"Phone": "+15550001234", "Email": "repaired@example.com", "Years of Experience": 3,
+                 "Skills": ["Python"], "Availability": "Immediate", "Full Name": "Stub Candidate"}
+        return json.dumps({field: fixes.get(field) for field in REPAIR_RE.findall(prompt.split("Resume:")[0])})
+    batch = BATCH_RE.search(prompt)
+    if batch:
+        return json.dumps([fake_candidate() for _ in range(int(batch.group(1)))])
+    if "Extract structured candidate" in prompt:
+        return json.dumps(fake_candidate())
+    count = COUNT_RE.search(prompt)
+    if count:
+        return "\n".join(f"{i}. Stub question {random.randint(1, 10 ** 9)}?" for i in range(1, int(count.group(1)) + 1))
+    return "Stub response."
+
+
+class StubGemini:
+    def __init__(self, latency=0.0, error_rate=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.server = None
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                stub.requests += 1
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.split("?")[0].endswith(":generateContent"):
+                    self._send(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+                time.sleep(stub.latency)
+                if random.random() < stub.error_rate:
+                    self._send(429, {"error": {"code": 429, "message": "Resource exhausted", "status": "RESOURCE_EXHAUSTED"}})
+                    return
+                prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+                text = answer(prompt)
+                self._send(200, {
+                    "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {
+                        "promptTokenCount": len(prompt) // 4,
+                        "candidatesTokenCount": len(text) // 4,
+                        "totalTokenCount": (len(prompt) + len(text)) // 4,
+                    },
+                })
+
+        return Handler
+
+    def start(self, port=0):
+        """Serve in a background thread; returns the API endpoint"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9003)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubGemini(args.latency, args.error_rate)
+    print(f"Stub Gemini listening on {stub.start(args.port)}")
+    threading.Event().wait()
@@ -0,0 +1,108 @@
+"""
+Local stand-in for the LlamaParse parsing API.
+
+Implements the three endpoints the backend uses (upload, job status and
+markdown result). Each uploaded job "finishes" after a random duration
+so polling strategies can be benchmarked offline.
+
+    python benchmarks/stub_llamaparse.py --port 9001 --min-duration 0.2 --max-duration 3
+    LLAMAPARSE_BASE_URL=http://localhost:9001 uvicorn app:app
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from uuid import uuid4
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLlamaParse:
+    def __init__(self, min_duration=0.2, max_duration=3.0, failure_rate=0.0):
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.failure_rate = failure_rate
+        self.jobs = {}  # job_id -> (ready_at, failed)
+        self.requests = 0
+        self.connections = 0
+        self.server = None
+
+    def create_job(self):
+        job_id = str(uuid4())
+        duration = random.uniform(self.min_duration, self.max_duration)
+        self.jobs[job_id] = (time.monotonic() + duration, random.random() < self.failure_rate)
+        return job_id
+
+    def status(self, job_id):
+        ready_at, failed = self.jobs[job_id]
+        if time.monotonic() < ready_at:
+            return "PENDING"
+        return "ERROR" if failed else "SUCCESS"
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse sockets
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body, content_type="application/json"):
+                data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                stub.requests += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path == "/api/v1/parsing/upload":
+                    self._send(200, {"id": stub.create_job(), "status": "PENDING"})
+                else:
+                    self._send(404, {"detail": "Not found"})
+
+            def do_GET(self):
+                stub.requests += 1
+                match = re.fullmatch(r"/api/v1/parsing/job/([^/]+)(/result/markdown)?", self.path)
+                if not match or match.group(1) not in stub.jobs:
+                    self._send(404, {"detail": "Job not found"})
+                    return
+                job_id, result = match.groups()
+                status = stub.status(job_id)
+                if result:
+                    self._send(200, f"# Resume {job_id}\n\nParsed by stub.", "text/markdown")
+                else:
+                    self._send(200, {"id": job_id, "status": "failed" if status == "ERROR" else status})
+
+        return Handler
+
+    def start(self, port=0):
+        """Serve in a background thread; returns the base URL"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--min-duration", type=float, default=0.2)
+    parser.add_argument("--max-duration", type=float, default=3.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stub = StubLlamaParse(args.min_duration, args.max_duration, args.failure_rate)
+    print(f"Stub LlamaParse listening on {stub.start(args.port)}")
+    threading.Event().wait()
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+# ============================
+# Content-addressed Disk Cache
+# ============================
+# Results of remote calls (LlamaParse markdown, Gemini JSON) are stored
+# on disk under a hash of their input, so the same resume uploaded again
+# skips both remote calls. Each namespace is a directory of JSON entries,
+# evicted by age (TTL) and by total size (least recently used first).
+# A namespace's size is only added up (one stat per entry) the first time
+# it is needed, not when the worker starts.
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+
+def content_hash(*parts):
+    """sha256 over bytes/str parts, used as the cache key"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8") if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    h.update(b"\0")
+    return h.hexdigest()
+
+
+class DiskCache:
+    """One cache namespace on disk with TTL and size-based LRU eviction"""
+
+    def __init__(self, namespace, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL_SECONDS, root=CACHE_DIR):
+        self.namespace = namespace
+        self.path = os.path.join(root, namespace)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._size = None
+
+    def _used(self):
+        """Bytes on disk, counted on first use"""
+        if self._size is None:
+            size = 0
+            for p in self._entries():
+                try:
+                    size += os.path.getsize(p)
+                except OSError:  # removed while we were counting
+                    pass
+            with self._lock:
+                if self._size is None:
+                    self._size = size
+        return self._size
+
+    def _entries(self):
+        for sub in os.listdir(self.path):
+            sub_path = os.path.join(self.path, sub)
+            if os.path.isdir(sub_path):
+                for name in os.listdir(sub_path):
+                    # Skip other writers' temp files; they only become entries on os.replace
+                    if not name.endswith(".tmp"):
+                        yield os.path.join(sub_path, name)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if time.time() - entry["created"] > self.ttl:
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU eviction
+        except OSError:
+            pass  # evicted since we read it; the value we have is still good
+        self.hits += 1
+        return entry["value"]
+
+    def set(self, key, value):
+        path = self._entry_path(key)
+        self._used()  # count what's on disk before the temp file joins it
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"created": time.time(), "value": value}, f)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += os.path.getsize(path) - old_size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def delete(self, key):
+        self._remove(self._entry_path(key))
+
+    def _remove(self, path):
+        self._used()
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of max_bytes"""
+        entries = []
+        for path in self._entries():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        entries.sort()
+        for _, path in entries:
+            if self._size <= self.max_bytes * 0.9:
+                break
+            self._remove(path)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.makedirs(self.path, exist_ok=True)
+            self._size = 0
+
+    def ensure_version(self, version):
+        """Invalidation hook: clear the namespace when ``version`` changes"""
+        marker = os.path.join(self.path, "VERSION")
+        current = None
+        if os.path.exists(marker):
+            with open(marker, "r") as f:
+                current = f.read().strip()
+        if current != str(version):
+            self.clear()
+            with open(marker, "w") as f:
+                f.write(str(version))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "bytes": self._used(),
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,290 @@
+import re
+import heapq
+import threading
+from bisect import bisect_left, bisect_right
+
+# ============================
+# Local Candidate Table
+# ============================
+# A columnar copy of every application's structured_data, kept in sync
+# with the store through its write sequence (only rows written since the
+# last sync are re-read). Columns are typed: numeric columns hold floats,
+# set columns hold lowercase token sets, everything else is a lowercase
+# string. Each column gets an index (hash for strings, sorted for
+# numbers, inverted for sets). A filter is answered by starting from the
+# most selective indexed predicate and checking the remaining predicates
+# only on the surviving rows.
+#
+# Filters use the same format the Apps Script understood:
+#     {"Years of Experience": {">=": 3}, "Skills": {"contains": "python"}}
+NUMERIC_COLUMNS = {"Years of Experience"}
+SET_COLUMNS = {"Skills"}
+OPERATORS = ("=", "!=", ">", "<", ">=", "<=", "contains")
+
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class FilterError(ValueError):
+    """Raised for unknown columns or operators"""
+
+
+def to_number(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = NUMBER_RE.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def tokenize_set(value):
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value or "").split(",")
+    return frozenset(t.strip().lower() for t in items if str(t).strip())
+
+
+class CandidateTable:
+    def __init__(self):
+        self.headers = []          # display column order, first seen first
+        self.ids = []              # row -> application id
+        self.rows = {}             # application id -> row
+        self.raw = []              # row -> original structured_data (for output)
+        self.columns = {}          # column -> list of typed values
+        self._hash_index = {}      # string column -> value -> set(rows)
+        self._set_index = {}       # set column -> token -> set(rows)
+        self._sorted_index = {}    # numeric column -> sorted [(value, row)]
+        self._dirty_sorted = set()
+        self.seq = 0
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()  # serialises sync(): read, apply and seq move together
+
+    # ----- loading -----
+    def sync(self, store):
+        """Pull applications written since the last sync"""
+        with self._sync_lock:
+            records, seq = store.applications_changed_since(self.seq)
+            if records:
+                with self._lock:
+                    for record in records:
+                        if record.get("structured_data"):
+                            self.upsert(record["id"], record["structured_data"])
+                    self.seq = seq
+        return len(records)
+
+    def upsert(self, application_id, data):
+        with self._lock:
+            row = self.rows.get(application_id)
+            if row is None:
+                row = len(self.ids)
+                self.ids.append(application_id)
+                self.raw.append(None)
+                self.rows[application_id] = row
+                for values in self.columns.values():
+                    values.append(None)
+            else:
+                self._unindex(row)
+            self.raw[row] = data
+            for column, value in data.items():
+                if column not in self.columns:
+                    self.headers.append(column)
+                    self.columns[column] = [None] * len(self.ids)
+                self.columns[column][row] = self._typed(column, value)
+            for column in self.columns:
+                if column not in data:
+                    self.columns[column][row] = None
+            self._index(row)
+
+    def _typed(self, column, value):
+        if column in NUMERIC_COLUMNS:
+            return to_number(value)
+        if column in SET_COLUMNS:
+            return tokenize_set(value)
+        return str(value).strip().lower() if value is not None else None
+
+    def _index(self, row):
+        for column, values in self.columns.items():
+            value = values[row]
+            if value is None:
+                continue
+            if column in NUMERIC_COLUMNS:
+                self._dirty_sorted.add(column)
+            elif column in SET_COLUMNS:
+                index = self._set_index.setdefault(column, {})
+                for token in value:
+                    index.setdefault(token, set()).add(row)
+            else:
+                self._hash_index.setdefault(column, {}).setdefault(value, set()).add(row)
+
+    def _unindex(self, row):
+        for column, values in self.columns.items():
+            value = values[row]
+            if value is None:
+                continue
+            if column in NUMERIC_COLUMNS:
+                self._dirty_sorted.add(column)
+            elif column in SET_COLUMNS:
+                for token in value:
+                    self._set_index[column][token].discard(row)
+            else:
+                self._hash_index[column][value].discard(row)
+
+    def _sorted(self, column):
+        if column in self._dirty_sorted or column not in self._sorted_index:
+            values = self.columns[column]
+            self._sorted_index[column] = sorted((v, r) for r, v in enumerate(values) if v is not None)
+            self._dirty_sorted.discard(column)
+        return self._sorted_index[column]
+
+    # ----- querying -----
+    def query(self, filters, limit=None, offset=None, distinct=None):
+        """Return (headers, rows, total) for rows matching every predicate.
+
+        With ``distinct`` only the newest matching row per value of that
+        column is kept (rows without a value are always kept).
+        """
+        with self._lock:
+            candidates = self._matching(filters, distinct)
+            # Rows come back in insertion order; with a limit only the
+            # requested page needs ordering, not every match.
+            total = len(candidates)
+            start = offset or 0
+            if limit:
+                matched = heapq.nsmallest(start + limit, candidates)[start:]
+            else:
+                matched = sorted(candidates)[start:]
+            rows = [[self._display(self.raw[r].get(h)) for h in self.headers] for r in matched]
+            return list(self.headers), rows, total
+
+    def matching_ids(self, filters, distinct=None):
+        """Application ids of every row ``query`` would match, in insertion order"""
+        with self._lock:
+            return [self.ids[r] for r in sorted(self._matching(filters, distinct))]
+
+    def _matching(self, filters, distinct):
+        # Callers hold the lock
+        predicates = []
+        for column, ops in (filters or {}).items():
+            if column not in self.columns:
+                raise FilterError(f"Unknown column: {column}")
+            if not isinstance(ops, dict):
+                ops = {"=": ops}
+            for op, value in ops.items():
+                if op not in OPERATORS:
+                    raise FilterError(f"Unknown operator: {op}")
+                predicates.append((column, op, value))
+
+        candidates = None
+        remaining = []
+        # Resolve indexed predicates, smallest result set first
+        resolved = []
+        for predicate in predicates:
+            rows = self._index_lookup(*predicate)
+            if rows is None:
+                remaining.append(predicate)
+            else:
+                resolved.append(rows)
+        for rows in sorted(resolved, key=len):
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                break
+
+        if candidates is None:
+            candidates = range(len(self.ids))
+        if remaining:
+            candidates = [r for r in candidates if all(self._match(r, *p) for p in remaining)]
+        if distinct and distinct in self.columns:
+            candidates = self._distinct(candidates, self.columns[distinct])
+        return candidates
+
+    @staticmethod
+    def _distinct(rows, values):
+        newest, unkeyed = {}, []
+        for row in rows:
+            value = values[row]
+            if value is None:
+                unkeyed.append(row)
+            elif row > newest.get(value, -1):
+                newest[value] = row
+        return unkeyed + list(newest.values())
+
+    def _index_lookup(self, column, op, value):
+        """Row set for an index-answerable predicate, or None to scan instead"""
+        if column in NUMERIC_COLUMNS:
+            number = to_number(value)
+            if number is None or op in ("!=", "contains"):
+                return None
+            ordered = self._sorted(column)
+            left = bisect_left(ordered, number, key=_value)
+            right = bisect_right(ordered, number, key=_value)
+            lo, hi = {
+                "=": (left, right),
+                ">": (right, len(ordered)),
+                ">=": (left, len(ordered)),
+                "<": (0, left),
+                "<=": (0, right),
+            }[op]
+            return {r for _, r in ordered[lo:hi]}
+
+        needle = str(value).strip().lower()
+        if column in SET_COLUMNS:
+            index = self._set_index.get(column, {})
+            if op == "=":
+                return set(index.get(needle, ()))
+            if op == "contains":
+                rows = set()
+                for token, token_rows in index.items():
+                    if needle in token:
+                        rows |= token_rows
+                return rows
+            return None
+        if op == "=":
+            return set(self._hash_index.get(column, {}).get(needle, ()))
+        return None
+
+    def _match(self, row, column, op, value):
+        cell = self.columns[column][row]
+        if cell is None:
+            return op == "!="
+        if column in NUMERIC_COLUMNS:
+            number = to_number(value)
+            if number is None:
+                return _compare(str(cell), op, str(value).lower())
+            return _compare(cell, op, number)
+        if column in SET_COLUMNS:
+            needle = str(value).strip().lower()
+            return needle not in cell if op == "!=" else needle in cell
+        return _compare(cell, op, str(value).strip().lower())
+
+    @staticmethod
+    def _display(value):
+        if isinstance(value, list):
+            return ", ".join(map(str, value))
+        return "" if value is None else str(value).strip()
+
+
+def _value(pair):
+    return pair[0]
+
+
+def _compare(cell, op, value):
+    if op == "=":
+        return cell == value
+    if op == "!=":
+        return cell != value
+    if op == "contains":
+        return str(value) in str(cell)
+    try:
+        if op == ">":
+            return cell > value
+        if op == "<":
+            return cell < value
+        if op == ">=":
+            return cell >= value
+        if op == "<=":
+            return cell <= value
+    except TypeError:
+        return False
+    return False
+
+
+candidate_table = CandidateTable()
@@ -0,0 +1,246 @@
+import os
+import json
+import asyncio
+import threading
+from collections import OrderedDict
+
+import metrics
+from storage import get_store
+
+# ============================
+# Change Feed
+# ============================
+# Clients stop re-fetching /applications to notice a status change and
+# instead follow a stream of what changed. The store logs every write to
+# an application, job or round under the store-wide write sequence (see
+# storage.py), and ChangeFeed tails that log: it wakes after each local
+# commit, and every FEED_POLL_INTERVAL seconds to pick up other workers'
+# writes. Each batch is resolved to the current records once and handed
+# to the broker, which fans it out to this worker's subscribers.
+#
+# A client resumes from the last sequence it saw (SSE Last-Event-ID or
+# ``after``): the gap is replayed from the log, then live events follow.
+# If the log no longer reaches back that far (pruned past
+# FEED_RETENTION rows), the client gets a "reset" and reloads its
+# snapshot. A subscriber that falls more than FEED_SUBSCRIBER_BUFFER
+# batches behind is caught up from the log the same way, so a slow
+# client never holds memory for everyone.
+#
+# LocalBroker is in-process. Anything with subscribe/unsubscribe/publish
+# can replace it (set_broker), e.g. one tailer publishing to a shared
+# broker for all workers; the store's log stays what clients resume from.
+FEED_POLL_INTERVAL = float(os.getenv("FEED_POLL_INTERVAL", "0.5"))
+FEED_BATCH_SIZE = int(os.getenv("FEED_BATCH_SIZE", "500"))
+FEED_RETENTION = int(os.getenv("FEED_RETENTION", "100000"))
+FEED_SUBSCRIBER_BUFFER = int(os.getenv("FEED_SUBSCRIBER_BUFFER", "256"))
+FEED_HEARTBEAT = float(os.getenv("FEED_HEARTBEAT", "15"))
+
+KINDS = ("application", "job", "round")
+
+
+def resolve(store, changes):
+    """Events for raw (seq, kind, id, op) log rows, carrying each record's current state.
+
+    Several changes to one record collapse into the newest; a record that
+    no longer exists becomes a delete.
+    """
+    latest = OrderedDict()
+    for seq, kind, record_id, op in changes:
+        latest.pop((kind, record_id), None)
+        latest[(kind, record_id)] = (seq, op)
+    wanted = {kind: [] for kind in KINDS}
+    for (kind, record_id), (_, op) in latest.items():
+        if op != "delete" and kind in wanted:
+            wanted[kind].append(record_id)
+    records = {
+        "application": store.get_applications(wanted["application"]) if wanted["application"] else {},
+        "job": store.get_jobs(wanted["job"]) if wanted["job"] else {},
+        "round": store.get_rounds(wanted["round"]) if wanted["round"] else {},
+    }
+    events = []
+    for (kind, record_id), (seq, op) in latest.items():
+        data = records.get(kind, {}).get(record_id) if op != "delete" else None
+        events.append({"seq": seq, "kind": kind, "id": record_id, "op": "upsert" if data else "delete", "data": data})
+    return events
+
+
+def sse(event, name="change"):
+    return f"id: {event['seq']}\nevent: {name}\ndata: {json.dumps(event)}\n\n"
+
+
+class Subscription:
+    """One client's queue of event batches, fed on its event loop"""
+
+    def __init__(self, loop, buffer=FEED_SUBSCRIBER_BUFFER):
+        self.loop = loop
+        self.queue = asyncio.Queue(buffer)
+        self.overflowed = False
+
+    def deliver(self, events):
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """In-process pub/sub: fans published batches out to this worker's subscribers"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscribers.add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, events)
+
+    def stats(self):
+        return {"broker": "local", "subscribers": len(self._subscribers)}
+
+
+class ChangeFeed:
+    def __init__(self, broker=None, poll_interval=FEED_POLL_INTERVAL, retention=FEED_RETENTION):
+        self.broker = broker or LocalBroker()
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.seq = None
+        self.published = 0
+        self.last_error = None
+        self._since_prune = 0
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    # ----- tailing the store -----
+    def start(self):
+        if self._thread:
+            return
+        store = get_store()
+        # Subscribers replay anything older from the log themselves
+        self.seq = store.write_seq()
+        store.writer.listeners.append(self._wake.set)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+            listeners = get_store().writer.listeners
+            if self._wake.set in listeners:
+                listeners.remove(self._wake.set)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.pump()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def pump(self):
+        """Publish everything logged since the last call; returns the number of events"""
+        store = get_store()
+        count = 0
+        while True:
+            changes = store.changes_since(self.seq, FEED_BATCH_SIZE)
+            if not changes:
+                break
+            with metrics.span("feed_publish"):
+                events = resolve(store, changes)
+                self.broker.publish(events)
+            self.seq = changes[-1][0]
+            count += len(events)
+            self._since_prune += len(changes)
+        if count:
+            self.published += count
+            metrics.registry.inc("feed_events", count)
+        if self._since_prune >= max(1, self.retention // 10):
+            self._since_prune = 0
+            store.prune_changes(self.retention)
+        return count
+
+    # ----- reading -----
+    def read(self, after, limit=FEED_BATCH_SIZE):
+        """(events after ``after``, last seq, reset) from the log, for one-shot polling"""
+        store = get_store()
+        floor = store.changes_floor()
+        if after < floor:
+            return [], store.write_seq(), True
+        changes = store.changes_since(after, limit)
+        return resolve(store, changes), (changes[-1][0] if changes else after), False
+
+    async def stream(self, after=None, keep=None, shape=None):
+        """Server-sent events for every change after ``after`` (now if None): replayed, then live.
+
+        ``keep(event)`` filters events and ``shape(event)`` rewrites the
+        ones sent; every message carries its seq as the SSE id.
+        """
+        store = get_store()
+        subscription = Subscription(asyncio.get_running_loop())
+        self.broker.subscribe(subscription)
+        try:
+            last = await asyncio.to_thread(store.write_seq) if after is None else after
+            yield f"retry: 3000\nid: {last}\nevent: ready\ndata: {json.dumps({'seq': last})}\n\n"
+            replay = after is not None
+            while True:
+                if replay:
+                    subscription.overflowed = False
+                    while True:
+                        events, seq, reset = await asyncio.to_thread(self.read, last)
+                        if reset:
+                            last = seq
+                            yield sse({"seq": seq}, "reset")
+                            break
+                        if seq == last:
+                            break
+                        for event in events:
+                            if keep is None or keep(event):
+                                yield sse(shape(event) if shape else event)
+                        last = seq
+                    replay = False
+                try:
+                    events = await asyncio.wait_for(subscription.queue.get(), FEED_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                # A batch always holds whole writes, so one seq check covers all of it
+                seen, last = last, max(last, events[-1]["seq"])
+                for event in events:
+                    if event["seq"] > seen and (keep is None or keep(event)):
+                        yield sse(shape(event) if shape else event)
+                if subscription.overflowed and subscription.queue.empty():
+                    replay = True
+        finally:
+            self.broker.unsubscribe(subscription)
+
+    def stats(self):
+        return {
+            **self.broker.stats(),
+            "seq": self.seq,
+            "published": self.published,
+            "floor": get_store().changes_floor(),
+            "running": self._thread is not None,
+            "last_error": self.last_error,
+        }
+
+
+change_feed = ChangeFeed()
+
+
+def set_broker(broker):
+    change_feed.broker = broker
@@ -0,0 +1,115 @@
+import os
+import re
+import math
+import zlib
+import threading
+from array import array
+
+import metrics
+
+# ============================
+# Text Embedders
+# ============================
+# An embedder turns text into a unit-length float32 vector (array('f')),
+# and its ``name`` is stored next to every vector it produced.
+#
+# The default HashingEmbedder runs offline with no model files. It is a
+# signed feature-hashing bag of words and word pairs with sublinear term
+# weights, so it ranks by shared vocabulary rather than meaning.
+# EMBEDDING_MODEL=<sentence-transformers model> switches to a local
+# transformer model when that package is installed, for real semantic
+# matching. Anything with ``name``, ``dim`` and ``embed(texts)`` can be
+# passed to set_embedder(). If the configured model can't be loaded the
+# hashing embedder is used instead; the embedder_fallback metric counts
+# that and ``fallback_reason`` says why (search stats show it).
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "hashing")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "256"))
+EMBEDDING_MAX_CHARS = int(os.getenv("EMBEDDING_MAX_CHARS", "20000"))
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our that the their this to was were will "
+    "with you your we i me my who can looking experience years year".split()
+)
+
+
+def tokenize(text):
+    words = []
+    for word in _WORD.findall(str(text or "").lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def _normalize(values):
+    norm = math.sqrt(sum(v * v for v in values))
+    if norm:
+        values = [v / norm for v in values]
+    return array("f", values)
+
+
+class HashingEmbedder:
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text):
+        words = tokenize(str(text)[:EMBEDDING_MAX_CHARS])
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1.0
+        for first, second in zip(words, words[1:]):
+            pair = first + " " + second
+            counts[pair] = counts.get(pair, 0) + 0.5
+        values = [0.0] * self.dim
+        for feature, count in counts.items():
+            h = zlib.crc32(feature.encode())
+            values[h % self.dim] += (1 + math.log(count)) * (1 if h & 0x80000000 else -1)
+        return _normalize(values)
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts):
+        vectors = self.model.encode([str(t)[:EMBEDDING_MAX_CHARS] for t in texts], normalize_embeddings=True)
+        return [array("f", map(float, v)) for v in vectors]
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+fallback_reason = None
+
+
+def get_embedder():
+    """The configured embedder, built on first use"""
+    global _embedder, fallback_reason
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                if EMBEDDING_MODEL == "hashing":
+                    _embedder = HashingEmbedder()
+                else:
+                    try:
+                        _embedder = SentenceTransformerEmbedder(EMBEDDING_MODEL)
+                    except ImportError:
+                        metrics.registry.inc("embedder_fallback", model=EMBEDDING_MODEL)
+                        fallback_reason = f"sentence-transformers not installed; using hashing embeddings instead of {EMBEDDING_MODEL}"
+                        _embedder = HashingEmbedder()
+    return _embedder
+
+
+def set_embedder(embedder):
+    global _embedder
+    _embedder = embedder
@@ -0,0 +1,147 @@
+import io
+import os
+import re
+import zipfile
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+# ============================
+# Local Text Extraction
+# ============================
+# Most resumes are PDFs with a text layer or DOCX files, and both can be
+# read locally in milliseconds. extract_text() runs in a process pool and
+# returns the text with a quality score; only scanned or low-confidence
+# documents need a LlamaParse round trip.
+#
+# PDF extraction uses pypdf when it is installed; without it PDFs always
+# go to LlamaParse. DOCX is read with the standard library; a
+# word/document.xml that would inflate past EXTRACT_MAX_DOCX_XML_BYTES is
+# not read at all (it goes to LlamaParse), so a small ZIP bomb can't
+# exhaust a worker's memory.
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACT_MIN_SCORE = float(os.getenv("EXTRACT_MIN_SCORE", "0.6"))
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "20"))
+EXTRACT_MAX_DOCX_XML_BYTES = int(os.getenv("EXTRACT_MAX_DOCX_XML_BYTES", str(20 * 1024 * 1024)))
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+WORD_RE = re.compile(r"[A-Za-z]{2,}")
+
+
+def sniff_kind(data):
+    """File kind from its first bytes: "pdf", "docx", "doc" or None"""
+    if data[:5] == b"%PDF-":
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        return "docx"
+    if data[:8] == b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1":  # OLE2, legacy Word
+        return "doc"
+    return None
+
+
+def is_docx(file):
+    """True when a ZIP (path or seekable file) holds a Word document, not just any archive"""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def extract_pdf(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return ""
+    reader = PdfReader(io.BytesIO(data))
+    pages = [page.extract_text() or "" for page in reader.pages[:EXTRACT_MAX_PAGES]]
+    return "\n\n".join(p.strip() for p in pages if p.strip())
+
+
+def extract_docx(data, max_bytes=EXTRACT_MAX_DOCX_XML_BYTES):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        if archive.getinfo("word/document.xml").file_size > max_bytes:
+            return ""
+        # The declared size can lie, so the read is bounded too
+        with archive.open("word/document.xml") as f:
+            xml = f.read(max_bytes + 1)
+        if len(xml) > max_bytes:
+            return ""
+        root = ET.fromstring(xml)
+    lines = []
+    for paragraph in root.iter(f"{W_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{W_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{W_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{W_NS}br", f"{W_NS}cr"):
+                parts.append("\n")
+        line = "".join(parts).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def quality_score(text):
+    """0..1 estimate of how usable the extracted text is for structuring"""
+    if not text:
+        return 0.0
+    words = WORD_RE.findall(text)
+    if len(words) < 30:
+        return 0.0
+    printable = sum(ch.isprintable() or ch.isspace() for ch in text) / len(text)
+    alpha = sum(len(w) for w in words) / max(len(text.replace(" ", "")), 1)
+    avg_len = sum(len(w) for w in words) / len(words)
+    score = 0.35 * printable + 0.35 * min(alpha / 0.6, 1.0)
+    score += 0.1 if 3 <= avg_len <= 10 else 0.0
+    score += 0.1 if EMAIL_RE.search(text) else 0.0
+    score += 0.1 if PHONE_RE.search(text) else 0.0
+    return round(score, 3)
+
+
+def extract_text(data):
+    """Return (text, score, kind) for a resume's bytes; runs inside the pool"""
+    kind = sniff_kind(data)
+    try:
+        if kind == "pdf":
+            text = extract_pdf(data)
+        elif kind == "docx":
+            text = extract_docx(data)
+        else:
+            text = ""
+    except Exception:
+        text = ""
+    return text, quality_score(text), kind
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def extract_local(data):
+    """Extract in the process pool so large PDFs don't hold the GIL"""
+    return _get_pool().submit(extract_text, data).result()
+
+
+def shutdown():
+    """Stop the pool's worker processes (on app shutdown)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,142 @@
+import os
+import re
+import zlib
+import random
+import unicodedata
+
+# ============================
+# Candidate Identity
+# ============================
+# Applications from the same person resolve to one candidate profile.
+# Every profile is indexed under exact keys and under MinHash/LSH
+# buckets; the store keeps both in tables with a primary key, so
+# resolving an application costs a handful of index lookups no matter
+# how many candidates exist.
+#
+# Exact keys are the normalised email and phone ("e:..." / "p:..."). The
+# phone key is the last 10 digits, so "+91 98765 43210" and "098765
+# 43210" match. A phone match only counts when the resume has no email
+# or the candidate already has that email; two people sharing a number
+# with different emails stay apart. A resume without an email that matches no exact key
+# falls back to a MinHash signature over the name's character trigrams
+# and the skill set, split into IDENTITY_BANDS bands. A candidate sharing
+# any band is a fuzzy match if the estimated Jaccard similarity reaches
+# IDENTITY_FUZZY_THRESHOLD and its phone doesn't contradict the new
+# application. A resume with an unseen email always starts a new
+# candidate: two people with similar names and skills are common, and a
+# wrong merge would mix their applications.
+IDENTITY_PERMUTATIONS = int(os.getenv("IDENTITY_PERMUTATIONS", "64"))
+IDENTITY_BANDS = int(os.getenv("IDENTITY_BANDS", "16"))
+IDENTITY_FUZZY_THRESHOLD = float(os.getenv("IDENTITY_FUZZY_THRESHOLD", "0.6"))
+
+# Resume fields that describe the person rather than one application;
+# these live on the shared candidate profile
+PROFILE_FIELDS = (
+    "Full Name", "Email", "Phone", "Years of Experience", "Skills", "Preferred Location", "Availability",
+)
+# Profile fields that identify the person; merging an application onto an
+# existing candidate never replaces them
+IDENTITY_FIELDS = ("Full Name", "Email")
+# Column the merged structured_data carries the candidate id in (shortlist, Sheets)
+CANDIDATE_COLUMN = "Candidate ID"
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)  # fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(IDENTITY_PERMUTATIONS)
+]
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]")
+_SPACES = re.compile(r"\s+")
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_email(value):
+    email = str(value or "").strip().lower().removeprefix("mailto:")
+    if "@" not in email:
+        return None
+    local, _, domain = email.partition("@")
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local and domain else None
+
+
+def normalize_phone(value):
+    digits = _NON_DIGITS.sub("", str(value or ""))
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def normalize_name(value):
+    name = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode()
+    return _SPACES.sub(" ", _NON_ALNUM.sub(" ", name.lower())).strip()
+
+
+def _skills(value):
+    items = value if isinstance(value, list) else str(value or "").split(",")
+    return {str(s).strip().lower() for s in items if str(s).strip()}
+
+
+def shingles(profile):
+    name = normalize_name(profile.get("Full Name"))
+    padded = f"  {name} "
+    tokens = {"n:" + padded[i:i + 3] for i in range(len(padded) - 2)} if name else set()
+    tokens |= {"s:" + skill for skill in _skills(profile.get("Skills"))}
+    return tokens
+
+
+def signature(tokens):
+    """MinHash signature (IDENTITY_PERMUTATIONS ints) of a token set"""
+    hashes = [zlib.crc32(t.encode()) for t in tokens]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def buckets(sig):
+    """LSH bucket keys, one per band of the signature"""
+    rows = len(sig) // IDENTITY_BANDS
+    return [
+        f"{band}:{zlib.crc32(repr(sig[band * rows:(band + 1) * rows]).encode()):08x}"
+        for band in range(IDENTITY_BANDS)
+    ]
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def identity_keys(profile):
+    """Exact keys, MinHash signature and LSH buckets for a resume"""
+    keys = []
+    email = normalize_email(profile.get("Email"))
+    if email:
+        keys.append("e:" + email)
+    phone = normalize_phone(profile.get("Phone"))
+    if phone:
+        keys.append("p:" + phone)
+    sig = signature(shingles(profile))
+    return {"keys": keys, "signature": sig, "buckets": buckets(sig) if sig else []}
+
+
+def conflicts(new_keys, existing_keys):
+    """True when both sides have an email (or phone) and none of them agree"""
+    for kind in ("e:", "p:"):
+        new = {k for k in new_keys if k.startswith(kind)}
+        old = {k for k in existing_keys if k.startswith(kind)}
+        if new and old and not new & old:
+            return True
+    return False
+
+
+def split_profile(structured_data):
+    """(profile fields, application-only fields) of an application's structured_data"""
+    profile, rest = {}, {}
+    for key, value in structured_data.items():
+        if key == CANDIDATE_COLUMN:
+            continue
+        if key in PROFILE_FIELDS:
+            profile[key] = value
+        else:
+            rest[key] = value
+    return profile, rest
@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from uploads import MAX_UPLOAD_BYTES, UploadRejected, check_resume, too_large
+
+# ============================
+# Bulk Resume Ingestion
+# ============================
+# Resumes are read one at a time from a ZIP (streamed straight out of
+# the archive, never unpacked to disk) or a directory, and fanned out
+# across a bounded thread pool. At most ``workers * 2`` files are held in
+# memory at once. Finished applications are written to the store in
+# batches, and a progress event is yielded per file so callers can stream
+# them back as NDJSON. Each entry goes through the same limits as a
+# single upload: nothing past MAX_UPLOAD_BYTES is ever inflated (a ZIP
+# header's size can lie), and the magic bytes must say PDF/DOC/DOCX.
+# A rejected entry is yielded as its UploadRejected and reported failed.
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "8"))
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "50"))
+RESUME_EXTENSIONS = (".pdf", ".doc", ".docx")
+
+
+def content_type_for(name):
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def read_bounded(stream, max_bytes=MAX_UPLOAD_BYTES):
+    """Read a resume from a stream, never more than ``max_bytes + 1`` bytes.
+
+    Returns the bytes, or the UploadRejected describing why they were refused.
+    """
+    data = stream.read(max_bytes + 1)
+    try:
+        check_resume(data, max_bytes)
+    except UploadRejected as e:
+        return e
+    return data
+
+
+def iter_zip(file, max_bytes=MAX_UPLOAD_BYTES):
+    """Yield (name, bytes or UploadRejected) for each resume in a ZIP path or file object"""
+    with zipfile.ZipFile(file) as archive:
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or name.startswith(".") or not name.lower().endswith(RESUME_EXTENSIONS):
+                continue
+            if info.file_size > max_bytes:
+                yield name, UploadRejected(413, too_large(max_bytes))
+                continue
+            with archive.open(info) as entry:
+                yield name, read_bounded(entry, max_bytes)
+
+
+def iter_directory(path, max_bytes=MAX_UPLOAD_BYTES):
+    """Yield (name, bytes or UploadRejected) for each resume under a directory"""
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                with open(os.path.join(root, name), "rb") as f:
+                    yield name, read_bounded(f, max_bytes)
+
+
+def iter_sources(path):
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip(path)
+    raise ValueError(f"{path} is neither a directory nor a ZIP archive")
+
+
+class BulkIngestor:
+    """Runs ``process(name, data, content_type) -> application`` over many files.
+
+    ``save_batch(applications)`` is called with up to ``batch_size``
+    finished applications at a time.
+    """
+
+    def __init__(self, process, save_batch, workers=BULK_WORKERS, batch_size=BULK_BATCH_SIZE):
+        self.process = process
+        self.save_batch = save_batch
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def run(self, sources):
+        """Generator of progress events; the last one has a ``summary`` key.
+
+        A file is reported ``ok`` only once its batch has been saved; if
+        ``save_batch`` raises, every file in that batch is reported failed.
+        """
+        start = time.perf_counter()
+        counts = {"done": 0, "failed": 0}
+        batch = []  # (name, application) waiting for save_batch
+        in_flight = {}
+        sources = iter(sources)
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-ingest") as pool:
+            while in_flight or not exhausted:
+                # Keep the pool fed without reading the whole archive up front
+                while not exhausted and len(in_flight) < self.workers * 2:
+                    try:
+                        name, data = next(sources)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if isinstance(data, UploadRejected):
+                        counts["failed"] += 1
+                        yield {"file": name, "ok": False, "error": data.detail, **counts}
+                        continue
+                    in_flight[pool.submit(self.process, name, data, content_type_for(name))] = name
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = in_flight.pop(future)
+                    try:
+                        application = future.result()
+                    except Exception as e:
+                        counts["failed"] += 1
+                        yield {"file": name, "ok": False, "error": str(e), **counts}
+                        continue
+                    batch.append((name, application))
+                    if len(batch) >= self.batch_size:
+                        yield from self._save(batch, counts)
+                        batch = []
+
+        if batch:
+            yield from self._save(batch, counts)
+        done, failed = counts["done"], counts["failed"]
+        elapsed = time.perf_counter() - start
+        yield {"summary": {
+            "ingested": done,
+            "failed": failed,
+            "seconds": round(elapsed, 2),
+            "per_second": round((done + failed) / elapsed, 2) if elapsed else 0,
+        }}
+
+    def _save(self, batch, counts):
+        """Save one batch and yield an event per file in it"""
+        try:
+            self.save_batch([application for _, application in batch])
+        except Exception as e:
+            for name, _ in batch:
+                counts["failed"] += 1
+                yield {"file": name, "ok": False, "error": f"Save failed: {e}", **counts}
+            return
+        for name, application in batch:
+            counts["done"] += 1
+            yield {"file": name, "ok": True, "applicationId": application["id"], **counts}
+
+
+# ============================
+# CLI
+# python ingest.py resumes.zip --job-id 3 --position "UI/UX Designer" --company Designify
+# ============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk ingest a ZIP or directory of resumes")
+    parser.add_argument("source", help="ZIP archive or directory of PDF/DOC/DOCX resumes")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--position", required=True)
+    parser.add_argument("--company", required=True)
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    from resumes import bulk_ingestor
+
+    for event in bulk_ingestor(args.job_id, args.position, args.company, args.workers).run(iter_sources(args.source)):
+        print(json.dumps(event), flush=True)
+        if "summary" in event and event["summary"]["failed"]:
+            sys.exit(1)
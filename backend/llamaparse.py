@@ -0,0 +1,181 @@
+import os
+import time
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import metrics
+from upstream import Upstream, UpstreamError
+
+# ============================
+# LlamaParse Client
+# ============================
+# All uploads and status polls share one pooled upstream client, and a
+# single CompletionTracker thread polls every outstanding job with
+# adaptive backoff (fast at first, slower for long documents, with
+# jitter), resolving each waiting Future as soon as its job finishes.
+# When LLAMAPARSE_WEBHOOK_URL is set the upload registers it with
+# LlamaParse, and notify() resolves the job the moment the callback
+# arrives; polling then only acts as a slow safety net. A poll answered
+# with a client error other than 408/429 (bad key, unknown job) fails the
+# job at once instead of polling on until LLAMAPARSE_POLL_TIMEOUT.
+LLAMAPARSE_BASE_URL = os.getenv("LLAMAPARSE_BASE_URL", "https://api.cloud.llamaindex.ai")
+UPLOAD_URL = f"{LLAMAPARSE_BASE_URL}/api/v1/parsing/upload"
+JOB_URL = f"{LLAMAPARSE_BASE_URL}/api/v1/parsing/job"
+
+POLL_INITIAL_DELAY = float(os.getenv("LLAMAPARSE_POLL_INITIAL_DELAY", "0.5"))
+POLL_MAX_DELAY = float(os.getenv("LLAMAPARSE_POLL_MAX_DELAY", "5"))
+POLL_BACKOFF = 1.3
+POLL_JITTER = 0.2
+POLL_TIMEOUT = float(os.getenv("LLAMAPARSE_POLL_TIMEOUT", "300"))
+POLL_CONCURRENCY = int(os.getenv("LLAMAPARSE_POLL_CONCURRENCY", "8"))
+WEBHOOK_POLL_DELAY = 30
+
+DONE_STATUSES = ("completed", "done", "success")
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {os.getenv('LLAMAPARSE_API_KEY')}",
+        "Accept": "application/json"
+    }
+
+
+upstream = Upstream("llamaparse", read_timeout=30, retries=2, pool_size=POLL_CONCURRENCY)
+
+
+@metrics.timed("llamaparse_upload")
+def upload_file_backend(source, file_name, file_type):
+    """Upload a file path, an open binary file or raw bytes to LlamaParse and return job_id"""
+    data = {}
+    if os.getenv("LLAMAPARSE_WEBHOOK_URL"):
+        data["webhook_url"] = os.getenv("LLAMAPARSE_WEBHOOK_URL")
+    if isinstance(source, (bytes, bytearray)) or hasattr(source, "read"):
+        files = {"file": (file_name, source, file_type)}
+        resp = upstream.post(UPLOAD_URL, headers=_headers(), files=files, data=data, timeout=60)
+    else:
+        with open(source, "rb") as f:
+            files = {"file": (file_name, f, file_type)}
+            resp = upstream.post(UPLOAD_URL, headers=_headers(), files=files, data=data, timeout=60)
+    data = resp.json()
+    return data.get("id") or data.get("job_id")
+
+
+class CompletionTracker:
+    """Polls all outstanding LlamaParse jobs from one background thread"""
+
+    def __init__(self, concurrency=POLL_CONCURRENCY):
+        self._pending = {}  # job_id -> {"future", "due", "delay", "deadline"}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="llamaparse-poll")
+        self._thread = None
+        self.polls = 0
+        self.completed = 0
+
+    def track(self, job_id, timeout=POLL_TIMEOUT):
+        """Return a Future resolving to the job's markdown"""
+        webhook = bool(os.getenv("LLAMAPARSE_WEBHOOK_URL"))
+        with self._lock:
+            entry = self._pending.get(job_id)
+            if entry is None:
+                now = time.monotonic()
+                delay = WEBHOOK_POLL_DELAY if webhook else POLL_INITIAL_DELAY
+                entry = {
+                    "future": Future(),
+                    "due": now + delay,
+                    "delay": delay,
+                    "deadline": now + timeout,
+                    "in_flight": False,
+                }
+                self._pending[job_id] = entry
+            self._ensure_started()
+        self._wake.set()
+        return entry["future"]
+
+    def notify(self, job_id):
+        """Webhook entry point: check this job right away"""
+        with self._lock:
+            entry = self._pending.get(job_id)
+            if entry is None:
+                return False
+            entry["due"] = 0
+        self._wake.set()
+        return True
+
+    def outstanding(self):
+        return len(self._pending)
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="llamaparse-tracker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            next_due = None
+            with self._lock:
+                for job_id, entry in list(self._pending.items()):
+                    if entry["in_flight"]:
+                        continue
+                    if now >= entry["deadline"]:
+                        del self._pending[job_id]
+                        entry["future"].set_exception(TimeoutError("❌ Job did not finish in time"))
+                    elif now >= entry["due"]:
+                        entry["in_flight"] = True
+                        self._pool.submit(self._check, job_id, entry)
+                    elif next_due is None or entry["due"] < next_due:
+                        next_due = entry["due"]
+            wait = None if next_due is None else max(next_due - time.monotonic(), 0)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def _check(self, job_id, entry):
+        self.polls += 1
+        try:
+            r = upstream.get(f"{JOB_URL}/{job_id}", headers=_headers())
+            data = r.json()
+            status = data.get("status", "").lower()
+
+            if status in DONE_STATUSES:
+                r2 = upstream.get(f"{JOB_URL}/{job_id}/result/markdown", headers=_headers())
+                self._finish(job_id, entry, result=r2.text)
+                return
+            elif status == "failed":
+                self._finish(job_id, entry, error=Exception("❌ Parsing failed: " + str(data)))
+                return
+        except UpstreamError as e:
+            # 401/403/404 won't fix themselves; only 5xx, 408, 429 and transport errors keep polling
+            if e.status_code is not None and 400 <= e.status_code < 500 and e.status_code not in (408, 429):
+                self._finish(job_id, entry, error=e)
+                return
+        except Exception as e:
+            self._finish(job_id, entry, error=e)
+            return
+
+        with self._lock:
+            if entry["delay"] < WEBHOOK_POLL_DELAY:
+                entry["delay"] = min(entry["delay"] * POLL_BACKOFF, POLL_MAX_DELAY)
+            jitter = 1 + random.uniform(-POLL_JITTER, POLL_JITTER)
+            entry["due"] = time.monotonic() + entry["delay"] * jitter
+            entry["in_flight"] = False
+        self._wake.set()
+
+    def _finish(self, job_id, entry, result=None, error=None):
+        with self._lock:
+            self._pending.pop(job_id, None)
+        self.completed += 1
+        if error is not None:
+            entry["future"].set_exception(error)
+        else:
+            entry["future"].set_result(result)
+
+
+tracker = CompletionTracker()
+
+
+@metrics.timed("llamaparse_poll")
+def poll_result(job_id, timeout=POLL_TIMEOUT):
+    """Block until the job completes and return its markdown"""
+    return tracker.track(job_id, timeout).result()
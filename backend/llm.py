@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import Future
+
+import metrics
+
+# ============================
+# LLM Gateway
+# ============================
+# One shared Gemini model for the whole process. Every call goes through
+# generate(), which waits on a token bucket (requests per minute) and a
+# cap on in-flight requests, retries 429/5xx with exponential backoff and
+# records latency and token usage. Each attempt is bounded by LLM_TIMEOUT
+# and the SDK's own retries are turned off, so the gateway is the only
+# retry layer and an outage can't hold an in-flight slot for minutes.
+# PromptBatcher coalesces small
+# structuring prompts that arrive together into a single call.
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+LLM_RATE_PER_MINUTE = float(os.getenv("LLM_RATE_PER_MINUTE", "60"))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "4"))
+LLM_BATCH_WAIT = float(os.getenv("LLM_BATCH_WAIT", "0.05"))
+LLM_BATCH_MAX_CHARS = int(os.getenv("LLM_BATCH_MAX_CHARS", "60000"))
+
+RETRYABLE_CODES = (429, 500, 502, 503, 504)
+
+
+class LLMNotConfigured(Exception):
+    """Raised when GEMINI_API_KEY is missing"""
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_model = None
+_model_lock = threading.Lock()
+_bucket = TokenBucket(LLM_RATE_PER_MINUTE / 60, max(1, LLM_MAX_IN_FLIGHT))
+_in_flight = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "calls": 0,
+    "errors": 0,
+    "retries": 0,
+    "batched_prompts": 0,
+    "latency_ms_total": 0.0,
+    "latency_ms_max": 0.0,
+    "prompt_tokens": 0,
+    "output_tokens": 0,
+}
+
+
+def get_model():
+    """Configure Gemini and build the model once, on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise LLMNotConfigured("Gemini API key not configured. Please set GEMINI_API_KEY in .env")
+                import google.generativeai as genai
+
+                endpoint = os.getenv("GEMINI_API_ENDPOINT")
+                if endpoint:
+                    # e.g. a local stand-in (benchmarks/stub_gemini.py); only the REST transport can reach it
+                    genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+                else:
+                    genai.configure(api_key=api_key)
+                _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
+
+
+def _is_retryable(error):
+    # google.api_core exceptions carry the HTTP status as ``code``
+    return getattr(error, "code", None) in RETRYABLE_CODES
+
+
+def _record(latency_ms, response=None, error=False, retries=0):
+    usage = getattr(response, "usage_metadata", None)
+    with _stats_lock:
+        _stats["calls"] += 1
+        _stats["errors"] += int(error)
+        _stats["retries"] += retries
+        _stats["latency_ms_total"] += latency_ms
+        _stats["latency_ms_max"] = max(_stats["latency_ms_max"], latency_ms)
+        if usage is not None:
+            _stats["prompt_tokens"] += getattr(usage, "prompt_token_count", 0) or 0
+            _stats["output_tokens"] += getattr(usage, "candidates_token_count", 0) or 0
+
+
+def generate(prompt, generation_config=None):
+    """Rate-limited, retried Gemini call; returns the response text"""
+    model = get_model()
+    retries = 0
+    while True:
+        with metrics.span("llm_rate_limit_wait"):
+            _bucket.acquire()
+        start = time.perf_counter()
+        try:
+            with _in_flight, metrics.span("gemini_call"):
+                response = model.generate_content(
+                    prompt, generation_config=generation_config, request_options={"timeout": LLM_TIMEOUT, "retry": None}
+                )
+            text = response.text
+        except Exception as e:
+            latency_ms = (time.perf_counter() - start) * 1000
+            if _is_retryable(e) and retries < LLM_MAX_RETRIES:
+                retries += 1
+                time.sleep(min(2 ** retries, 30) * random.uniform(0.5, 1.0))
+                continue
+            _record(latency_ms, error=True, retries=retries)
+            raise
+        _record((time.perf_counter() - start) * 1000, response, retries=retries)
+        return text
+
+
+def stats():
+    with _stats_lock:
+        result = dict(_stats)
+    calls = result["calls"] or 1
+    result["latency_ms_avg"] = round(result["latency_ms_total"] / calls, 1)
+    result["rate_per_minute"] = LLM_RATE_PER_MINUTE
+    result["max_in_flight"] = LLM_MAX_IN_FLIGHT
+    return result
+
+
+def json_config(schema, **config):
+    """generation_config constraining the reply to JSON matching ``schema``"""
+    return {"response_mime_type": "application/json", "response_schema": schema, **config}
+
+
+def parse_json_response(raw):
+    """json.loads after stripping the code fences Gemini sometimes adds"""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`")
+        raw = raw.replace("json", "", 1).strip()
+    return json.loads(raw)
+
+
+# ============================
+# Prompt Batching
+# ============================
+class PromptBatcher:
+    """Coalesces documents sent with the same instructions into one call.
+
+    ``submit(text)`` returns a Future for the parsed JSON object of that
+    document. Documents arriving within ``max_wait`` of each other are
+    sent together and the model is asked for a JSON array in the same
+    order; if the reply doesn't line up, each document is retried alone.
+    With a ``schema`` the model is constrained to JSON of that shape (an
+    array of it for batches).
+    """
+
+    def __init__(self, instructions, schema=None, max_batch=LLM_BATCH_SIZE, max_wait=LLM_BATCH_WAIT,
+                 max_chars=LLM_BATCH_MAX_CHARS):
+        self.instructions = instructions
+        self.schema = schema
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_chars = max_chars
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def submit(self, text):
+        future = Future()
+        if self.max_batch <= 1:
+            self._run_single(text, future)
+            return future
+        with self._lock:
+            self._pending.append((text, future))
+            full = (len(self._pending) >= self.max_batch
+                    or sum(len(t) for t, _ in self._pending) >= self.max_chars)
+            if full:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_wait, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+                batch = None
+            else:
+                batch = None
+        if batch:
+            self._run(batch)
+        return future
+
+    def _take(self):
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush(self):
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._run(batch)
+
+    def _run(self, batch):
+        if len(batch) == 1:
+            self._run_single(*batch[0])
+            return
+        documents = "\n\n".join(f"### DOCUMENT {i} ###\n{text}" for i, (text, _) in enumerate(batch, 1))
+        prompt = (
+            f"{self.instructions}\n\n"
+            f"You will receive {len(batch)} separate documents, each starting with a "
+            f"'### DOCUMENT n ###' marker. Return ONLY a JSON array with exactly "
+            f"{len(batch)} objects, one per document, in the same order.\n\n{documents}"
+        )
+        try:
+            results = parse_json_response(generate(prompt, self._config(array=True)))
+            if not isinstance(results, list) or len(results) != len(batch):
+                raise ValueError("batched response does not match the documents sent")
+        except Exception:
+            for text, future in batch:
+                self._run_single(text, future)
+            return
+        with _stats_lock:
+            _stats["batched_prompts"] += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _run_single(self, text, future):
+        raw = ""
+        try:
+            raw = generate(f"{self.instructions}\n\nText:\n{text}", self._config())
+            future.set_result(parse_json_response(raw))
+        except ValueError:
+            future.set_exception(ValueError(f"❌ Gemini did not return valid JSON: {raw}"))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _config(self, array=False):
+        if self.schema is None:
+            return None
+        return json_config({"type": "array", "items": self.schema} if array else self.schema)
@@ -0,0 +1,199 @@
+import re
+import heapq
+import threading
+from collections import Counter
+
+from candidates import to_number
+
+# ============================
+# Skills Index & Job Matching
+# ============================
+# Candidate skills are normalised (lowercase, punctuation trimmed,
+# aliases folded onto one canonical name) and kept in an inverted index
+# skill -> candidate ids, synced from the store's write sequence as
+# applications arrive. Matching a job only visits candidates that share
+# at least one skill with it (the union of its posting lists), scores
+# them on skills overlap, experience range and location, and keeps the
+# top K with a heap. Candidates are scored in buckets of descending skill
+# overlap, and scoring stops as soon as no lower bucket could beat the
+# current K-th best.
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+LOCATION_WEIGHT = 0.15
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "golang": "go",
+    "py": "python",
+    "python3": "python",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "aws cloud": "aws",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "ux": "ux design",
+    "ui": "ui design",
+    "ci/cd": "ci-cd",
+    "cicd": "ci-cd",
+}
+
+_SPACES = re.compile(r"\s+")
+_PARENS = re.compile(r"\s*\(([^)]*)\)")
+
+
+def normalize_skill(skill):
+    skill = _SPACES.sub(" ", str(skill).strip().lower()).strip(" .;:-")
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def normalize_skills(value):
+    """Canonical skill set from a comma string or list; '(AWS)' style parentheticals count too"""
+    items = value if isinstance(value, list) else str(value or "").split(",")
+    skills = set()
+    for item in items:
+        item = str(item)
+        for inner in _PARENS.findall(item):
+            skills.update(normalize_skill(s) for s in inner.split("/"))
+        item = _PARENS.sub("", item)
+        if item.strip():
+            skills.add(normalize_skill(item))
+    skills.discard("")
+    return skills
+
+
+class SkillIndex:
+    def __init__(self):
+        self.postings = {}   # skill -> set(application ids)
+        self.profiles = {}   # application id -> profile dict
+        self.seq = 0
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()  # held from the store read to the seq update
+
+    def sync(self, store):
+        """Index applications written since the last sync"""
+        with self._sync_lock:
+            records, seq = store.applications_changed_since(self.seq)
+            if records:
+                with self._lock:
+                    for record in records:
+                        if record.get("structured_data"):
+                            self.add(record)
+                    self.seq = seq
+        return len(records)
+
+    def add(self, record):
+        data = record["structured_data"]
+        profile = {
+            "applicationId": record["id"],
+            "jobId": record.get("jobId"),
+            "name": data.get("Full Name", ""),
+            "skills": normalize_skills(data.get("Skills")),
+            "experience": to_number(data.get("Years of Experience")),
+            "location": str(data.get("Preferred Location") or "").strip().lower(),
+        }
+        with self._lock:
+            self.remove(record["id"])
+            self.profiles[record["id"]] = profile
+            for skill in profile["skills"]:
+                self.postings.setdefault(skill, set()).add(record["id"])
+
+    def remove(self, application_id):
+        with self._lock:
+            profile = self.profiles.pop(application_id, None)
+            if profile:
+                for skill in profile["skills"]:
+                    self.postings[skill].discard(application_id)
+
+    def match(self, job, k=10, applied_only=False):
+        """Top ``k`` candidate profiles for ``job`` as (score, profile, matched skills)"""
+        job_skills = normalize_skills((job.get("skills") or []) + (job.get("requirements") or []))
+        with self._lock:
+            overlap = Counter()
+            for skill in job_skills:
+                for application_id in self.postings.get(skill, ()):
+                    overlap[application_id] += 1
+            if not job_skills:
+                overlap = Counter({application_id: 0 for application_id in self.profiles})
+
+            buckets = {}
+            for application_id, hits in overlap.items():
+                buckets.setdefault(hits, []).append(application_id)
+
+            top = []  # min-heap of (score, application id)
+            for hits in sorted(buckets, reverse=True):
+                best_possible = (SKILL_WEIGHT * hits / len(job_skills) if job_skills else 0.0) \
+                    + EXPERIENCE_WEIGHT + LOCATION_WEIGHT
+                if len(top) == k and top[0][0] >= best_possible:
+                    break
+                for application_id in buckets[hits]:
+                    profile = self.profiles[application_id]
+                    if applied_only and profile["jobId"] != job.get("id"):
+                        continue
+                    item = (self._score(job, job_skills, profile, hits), application_id)
+                    if len(top) < k:
+                        heapq.heappush(top, item)
+                    elif item > top[0]:
+                        heapq.heapreplace(top, item)
+            top.sort(reverse=True)
+            return [
+                (score, self.profiles[application_id], sorted(self.profiles[application_id]["skills"] & job_skills))
+                for score, application_id in top
+            ]
+
+    @staticmethod
+    def _score(job, job_skills, profile, hits):
+        skill_score = hits / len(job_skills) if job_skills else 0.0
+        return round(
+            SKILL_WEIGHT * skill_score
+            + EXPERIENCE_WEIGHT * experience_fit(profile["experience"], job.get("minExperience"), job.get("maxExperience"))
+            + LOCATION_WEIGHT * location_fit(profile["location"], job.get("location")),
+            4,
+        )
+
+
+def experience_fit(years, minimum, maximum):
+    """1 inside [min, max] (max of 0 means no upper bound), decaying linearly outside it"""
+    if years is None:
+        return 0.5
+    minimum = minimum or 0
+    if years < minimum:
+        return max(0.0, 1 - (minimum - years) / max(minimum, 1))
+    if maximum and years > maximum:
+        return max(0.0, 1 - (years - maximum) / max(maximum, 1))
+    return 1.0
+
+
+def location_fit(candidate_location, job_location):
+    job_location = str(job_location or "").strip().lower()
+    if not job_location or not candidate_location:
+        return 0.5
+    if "remote" in (candidate_location, job_location):
+        return 1.0
+    if candidate_location in job_location or job_location in candidate_location:
+        return 1.0
+    job_parts = {p.strip() for p in job_location.split(",")}
+    return 1.0 if job_parts & {p.strip() for p in candidate_location.split(",")} else 0.0
+
+
+skill_index = SkillIndex()
@@ -0,0 +1,189 @@
+import os
+import sys
+import time
+import threading
+import contextvars
+from collections import Counter, deque
+from contextlib import nullcontext
+from functools import wraps
+
+# ============================
+# Tracing & Metrics
+# ============================
+# span("llamaparse_upload") times a block of code. Every span is recorded
+# in a per-name latency summary: count, sum, and p50/p95/p99 over the most
+# recent METRICS_WINDOW samples. It is also added to the current request's
+# trace, which the timing middleware returns as a Server-Timing header.
+# render() writes everything in the Prometheus text format for /metrics.
+#
+# With METRICS_ENABLED=0, span() returns one shared no-op context manager
+# and timed() leaves functions unwrapped, so the disabled cost is a flag
+# check. The sampling profiler only runs while someone asks for a profile.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "1024"))
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_NOOP = nullcontext()
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+class Summary:
+    """Count, sum and recent-window quantiles for one labelled series"""
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def quantiles(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class Registry:
+    def __init__(self):
+        self.summaries = {}   # (name, labels tuple) -> Summary
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = Summary()
+            summary.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += amount
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            summaries = sorted(self.summaries.items())
+            counters = sorted(self.counters.items())
+        seen = set()
+        for (name, labels), summary in summaries:
+            metric = f"hireease_{name}_seconds"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for q, value in summary.quantiles().items():
+                lines.append(f"{metric}{_labels(labels, quantile=q)} {value:.6f}")
+            lines.append(f"{metric}_sum{_labels(labels)} {summary.total:.6f}")
+            lines.append(f"{metric}_count{_labels(labels)} {summary.count}")
+        for (name, labels), value in counters:
+            metric = f"hireease_{name}_total"
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels, **extra):
+    items = list(labels) + [(k, v) for k, v in extra.items()]
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+registry = Registry()
+
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        registry.observe(self.name, elapsed, **self.labels)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append((self.name, elapsed))
+        return False
+
+
+def span(name, **labels):
+    """Context manager timing a block under ``name``"""
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _Span(name, labels)
+
+
+def timed(name):
+    """Decorator form of span(); a no-op when metrics are disabled"""
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_trace():
+    """Begin collecting spans for the current request; returns a token for end_trace()"""
+    return _trace.set([])
+
+
+def end_trace(token):
+    spans = _trace.get()
+    _trace.reset(token)
+    return spans or []
+
+
+def server_timing(spans, total):
+    """Server-Timing header value: total plus the summed time per span name"""
+    per_name = Counter()
+    for name, elapsed in spans:
+        per_name[name] += elapsed
+    parts = [f"total;dur={total * 1000:.1f}"]
+    parts += [f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in per_name.most_common(8)]
+    return ", ".join(parts)
+
+
+# ============================
+# Sampling Profiler
+# ============================
+def sample_profile(seconds, interval=PROFILER_INTERVAL):
+    """Sample every thread's stack for ``seconds``; returns collapsed stacks
+    (one "frame;frame;frame count" line each, ready for flamegraph tools)"""
+    stacks = Counter()
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+        time.sleep(interval)
+    return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
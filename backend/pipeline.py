@@ -0,0 +1,133 @@
+import os
+import time
+import asyncio
+from uuid import uuid4
+
+import metrics
+from storage import get_store
+
+# ============================
+# Background Resume Pipeline
+# ============================
+# /apply/ only stores the resume and enqueues a task; a bounded pool of
+# asyncio workers claims tasks from the persistent queue in the store and
+# runs the blocking parse -> structure -> validate -> Sheets steps in
+# worker threads, so slow upstream services never block the event loop.
+# A task that fails with a retryable error is requeued with exponential
+# backoff (PIPELINE_RETRY_BACKOFF doubling, capped at 10 minutes).
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+PIPELINE_IDLE_POLL = float(os.getenv("PIPELINE_IDLE_POLL", "1.0"))
+PIPELINE_MAX_ATTEMPTS = int(os.getenv("PIPELINE_MAX_ATTEMPTS", "3"))
+PIPELINE_RETRY_BACKOFF = float(os.getenv("PIPELINE_RETRY_BACKOFF", "5"))
+
+
+class TaskFailed(Exception):
+    """Raised by a step when retrying the task cannot help"""
+
+
+class TaskContext:
+    """Handed to the pipeline handler to report progress on one task"""
+
+    def __init__(self, task):
+        self.id = task["id"]
+        self.application_id = task["application_id"]
+        self.attempts = task["attempts"]
+        self.payload = task["payload"]
+        self.messages = task["log"]
+        self._step = None
+        self._step_start = None
+
+    def step(self, name):
+        """Record that the task moved on to ``name``"""
+        self.end_step()
+        self._step, self._step_start = name, time.perf_counter()
+        get_store().update_task(self.id, step=name)
+
+    def end_step(self):
+        """Time the current step into the pipeline_step metric"""
+        if self._step is not None:
+            metrics.registry.observe("pipeline_step", time.perf_counter() - self._step_start, step=self._step)
+            self._step = None
+
+    def log(self, message):
+        self.messages.append(message)
+        get_store().update_task(self.id, log=self.messages)
+
+
+class ResumePipeline:
+    """Bounded worker pool draining the persistent task queue.
+
+    ``handler(ctx)`` runs one task to completion in a worker thread.
+    ``on_failure(ctx, error)`` is called once a task fails for good.
+    """
+
+    def __init__(self, handler, on_failure, workers=PIPELINE_WORKERS):
+        self.handler = handler
+        self.on_failure = on_failure
+        self.workers = workers
+        self._tasks = []
+        self._wake = None
+
+    async def submit(self, application_id, payload, application=None):
+        """Queue ``application_id`` for processing, inserting ``application`` with its task if given"""
+        task_id = str(uuid4())
+        await asyncio.to_thread(get_store().enqueue_task, task_id, application_id, payload, application)
+        if self._wake:
+            self._wake.set()
+        return task_id
+
+    async def start(self):
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self):
+        store = get_store()
+        while True:
+            # A worker must outlive any one task: an error here is counted and
+            # the task is left to its lease, which hands it to a worker again
+            try:
+                task = await asyncio.to_thread(store.claim_task)
+            except Exception as e:
+                print("Pipeline claim error:", e)
+                metrics.registry.inc("pipeline_worker_errors", stage="claim")
+                await asyncio.sleep(PIPELINE_IDLE_POLL)
+                continue
+            if task is None:
+                # Idle: wait for a submit, but also re-check the queue
+                # periodically for tasks enqueued by other workers.
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), PIPELINE_IDLE_POLL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(TaskContext(task))
+            except Exception as e:
+                print(f"Pipeline task {task['id']} error:", e)
+                metrics.registry.inc("pipeline_worker_errors", stage="task")
+
+    async def _run(self, ctx):
+        store = get_store()
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.handler, ctx)
+        except Exception as e:
+            ctx.end_step()
+            metrics.registry.observe("pipeline_task", time.perf_counter() - start, outcome="error")
+            ctx.messages.append(f"❌ {e}")
+            if isinstance(e, TaskFailed) or ctx.attempts >= PIPELINE_MAX_ATTEMPTS:
+                await asyncio.to_thread(store.update_task, ctx.id, status="failed", error=str(e), log=ctx.messages)
+                await asyncio.to_thread(self.on_failure, ctx, e)
+            else:
+                await asyncio.to_thread(store.retry_task, ctx.id, str(e), ctx.messages, PIPELINE_RETRY_BACKOFF)
+            return
+        ctx.end_step()
+        metrics.registry.observe("pipeline_task", time.perf_counter() - start, outcome="done")
+        await asyncio.to_thread(store.update_task, ctx.id, status="done", error=None, log=ctx.messages)
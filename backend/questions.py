@@ -0,0 +1,192 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import llm
+import metrics
+from cache import DiskCache, content_hash
+
+# ============================
+# Interview Question Bank
+# ============================
+# Generated questions are banked per normalised (role, topic): kept in
+# memory and mirrored to a disk cache so they survive restarts. A request
+# that the bank already covers never reaches Gemini. When more questions
+# are needed than the bank holds, the shortfall is requested in chunks of
+# QUESTION_CHUNK_SIZE, each with a different angle so parallel chunks
+# don't repeat each other. The chunks run concurrently through the LLM
+# gateway, and the results are deduplicated into the bank. Each chunk's
+# token budget covers its size, so large sets are no longer cut off.
+#
+# Only one generation per (role, topic) runs at a time; concurrent
+# callers wait for it and then read the bank. shutdown() stops the
+# warm-up and cancels queued chunks; a chunk already at Gemini is bounded
+# by the gateway's LLM_TIMEOUT. The disk cache and the chunk pool are
+# created on first use, so importing the module costs nothing and the
+# bank keeps working after a shutdown (the next request starts a new
+# pool). Warm-up failures are counted in the question_warmup_failures
+# metric, with the latest kept in ``last_error``.
+QUESTION_CHUNK_SIZE = int(os.getenv("QUESTION_CHUNK_SIZE", "10"))
+QUESTION_TOKENS_PER_QUESTION = int(os.getenv("QUESTION_TOKENS_PER_QUESTION", "80"))
+QUESTION_MAX_PER_REQUEST = int(os.getenv("QUESTION_MAX_PER_REQUEST", "100"))
+QUESTION_WARM_ROLES = int(os.getenv("QUESTION_WARM_ROLES", "5"))
+QUESTION_WARM_COUNT = int(os.getenv("QUESTION_WARM_COUNT", "20"))
+QUESTION_PROMPT_VERSION = "1"
+
+ANGLES = (
+    "core concepts and fundamentals",
+    "practical scenarios from day-to-day work",
+    "problem solving and debugging",
+    "design decisions and trade-offs",
+    "past experience and behaviour",
+    "advanced and edge-case topics",
+)
+
+_SPACES = re.compile(r"\s+")
+_NUMBERING = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+_NON_WORD = re.compile(r"[^a-z0-9 ]")
+
+
+def normalize_key(text):
+    return _SPACES.sub(" ", str(text or "").strip().lower())
+
+
+def parse_numbered_list(text):
+    """Questions from a numbered or bulleted list, one per line"""
+    questions = []
+    for line in text.splitlines():
+        line = _NUMBERING.sub("", line).strip()
+        if line:
+            questions.append(line)
+    return questions
+
+
+def _fingerprint(question):
+    return _SPACES.sub(" ", _NON_WORD.sub("", question.lower())).strip()
+
+
+class QuestionBank:
+    def __init__(self, cache=None, generate=None):
+        self.generate = generate or llm.generate
+        self.last_error = None
+        self._cache = cache
+        self._banks = {}   # (role, topic) -> list of questions
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._pool = None
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    cache = DiskCache("questions")
+                    cache.ensure_version(QUESTION_PROMPT_VERSION)
+                    self._cache = cache
+        return self._cache
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=llm.LLM_MAX_IN_FLIGHT, thread_name_prefix="question-bank")
+            return self._pool
+
+    def get(self, role, topic, count):
+        """``count`` questions for the role/topic, generating only what the bank lacks"""
+        key = (normalize_key(role), normalize_key(topic))
+        bank = self._bank(key)
+        if len(bank) >= count:
+            return bank[:count]
+        with self._key_lock(key):
+            bank = self._bank(key)
+            missing = count - len(bank)
+            if missing > 0:
+                bank = self._extend(key, role, topic, missing)
+        return bank[:count]
+
+    def depth(self):
+        with self._lock:
+            return [
+                {"role": role, "topic": topic or None, "questions": len(bank)}
+                for (role, topic), bank in sorted(self._banks.items())
+            ]
+
+    def warm(self, roles, count=QUESTION_WARM_COUNT):
+        """Fill the bank for ``roles`` (most popular first); errors are counted and skipped"""
+        self._stopping.clear()
+        for role in roles:
+            if self._stopping.is_set():
+                return
+            try:
+                self.get(role, None, count)
+            except Exception as e:
+                if not self._stopping.is_set():
+                    metrics.registry.inc("question_warmup_failures")
+                    self.last_error = f"Warm-up failed for {role}: {e}"
+
+    def shutdown(self):
+        """Stop the warm-up and cancel queued chunks; the bank stays usable"""
+        self._stopping.set()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ----- internals -----
+    def _bank(self, key):
+        with self._lock:
+            bank = self._banks.get(key)
+        if bank is None:
+            bank = self.cache.get(content_hash(*key)) or []
+            with self._lock:
+                bank = self._banks.setdefault(key, bank)
+        return bank
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _extend(self, key, role, topic, missing):
+        bank = list(self._bank(key))
+        target = len(bank) + missing
+        seen = {_fingerprint(q) for q in bank}
+        pool = self._get_pool()
+        # Duplicates across chunks are dropped, so allow a couple of top-up rounds
+        for attempt in range(3):
+            sizes = [QUESTION_CHUNK_SIZE] * (missing // QUESTION_CHUNK_SIZE)
+            if missing % QUESTION_CHUNK_SIZE:
+                sizes.append(missing % QUESTION_CHUNK_SIZE)
+            first = len(bank) // QUESTION_CHUNK_SIZE + attempt
+            futures = [
+                pool.submit(self._chunk, role, topic, size, ANGLES[(first + i) % len(ANGLES)])
+                for i, size in enumerate(sizes)
+            ]
+            for future in futures:
+                for question in future.result():
+                    fingerprint = _fingerprint(question)
+                    if fingerprint and fingerprint not in seen:
+                        seen.add(fingerprint)
+                        bank.append(question)
+            missing = target - len(bank)
+            if missing <= 0:
+                break
+        with self._lock:
+            self._banks[key] = bank
+        self.cache.set(content_hash(*key), bank)
+        return bank
+
+    def _chunk(self, role, topic, size, angle):
+        prompt = f"Generate {size} interview questions for the role '{role}'"
+        if topic:
+            prompt += f" focused on '{topic}'"
+        prompt += f", emphasising {angle}. Provide only the questions in a numbered list."
+        text = self.generate(prompt, generation_config={
+            "temperature": 0.4,
+            "max_output_tokens": size * QUESTION_TOKENS_PER_QUESTION,
+        })
+        return parse_numbered_list(text.strip())[:size]
+
+
+question_bank = QuestionBank()
@@ -0,0 +1,160 @@
+import os
+import re
+import json
+
+# ============================
+# Resume Schema
+# ============================
+# The structuring prompt sends RESUME_SCHEMA as Gemini's response schema,
+# so the reply is JSON of the right shape (no code fences, numeric
+# experience, skills as a list) instead of free text parsed afterwards.
+# validate() type-checks and normalises a reply in one pass: experience
+# becomes a number, skills a de-duplicated list, phones E.164 and emails
+# lower-cased. Any field it can't accept comes back as a problem.
+#
+# Only the problem fields are then re-asked with repair_prompt(), a small
+# follow-up that carries the resume text and a schema of just those
+# fields, instead of structuring the whole document again. A value the
+# repair can't fix either keeps the model's original answer, so repairs
+# never turn an application that used to pass into a failure.
+RESUME_DEFAULT_COUNTRY_CODE = os.getenv("RESUME_DEFAULT_COUNTRY_CODE", "")
+
+FIELDS = {
+    "Full Name": {"type": "string", "description": "Candidate's full name"},
+    "Email": {"type": "string", "description": "Email address"},
+    "Phone": {"type": "string", "description": "Phone number in E.164 format, e.g. +919876543210"},
+    "Position Applied": {"type": "string", "description": "Role the resume targets"},
+    "Years of Experience": {"type": "number", "description": "Total professional experience in years"},
+    "Skills": {"type": "array", "items": {"type": "string"}, "description": "Individual skills, one per item"},
+    "Preferred Location": {"type": "string"},
+    "Availability": {"type": "string", "description": "Notice period or availability"},
+}
+REQUIRED = ["Full Name", "Email", "Phone", "Years of Experience", "Skills", "Availability"]
+
+EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+'-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}$")
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+NON_DIGITS = re.compile(r"\D")
+SKILL_SPLIT = re.compile(r"[,;\n•]")
+
+
+def schema(fields=None):
+    """Response schema for ``fields`` (all resume fields by default)"""
+    names = fields or list(FIELDS)
+    return {
+        "type": "object",
+        "properties": {name: {**FIELDS[name], "nullable": True} for name in names},
+        "required": [name for name in REQUIRED if name in names],
+    }
+
+
+RESUME_SCHEMA = schema()
+
+
+# ----- field validators: return the clean value or raise ValueError -----
+def _text(value):
+    if isinstance(value, (list, dict)):
+        raise ValueError("expected text")
+    return str(value).strip()
+
+
+def _email(value):
+    email = _text(value).lower().removeprefix("mailto:")
+    if not EMAIL_RE.match(email):
+        raise ValueError("not a valid email address")
+    return email
+
+
+def _phone(value):
+    raw = _text(value)
+    digits = NON_DIGITS.sub("", raw)
+    if raw.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif RESUME_DEFAULT_COUNTRY_CODE:
+        digits = RESUME_DEFAULT_COUNTRY_CODE.lstrip("+") + digits.lstrip("0")
+    else:
+        raise ValueError("missing country code")
+    if not 8 <= len(digits) <= 15 or digits.startswith("0"):
+        raise ValueError("not a valid E.164 number")
+    return "+" + digits
+
+
+def _years(value):
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    if isinstance(value, (int, float)):
+        years = float(value)
+    else:
+        match = NUMBER_RE.search(_text(value))
+        if not match:
+            raise ValueError("expected a number")
+        years = float(match.group())
+    if not 0 <= years <= 60:
+        raise ValueError("out of range")
+    return int(years) if years.is_integer() else round(years, 1)
+
+
+def _skills(value):
+    items = value if isinstance(value, list) else SKILL_SPLIT.split(_text(value))
+    skills, seen = [], set()
+    for item in items:
+        skill = str(item).strip(" .")
+        if skill and skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    if not skills:
+        raise ValueError("no skills listed")
+    return skills
+
+
+VALIDATORS = {
+    "Email": _email,
+    "Phone": _phone,
+    "Years of Experience": _years,
+    "Skills": _skills,
+}
+
+
+def validate(data):
+    """Return (clean, problems): normalised fields and {field: reason} for the rest"""
+    if not isinstance(data, dict):
+        return {}, {name: "missing" for name in REQUIRED}
+    clean, problems = {}, {}
+    for name, value in data.items():
+        if value is None or value == "" or value == []:
+            continue
+        if name not in FIELDS:
+            clean[name] = value
+            continue
+        try:
+            clean[name] = VALIDATORS.get(name, _text)(value)
+        except ValueError as e:
+            problems[name] = str(e)
+    for name in REQUIRED:
+        if name not in clean and name not in problems:
+            problems[name] = "missing"
+    return clean, problems
+
+
+def repair_prompt(text, problems, answers):
+    """Follow-up prompt asking only for the fields in ``problems``"""
+    issues = "\n".join(
+        f"- {name}: {reason}" + (f" (was {json.dumps(answers[name])})" if name in answers else "")
+        for name, reason in problems.items()
+    )
+    return (
+        "You extracted candidate information from the resume below, but these fields "
+        f"were missing or invalid:\n{issues}\n\n"
+        "Return ONLY a JSON object with corrected values for exactly these fields. "
+        "Use null when the resume does not contain the information.\n\n"
+        f"Resume:\n{text}"
+    )
+
+
+def flatten(clean):
+    """Row form for storage and Sheets: skills joined, nothing None"""
+    row = dict(clean)
+    if isinstance(row.get("Skills"), list):
+        row["Skills"] = ", ".join(row["Skills"])
+    return {k: ("" if v is None else v) for k, v in row.items()}
@@ -0,0 +1,299 @@
+import os
+import threading
+from uuid import uuid4
+from datetime import datetime
+
+from storage import get_store
+from pipeline import ResumePipeline, TaskFailed
+from cache import DiskCache, content_hash
+from llamaparse import upload_file_backend, poll_result
+from ingest import BulkIngestor
+from extract import extract_local, EXTRACT_MIN_SCORE
+from search import resume_search
+from sheets_sync import sheets_outbox
+import llm
+import metrics
+import resume_schema
+
+# ============================
+# Resume Processing
+# ============================
+# Everything between an uploaded resume and a stored application:
+# parsing (cache, local extraction, LlamaParse), Gemini structuring,
+# validation, the Sheets outbox and the search vector. The /apply/
+# pipeline and bulk ingestion share it, and so does `python ingest.py`,
+# which doesn't need the web app to run. Nothing here talks to LlamaParse,
+# Gemini or Apps Script until the first resume arrives.
+SHEETS_WEBAPP_URL = os.getenv("SHEETS_WEBAPP_URL")
+
+# ============================
+# Parse / Structure Caches
+# ============================
+# Bump STRUCTURE_PROMPT_VERSION whenever the structuring prompt changes;
+# cached Gemini results from the old prompt are dropped on startup.
+STRUCTURE_PROMPT_VERSION = "2"
+
+parse_cache = DiskCache("llamaparse")
+parse_jobs_cache = DiskCache("llamaparse_jobs")  # LlamaParse job id -> file hash
+structure_cache = DiskCache("gemini_structure")
+structure_cache.ensure_version(STRUCTURE_PROMPT_VERSION)
+
+def parse_resume_file(source, file_name, file_type, key=None):
+    """
+    Return (parsed text, source) for a resume path or bytes.
+
+    Tries, in order: the parse cache, local extraction (if its quality
+    score clears EXTRACT_MIN_SCORE), then LlamaParse. If LlamaParse is
+    unavailable, any non-empty local text is used instead.
+    source is one of "cache", "local" or "llamaparse". A precomputed
+    content hash can be passed as ``key`` so a cache hit skips the read.
+    """
+    if key is not None:
+        parsed_text = parse_cache.get(key)
+        if parsed_text is not None:
+            return parsed_text, "cache"
+    if isinstance(source, bytes):
+        data = source
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    key = key or content_hash(data)
+    parsed_text = parse_cache.get(key)
+    if parsed_text is not None:
+        return parsed_text, "cache"
+
+    local_text, score, _ = extract_local(data)
+    if score >= EXTRACT_MIN_SCORE:
+        parse_cache.set(key, local_text)
+        return local_text, "local"
+
+    try:
+        parsed_text = poll_result(upload_file_backend(data, file_name, file_type))
+    except Exception:
+        if not local_text:
+            raise
+        return local_text, "local"
+    parse_cache.set(key, parsed_text)
+    return parsed_text, "llamaparse"
+
+def structure_resume_text(text):
+    """Return (structured dict, cache hit), keyed by the parsed text and prompt version"""
+    key = content_hash(STRUCTURE_PROMPT_VERSION, text)
+    structured = structure_cache.get(key)
+    if structured is not None:
+        return structured, True
+    structured = structure_with_gemini(text)
+    structure_cache.set(key, structured)
+    return structured, False
+
+# ============================
+# Gemini Helper
+# ============================
+STRUCTURE_INSTRUCTIONS = """
+You are an expert recruitment assistant.
+Extract structured candidate information from the following text.
+Fill every field the text supports; use null for information it does not contain.
+Write the phone number in E.164 format with its country code, list each skill
+separately, and give years of experience as a number.
+"""
+
+structure_batcher = llm.PromptBatcher(STRUCTURE_INSTRUCTIONS, schema=resume_schema.RESUME_SCHEMA)
+structure_stats = {"structured": 0, "repaired": 0, "repair_calls": 0, "unrepaired_fields": 0}
+_structure_stats_lock = threading.Lock()
+
+def _count(**deltas):
+    # Pipeline workers structure resumes in parallel threads
+    with _structure_stats_lock:
+        for name, delta in deltas.items():
+            structure_stats[name] += delta
+
+def structuring_stats():
+    with _structure_stats_lock:
+        return dict(structure_stats)
+
+@metrics.timed("structure_with_gemini")
+def structure_with_gemini(text):
+    """Use Gemini to structure parsed text into a validated, Sheets-ready dict"""
+    answer = structure_batcher.submit(text).result()
+    structured, problems = resume_schema.validate(answer)
+    _count(structured=1)
+
+    # Re-ask only for the fields that are missing or invalid
+    if problems:
+        _count(repair_calls=1)
+        original = answer if isinstance(answer, dict) else {}
+        try:
+            fixes = llm.parse_json_response(llm.generate(
+                resume_schema.repair_prompt(text, problems, original),
+                llm.json_config(resume_schema.schema(list(problems)), temperature=0),
+            ))
+        except Exception:
+            fixes = {}
+        fixed, problems = resume_schema.validate({**original, **structured, **(fixes if isinstance(fixes, dict) else {})})
+        _count(repaired=int(not problems), unrepaired_fields=len(problems))
+        structured = fixed
+        # Keep the first answer for anything still invalid; missing fields fail validation as before
+        for name in problems:
+            if original.get(name) not in (None, "", []):
+                structured[name] = original[name]
+
+    return resume_schema.flatten(structured)
+
+# ============================
+# Required Resume Fields
+# ============================
+REQUIRED_FIELDS = [
+    "Full Name",
+    "Email",
+    "Phone",
+    "Position Applied",
+    "Years of Experience",
+    "Skills",
+    "Availability"
+]
+
+# ============================
+# Validation Function
+# ============================
+def validate_parsed_resume(structured_data: dict):
+    """
+    Validates that the parsed JSON contains all required fields
+    and that none of them are empty or None.
+
+    Args:
+        structured_data (dict): JSON output from Gemini
+
+    Raises:
+        ValueError: If any required field is missing or empty
+    """
+    missing_fields = [f for f in REQUIRED_FIELDS if structured_data.get(f) in (None, "", [])]
+    if missing_fields:
+        raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+    return True
+
+# ============================
+# Application Pipeline
+# ============================
+UPLOAD_DIR = "uploads"
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def process_application(ctx):
+    """Pipeline handler: parse, structure, validate and store one application"""
+    payload = ctx.payload
+    ctx.log(f"✅ Resume file saved as {os.path.basename(payload['file_path'])}")
+
+    # Step 1: Text extraction (cache, local or LlamaParse)
+    ctx.step("parse")
+    parsed_text, source = parse_resume_file(
+        payload["file_path"], payload["file_name"], payload["content_type"], payload.get("content_hash")
+    )
+    ctx.log({
+        "cache": "✅ Reused cached parse of identical resume",
+        "local": "✅ Text extracted locally",
+        "llamaparse": "✅ Parsing completed with LlamaParse"
+    }[source])
+
+    # Step 2: Gemini structuring
+    ctx.step("structure")
+    structured_data, cached = structure_resume_text(parsed_text)
+    ctx.log("✅ Reused cached structured JSON" if cached else "✅ Gemini structured JSON generated")
+
+    # Step 3: Validate required fields
+    ctx.step("validate")
+    try:
+        validate_parsed_resume(structured_data)
+        ctx.log("✅ Validation passed: all required fields present")
+    except ValueError as e:
+        # Kept for inspection only: candidate, search and matching indexes read structured_data
+        get_store().update_application(ctx.application_id, {"structured_error": structured_data})
+        raise TaskFailed(f"Validation failed: {str(e)}")
+
+    # Step 4: Add job info
+    add_job_info(structured_data, payload["jobId"], payload["position"], payload["company"])
+    ctx.log("✅ Added job info to structured data")
+
+    # Step 5: Queue the row for Google Sheets (flushed in batches by the outbox)
+    if SHEETS_WEBAPP_URL:
+        ctx.step("sheets")
+        sheets_outbox.enqueue(ctx.application_id, structured_data)
+        ctx.log("✅ Queued for Google Sheets")
+
+    # Step 6: Save locally
+    ctx.step("save")
+    get_store().update_application(ctx.application_id, {
+        "status": "applied",
+        "lastUpdate": datetime.now().isoformat(),
+        "structured_data": structured_data
+    })
+    ctx.log("✅ Application saved locally")
+
+    # Step 7: Vectorise the parsed resume for semantic search
+    ctx.step("embed")
+    try:
+        get_store().put_embeddings(resume_search.embedder.name, [(ctx.application_id, resume_search.encode([parsed_text])[0])])
+        ctx.log("✅ Indexed for search")
+    except Exception as e:
+        ctx.log(f"⚠️ Search indexing skipped: {e}")
+
+    if os.path.exists(payload["file_path"]):
+        os.remove(payload["file_path"])
+
+def fail_application(ctx, error):
+    """Pipeline failure hook: mark the application failed and drop the resume"""
+    get_store().update_application(ctx.application_id, {
+        "status": "failed",
+        "lastUpdate": datetime.now().isoformat(),
+        "error": str(error)
+    })
+    if os.path.exists(ctx.payload["file_path"]):
+        os.remove(ctx.payload["file_path"])
+
+def add_job_info(structured_data, job_id, position, company):
+    structured_data["Position Applied"] = position
+    structured_data["Company"] = company
+    structured_data["Job ID"] = job_id
+    structured_data["Status"] = "Applied"
+    structured_data["Applied Date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+resume_pipeline = ResumePipeline(process_application, fail_application)
+
+# ============================
+# Bulk Ingestion
+# ============================
+def bulk_ingestor(job_id, position, company, workers=None):
+    """BulkIngestor that turns each resume into an applied application for one job"""
+    # Vectors wait here until their application's batch is inserted; the
+    # store writes them (and the Sheets rows) in the same transaction
+    vectors = {}
+
+    def process(name, data, content_type):
+        parsed_text, _ = parse_resume_file(data, name, content_type)
+        structured_data, _ = structure_resume_text(parsed_text)
+        validate_parsed_resume(structured_data)
+        add_job_info(structured_data, job_id, position, company)
+
+        application_id = str(uuid4())
+        vectors[application_id] = resume_search.encode([parsed_text])[0]
+
+        now = datetime.now().isoformat()
+        return {
+            "id": application_id,
+            "jobId": job_id,
+            "position": position,
+            "company": company,
+            "status": "applied",
+            "appliedDate": now,
+            "lastUpdate": now,
+            "resume_filename": name,
+            "structured_data": structured_data
+        }
+
+    def save_batch(applications):
+        embeddings = (resume_search.embedder.name, [(a["id"], vectors.pop(a["id"])) for a in applications])
+        outbox = [(a["id"], sheets_outbox.row(a["id"], a["structured_data"])) for a in applications] if SHEETS_WEBAPP_URL else None
+        get_store().insert_applications(applications, embeddings, outbox)
+        if outbox:
+            sheets_outbox.queued(len(outbox))
+
+    kwargs = {"workers": workers} if workers else {}
+    return BulkIngestor(process, save_batch, **kwargs)
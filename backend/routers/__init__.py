@@ -0,0 +1,6 @@
+# ============================
+# API Routers
+# ============================
+# One module per feature, each exposing ``router``; app.py includes them
+# in order. Shared request helpers (pagination, uploads) are in common.py,
+# the resume pipeline itself in resumes.py.
@@ -0,0 +1,43 @@
+from typing import Optional
+from fastapi import APIRouter, Query
+
+from storage import get_store
+from analytics import recruitment_analytics
+
+router = APIRouter(tags=["analytics"])
+
+# ============================
+# Recruitment Analytics
+# ============================
+def analytics():
+    recruitment_analytics.sync(get_store())
+    return recruitment_analytics
+
+@router.get("/analytics/summary")
+def analytics_summary():
+    return {**analytics().summary(), "roleDistribution": recruitment_analytics.roles()}
+
+@router.get("/analytics/jobs/{job_id}")
+def analytics_job(job_id: str):
+    return analytics().job(job_id)
+
+@router.get("/analytics/time-in-stage")
+def analytics_time_in_stage():
+    return analytics().time_in_stage()
+
+@router.get("/analytics/daily")
+def analytics_daily(days: Optional[int] = Query(None, ge=1, le=3650)):
+    return analytics().per_day(days)
+
+@router.get("/analytics/skills")
+def analytics_skills(limit: int = Query(20, ge=1, le=500)):
+    return analytics().top_skills(limit)
+
+@router.get("/analytics/experience")
+def analytics_experience():
+    return analytics().experience_distribution()
+
+@router.post("/analytics/rebuild")
+def analytics_rebuild():
+    """Recompute all aggregates from the full store (pandas if installed)"""
+    return recruitment_analytics.rebuild(get_store())
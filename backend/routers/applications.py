@@ -0,0 +1,262 @@
+import os
+import json
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from uuid import uuid4
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Body, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from pydantic import BaseModel
+
+from storage import get_store, VersionConflict, BatchRejected
+from ingest import iter_zip
+from transitions import check_transition, TransitionError
+from resumes import resume_pipeline, bulk_ingestor, UPLOAD_DIR
+from routers.common import decode_cursor, paged_response, read_upload
+
+router = APIRouter(tags=["applications"])
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# ============================
+# Application Storage
+# ============================
+class Application(BaseModel):
+    id: str
+    jobId: str
+    position: str
+    company: str
+    status: str
+    appliedDate: str
+    lastUpdate: str
+    resume_filename: Optional[str] = None
+
+# ============================
+# Resume Processing & Application Endpoints
+# ============================
+
+@router.post("/process/")
+async def process_resume(file: UploadFile = File(...)):
+    """Process resume for validation - simple validation endpoint"""
+    # Size and type are checked while reading; nothing is kept afterwards
+    with await read_upload(file) as upload:
+        return {"success": True, "message": "Resume validated successfully", "type": upload.kind, "size": upload.size}
+
+@router.post("/apply/")
+async def apply_with_resume(
+    jobId: str = Query(...),
+    position: str = Query(...),
+    company: str = Query(...),
+    file: UploadFile = File(...)
+):
+    """Store the resume and queue it for processing; returns immediately"""
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API key not configured")
+
+    # The queued task outlives this request, so this is the one upload path
+    # that keeps the resume on disk (removed once the task finishes)
+    with await read_upload(file) as upload:
+        resume_filename, file_path = await asyncio.to_thread(upload.save, UPLOAD_DIR)
+
+    app_data = {
+        "id": str(uuid4()),
+        "jobId": jobId,
+        "position": position,
+        "company": company,
+        "status": "processing",
+        "appliedDate": datetime.now().isoformat(),
+        "lastUpdate": datetime.now().isoformat(),
+        "resume_filename": resume_filename,
+        "structured_data": None
+    }
+    # The application and its task are written in one transaction
+    await resume_pipeline.submit(app_data["id"], {
+        "file_path": file_path,
+        "file_name": file.filename,
+        "content_type": upload.content_type,
+        "content_hash": upload.key,
+        "jobId": jobId,
+        "position": position,
+        "company": company
+    }, app_data)
+
+    return {
+        "success": True,
+        "message": "Application received, resume is being processed",
+        "application": app_data,
+        "status_url": f"/applications/{app_data['id']}/progress"
+    }
+
+# ============================
+# Bulk Ingestion
+# ============================
+@router.post("/bulk-ingest")
+def bulk_ingest(
+    jobId: str = Query(...),
+    position: str = Query(...),
+    company: str = Query(...),
+    file: UploadFile = File(...)
+):
+    """Ingest a ZIP of resumes, streaming one NDJSON progress line per file"""
+    if not file.filename.lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Please upload a ZIP archive of PDF, DOC or DOCX resumes.")
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API key not configured")
+
+    events = bulk_ingestor(jobId, position, company).run(iter_zip(file.file))
+    return StreamingResponse((json.dumps(event) + "\n" for event in events), media_type="application/x-ndjson")
+
+@router.get("/applications")
+def get_applications(
+    request: Request,
+    jobId: Optional[str] = None,
+    status: Optional[str] = None,
+    applied_from: Optional[str] = None,
+    applied_to: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Applications in insertion order.
+
+    ``status`` takes a comma separated list, ``applied_from``/``applied_to``
+    are ISO dates, and ``fields=id,status,position`` trims each record.
+    With ``limit`` the next page's cursor comes back in X-Next-Cursor.
+    """
+    def build():
+        return get_store().page_applications(
+            jobId, status.split(",") if status else None, applied_from, applied_to, decode_cursor(cursor), limit
+        )
+    return paged_response(request, build, fields)
+
+@router.get("/applications/{application_id}")
+def get_application(application_id: str):
+    app = get_store().get_application(application_id)
+    if not app:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return app
+
+@router.get("/applications/{application_id}/progress")
+def get_application_progress(application_id: str):
+    app = get_store().get_application(application_id)
+    if not app:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return {
+        "applicationId": application_id,
+        "status": app["status"],
+        "task": get_store().get_task_for_application(application_id)
+    }
+
+@router.put("/applications/{application_id}")
+def update_application_status(application_id: str, status_data: dict = Body(...)):
+    changes = {"lastUpdate": datetime.now().isoformat()}
+    if "status" in status_data:
+        changes["status"] = status_data["status"]
+
+    # Clients that send back the version they read get optimistic locking
+    try:
+        updated = get_store().update_application(application_id, changes, status_data.get("version"))
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return updated
+
+@router.post("/applications")
+def create_application(app: Application):
+    app.id = str(uuid4())
+    get_store().insert_application(app.dict())
+    return app
+
+# ============================
+# Batch Status Transitions
+# ============================
+# Moving many applications at once ("advance all 40 shortlisted to
+# Technical") is one store transaction instead of one PUT per
+# application. Each item is checked against the status workflow
+# (transitions.py) and succeeds or fails on its own, unless the batch
+# asks to be atomic.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+
+class ApplicationTransition(BaseModel):
+    id: str
+    status: Optional[str] = None
+    # Move to this interview round of the application's job; status defaults to "interview"
+    roundId: Optional[str] = None
+    version: Optional[int] = None
+
+class BatchTransitions(BaseModel):
+    transitions: List[ApplicationTransition]
+    # All or nothing: one failing item rolls the whole batch back
+    atomic: bool = False
+
+def transition_check(rounds):
+    """Workflow and round checks run against each application inside the transaction"""
+    def check(record, changes):
+        if "roundId" in changes:
+            round = rounds.get(changes["roundId"])
+            if round is None:
+                raise LookupError(f"Round {changes['roundId']} not found")
+            if round.get("jobId") != record.get("jobId"):
+                raise TransitionError(f"Round {round['id']} belongs to job {round.get('jobId')}, not {record.get('jobId')}")
+        check_transition(record.get("status"), changes["status"])
+    return check
+
+def transition_error_code(error):
+    if isinstance(error, LookupError):
+        return 404
+    if isinstance(error, VersionConflict):
+        return 409
+    return 422
+
+def apply_transitions(updates, check, atomic=False):
+    """Run (id, changes, version) updates as one batch; returns (committed, per-item results)"""
+    try:
+        results, committed = get_store().update_applications(updates, check, atomic), True
+    except BatchRejected as e:
+        results, committed = e.results, False
+    items = []
+    for (application_id, _, _), (record, error) in zip(updates, results):
+        if error is not None:
+            items.append({"id": application_id, "ok": False, "code": transition_error_code(error), "error": str(error)})
+        elif not committed:
+            items.append({"id": application_id, "ok": False, "code": 424, "error": "Rolled back with the rest of the batch"})
+        else:
+            items.append({
+                "id": application_id,
+                "ok": True,
+                "status": record.get("status"),
+                "roundId": record.get("roundId"),
+                "version": record.get("version"),
+            })
+    return committed, items
+
+@router.post("/applications/batch")
+def batch_update_applications(payload: BatchTransitions):
+    """Apply status / round transitions to many applications in one transaction, with a result per item"""
+    if not payload.transitions:
+        raise HTTPException(status_code=400, detail="No transitions given")
+    if len(payload.transitions) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} transitions per batch")
+    round_ids = {t.roundId for t in payload.transitions if t.roundId}
+    rounds = get_store().get_rounds(round_ids) if round_ids else {}
+
+    now = datetime.now().isoformat()
+    updates = []
+    for i, t in enumerate(payload.transitions):
+        if not t.status and not t.roundId:
+            raise HTTPException(status_code=400, detail=f"Transition {i} needs a status or a roundId")
+        changes = {"status": t.status or "interview", "lastUpdate": now}
+        if t.roundId:
+            changes["roundId"] = t.roundId
+            changes["round"] = rounds.get(t.roundId, {}).get("name")
+        updates.append((t.id, changes, t.version))
+
+    committed, results = apply_transitions(updates, transition_check(rounds), payload.atomic)
+    body = {
+        "committed": committed,
+        "updated": sum(r["ok"] for r in results),
+        "failed": sum(not r["ok"] for r in results),
+        "results": results,
+    }
+    return JSONResponse(body, status_code=200 if committed else 409)
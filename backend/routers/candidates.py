@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from storage import get_store
+from routers.common import decode_cursor, paged_response
+
+router = APIRouter(tags=["candidates"])
+
+# ============================
+# Candidates (one shared profile per person)
+# ============================
+@router.get("/candidates")
+def list_candidates(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    return paged_response(request, lambda: get_store().page_candidates(decode_cursor(cursor), limit))
+
+@router.get("/candidates/stats")
+def candidate_stats():
+    return get_store().candidate_stats()
+
+@router.get("/candidates/{candidate_id}")
+def get_candidate(candidate_id: str):
+    candidate = get_store().get_candidate(candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return candidate
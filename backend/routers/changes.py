@@ -0,0 +1,73 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from changes import change_feed, KINDS as CHANGE_KINDS
+from routers.common import project
+
+router = APIRouter(tags=["changes"])
+
+# ============================
+# Change Feed (applications, jobs, rounds)
+# ============================
+def change_filter(kinds: Optional[str], job_id: Optional[str]):
+    wanted = {k.strip() for k in kinds.split(",") if k.strip()} if kinds else None
+    if wanted and not wanted <= set(CHANGE_KINDS):
+        raise HTTPException(status_code=400, detail=f"kinds must be among {', '.join(CHANGE_KINDS)}")
+
+    def keep(event):
+        if wanted and event["kind"] not in wanted:
+            return False
+        if job_id and event["data"] is not None:
+            return (event["id"] if event["kind"] == "job" else event["data"].get("jobId")) == job_id
+        return True
+    return keep
+
+def change_shape(fields: Optional[str]):
+    wanted = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    if not wanted:
+        return None
+    return lambda event: {**event, "data": project(event["data"], wanted) if event["data"] is not None else None}
+
+@router.get("/changes")
+def get_changes(
+    after: int = Query(0, ge=0),
+    kinds: Optional[str] = None,
+    jobId: Optional[str] = None,
+    fields: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Changes after ``after`` for clients that poll; pass the returned seq back next time.
+
+    ``reset`` means the log no longer reaches back to ``after``: reload
+    the snapshot and continue from ``seq``.
+    """
+    keep, shape = change_filter(kinds, jobId), change_shape(fields)
+    events, seq, reset = change_feed.read(after, limit)
+    events = [shape(e) if shape else e for e in events if keep(e)]
+    return {"seq": seq, "reset": reset, "changes": events}
+
+@router.get("/changes/stream")
+def stream_changes(
+    request: Request,
+    after: Optional[int] = Query(None, ge=0),
+    kinds: Optional[str] = None,
+    jobId: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Server-sent events for application, job and round changes.
+
+    Resumes after the Last-Event-ID header (or ``after``, e.g. a page's
+    X-Change-Seq); without either it starts from now.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+    events = change_feed.stream(after, change_filter(kinds, jobId), change_shape(fields))
+    return StreamingResponse(
+        events, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/changes/stats")
+def change_stats():
+    return change_feed.stats()
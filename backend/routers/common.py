@@ -0,0 +1,59 @@
+from fastapi import UploadFile, HTTPException
+from fastapi.responses import JSONResponse, Response
+
+from storage import get_store
+from cache import content_hash
+from uploads import receive_upload, UploadRejected
+
+# ============================
+# Listing Helpers (pagination, projection, ETags)
+# ============================
+# List responses stay plain JSON arrays; the cursor for the next page
+# travels in the X-Next-Cursor header. ETags are derived from the store's
+# write sequence and the query, so an unchanged poll is answered with a
+# 304 before anything is read or serialised.
+def decode_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def project(record, fields):
+    """Keep only ``fields``; 'structured_data.Full Name' style paths reach one level down"""
+    out = {}
+    for field in fields:
+        if field in record:
+            out[field] = record[field]
+        elif "." in field:
+            parent, child = field.split(".", 1)
+            if isinstance(record.get(parent), dict) and child in record[parent]:
+                out.setdefault(parent, {})[child] = record[parent][child]
+    return out
+
+def paged_response(request, build, fields=None):
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    seq = get_store().write_seq()
+    etag = f'W/"{seq}-{content_hash(request.url.path, query)[:16]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    records, next_cursor = build()
+    if fields:
+        wanted = [f.strip() for f in fields.split(",") if f.strip()]
+        records = [project(r, wanted) for r in records]
+    # The page reflects at least this write; follow /changes/stream?after=<seq> from here
+    headers = {"ETag": etag, "X-Change-Seq": str(seq)}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    return JSONResponse(records, headers=headers)
+
+# ============================
+# Uploads
+# ============================
+async def read_upload(file: UploadFile):
+    try:
+        return await receive_upload(file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
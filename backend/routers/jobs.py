@@ -0,0 +1,73 @@
+from typing import Optional
+from uuid import uuid4
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel
+
+from storage import get_store
+from matching import skill_index
+from routers.common import decode_cursor, paged_response
+
+router = APIRouter(tags=["jobs"])
+
+# ============================
+# Job Posting Feature
+# ============================
+class Job(BaseModel):
+    id: str
+    title: str
+    department: str
+    location: str
+    type: str
+    description: str
+    requirements: Optional[list] = []
+    minSalary: Optional[float] = 0
+    maxSalary: Optional[float] = 0
+    minExperience: Optional[float] = 0
+    maxExperience: Optional[float] = 0
+    education: Optional[list] = []
+    skills: Optional[list] = []
+    benefits: Optional[list] = []
+
+@router.post("/jobs")
+def create_job(job: Job):
+    job.id = str(uuid4())
+    get_store().insert_job(job.dict())
+    return job
+
+@router.get("/jobs")
+def get_jobs(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    def build():
+        return get_store().page_jobs(decode_cursor(cursor), limit)
+    return paged_response(request, build, fields)
+
+@router.post("/jobs", response_model=Job)
+def create_job(job: Job):
+    job_dict = job.dict()
+    job_dict["id"] = str(uuid4())   # generate UUID
+    get_store().insert_job(job_dict)
+    return job_dict
+
+@router.get("/jobs/{job_id}/matches")
+def get_job_matches(job_id: str, k: int = Query(10, ge=1, le=500), applied_only: bool = False):
+    """Top-K candidates for a job by skills overlap, experience range and location"""
+    job = get_store().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    skill_index.sync(get_store())
+    return [
+        {
+            "applicationId": profile["applicationId"],
+            "jobId": profile["jobId"],
+            "name": profile["name"],
+            "score": score,
+            "matchedSkills": matched,
+            "experience": profile["experience"],
+            "location": profile["location"]
+        }
+        for score, profile, matched in skill_index.match(job, k, applied_only)
+    ]
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from resumes import parse_cache, structure_cache, structuring_stats
+from questions import question_bank
+import llm
+import metrics
+import upstream
+
+router = APIRouter(tags=["ops"])
+
+# ============================
+# Health, Metrics & Caches
+# ============================
+@router.get("/")
+def home():
+    return {"message": "HireEase Backend is running."}
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Latency summaries (p50/p95/p99) and counters in Prometheus text format"""
+    body = metrics.registry.render() + upstream.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@router.get("/debug/profile", response_class=PlainTextResponse)
+def sample_profile(seconds: float = Query(5, gt=0, le=60)):
+    """Sample all threads for a few seconds; collapsed stacks for flame graphs (PROFILER_ENABLED=1)"""
+    if not metrics.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiler disabled")
+    return metrics.sample_profile(seconds)
+
+@router.get("/llm/stats")
+def llm_stats():
+    return {**llm.stats(), "structuring": structuring_stats(), "question_warmup_error": question_bank.last_error}
+
+@router.get("/upstreams")
+def upstream_stats():
+    """Pool reuse, retries and circuit breaker state per upstream service"""
+    return upstream.stats()
+
+@router.get("/cache/stats")
+def cache_stats():
+    return [c.stats() for c in (parse_cache, structure_cache)]
+
+@router.delete("/cache/{namespace}")
+def clear_cache(namespace: str):
+    caches = {c.namespace: c for c in (parse_cache, structure_cache)}
+    if namespace not in caches:
+        raise HTTPException(status_code=404, detail="Unknown cache")
+    caches[namespace].clear()
+    return {"message": f"Cache {namespace} cleared"}
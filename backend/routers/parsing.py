@@ -0,0 +1,77 @@
+import os
+import asyncio
+from fastapi import APIRouter, UploadFile, File, HTTPException, Body
+
+from extract import extract_local, EXTRACT_MIN_SCORE
+from llamaparse import upload_file_backend, poll_result, tracker as llamaparse_tracker
+from resumes import parse_cache, parse_jobs_cache, structure_resume_text
+from routers.common import read_upload
+
+router = APIRouter(tags=["parsing"])
+
+LLAMAPARSE_API_KEY = os.getenv("LLAMAPARSE_API_KEY")
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# ============================
+# Original Resume Parsing Endpoints (kept for backward compatibility)
+# ============================
+@router.post("/upload")
+async def upload_resume(file: UploadFile = File(...)):
+    with await read_upload(file) as upload:
+        key = upload.key
+        if parse_cache.get(key) is not None:
+            return {"job_id": f"cache:{key}"}
+        try:
+            # Text-layer PDFs and DOCX files don't need a LlamaParse job. Their
+            # parsers need the document in one piece; nothing else reads it whole.
+            if upload.kind in ("pdf", "docx"):
+                local_text, score, _ = await asyncio.to_thread(extract_local, upload.data)
+                if score >= EXTRACT_MIN_SCORE:
+                    parse_cache.set(key, local_text)
+                    return {"job_id": f"cache:{key}"}
+
+            if not LLAMAPARSE_API_KEY:
+                raise HTTPException(status_code=400, detail="LLAMAPARSE_API_KEY not set")
+            job_id = await asyncio.to_thread(upload_file_backend, upload.stream(), upload.filename, upload.content_type)
+            parse_jobs_cache.set(job_id, key)
+            return {"job_id": job_id}
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/parse/{job_id}")
+def parse_resume(job_id: str):
+    if job_id.startswith("cache:"):
+        parsed_text = parse_cache.get(job_id[len("cache:"):])
+        if parsed_text is None:
+            raise HTTPException(status_code=404, detail="Cached parse expired, please upload again")
+        return {"parsed_text": parsed_text}
+    try:
+        parsed_text = poll_result(job_id)
+        key = parse_jobs_cache.get(job_id)
+        if key:
+            parse_cache.set(key, parsed_text)
+        return {"parsed_text": parsed_text}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/webhooks/llamaparse")
+def llamaparse_webhook(data: dict = Body(...)):
+    """Completion callback from LlamaParse (set LLAMAPARSE_WEBHOOK_URL to enable)"""
+    job_id = data.get("job_id") or data.get("jobId") or data.get("id")
+    if not job_id:
+        raise HTTPException(status_code=400, detail="job_id missing")
+    return {"tracked": llamaparse_tracker.notify(job_id)}
+
+@router.post("/structure")
+def structure_resume(data: dict = Body(...)):
+    if not GEMINI_API_KEY:
+        raise HTTPException(status_code=400, detail="GEMINI_API_KEY not set")
+    text = data.get("text", "")
+    try:
+        structured, _ = structure_resume_text(text)
+        return {"structured": structured}
+    except Exception as e:
+        print("Gemini error:", e)
+        raise HTTPException(status_code=500, detail=str(e))
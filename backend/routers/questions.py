@@ -0,0 +1,48 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from storage import get_store
+from questions import question_bank, QUESTION_MAX_PER_REQUEST, QUESTION_WARM_ROLES
+from routers.analytics import analytics
+import llm
+
+router = APIRouter(tags=["questions"])
+
+# ============================
+# Interview Questions
+# ============================
+def generate_questions(role: str, topic: Optional[str], num_questions: int) -> List[str]:
+    """
+    Interview questions for a role, served from the question bank.
+    Only questions the bank doesn't hold yet go to Gemini, in parallel
+    chunks through the shared LLM gateway.
+    """
+    try:
+        questions = question_bank.get(role, topic, num_questions)
+    except llm.LLMNotConfigured as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        print("Gemini API error:", e)
+        raise HTTPException(status_code=500, detail=f"Gemini API error: {e}")
+    if not questions:
+        raise HTTPException(status_code=500, detail="Gemini API error: Gemini returned empty response")
+    return questions
+
+@router.get("/questions")
+def get_questions(
+    role: str = Query(...),
+    topic: Optional[str] = None,
+    num_questions: int = Query(10, ge=1, le=QUESTION_MAX_PER_REQUEST),
+):
+    return {"role": role, "topic": topic, "questions": generate_questions(role, topic, num_questions)}
+
+@router.get("/questions/bank")
+def question_bank_depth():
+    """How many questions are banked per role/topic"""
+    return question_bank.depth()
+
+def warm_question_bank():
+    """Pre-generate questions for the jobs with the most applications"""
+    stats = analytics()
+    jobs = sorted(get_store().list_jobs(), key=lambda j: -sum(stats.jobs.get(j["id"], {}).values()))
+    question_bank.warm([j["title"] for j in jobs[:QUESTION_WARM_ROLES] if j.get("title")])
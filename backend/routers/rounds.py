@@ -0,0 +1,70 @@
+from typing import List, Optional
+from uuid import uuid4
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from storage import get_store
+
+router = APIRouter(tags=["rounds"])
+
+# ============================
+# Interview Rounds (stored per job in the record store)
+# ============================
+class Round(BaseModel):
+    id: Optional[str] = None
+    jobId: str
+    name: str
+    type: str
+    description: str
+    duration: int
+    order: Optional[int] = None
+    isActive: Optional[bool] = True
+
+class BulkRounds(BaseModel):
+    jobId: str
+    rounds: List[Round]
+
+class RoundOrder(BaseModel):
+    jobId: str
+    roundIds: List[str]
+
+# ============================
+# Rounds CRUD Endpoints
+# ============================
+@router.get("/rounds", response_model=List[Round])
+def get_rounds(job_id: str = Query(...)):
+    return get_store().list_rounds(job_id)
+
+@router.post("/rounds", response_model=Round)
+def create_round(round: Round):
+    """Add a round; with ``order`` it is inserted there and later rounds shift down"""
+    record = round.dict()
+    record["id"] = str(uuid4())
+    return get_store().insert_rounds(round.jobId, [record])[0]
+
+@router.post("/rounds/bulk", response_model=List[Round])
+def create_rounds(payload: BulkRounds):
+    """Create several rounds for one job in a single transaction"""
+    records = [{**r.dict(), "id": str(uuid4())} for r in payload.rounds]
+    return get_store().insert_rounds(payload.jobId, records)
+
+@router.post("/rounds/reorder", response_model=List[Round])
+def reorder_rounds(payload: RoundOrder):
+    """Renumber a job's rounds from the full list of its round ids"""
+    try:
+        return get_store().reorder_rounds(payload.jobId, payload.roundIds)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/rounds/{round_id}", response_model=Round)
+def update_round(round_id: str, round: Round):
+    updated = get_store().update_round(round_id, round.dict(exclude_unset=True))
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Round not found")
+    return updated
+
+@router.delete("/rounds/{round_id}")
+def delete_round(round_id: str):
+    if not get_store().delete_round(round_id):
+        raise HTTPException(status_code=404, detail="Round not found")
+    return {"message": "Round deleted successfully"}
@@ -0,0 +1,73 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+
+from storage import get_store
+from search import resume_search, job_text
+
+router = APIRouter(tags=["search"])
+
+# ============================
+# Semantic Search
+# ============================
+@router.get("/search")
+def search_resumes(
+    q: Optional[str] = None,
+    jobId: Optional[str] = None,
+    k: int = Query(10, ge=1, le=200),
+    appliedOnly: bool = False,
+):
+    """Top-K candidates for a free-text query, or for a job's description and requirements.
+
+    Results are ranked by resume similarity, one entry per candidate (their
+    best-matching application). ``appliedOnly`` keeps applicants to ``jobId``.
+    """
+    if not q and not jobId:
+        raise HTTPException(status_code=400, detail="Pass q or jobId")
+    store = get_store()
+    text = q
+    keep = None
+    if jobId:
+        job = store.get_job(jobId)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        text = f"{q} {job_text(job)}" if q else job_text(job)
+        if appliedOnly:
+            keep = store.application_ids(jobId).__contains__
+    resume_search.sync(store)
+
+    hits = [(i, score) for i, score in resume_search.search(text, k * 3, keep) if score > 0]
+    records = store.get_applications(i for i, _ in hits)
+    results, seen = [], set()
+    for application_id, score in hits:
+        record = records.get(application_id)
+        if not record:
+            continue
+        data = record.get("structured_data") or {}
+        candidate = record.get("candidateId") or application_id
+        if candidate in seen:
+            continue
+        seen.add(candidate)
+        results.append({
+            "applicationId": application_id,
+            "candidateId": record.get("candidateId"),
+            "jobId": record.get("jobId"),
+            "name": data.get("Full Name"),
+            "position": record.get("position") or data.get("Position Applied"),
+            "skills": data.get("Skills"),
+            "score": score,
+        })
+        if len(results) == k:
+            break
+    return results
+
+@router.get("/search/stats")
+def search_stats():
+    resume_search.sync(get_store())
+    return resume_search.stats()
+
+@router.post("/search/reindex")
+def search_reindex():
+    """Vectorise stored applications that have no embedding yet (from their structured data)"""
+    embedded = resume_search.backfill(get_store())
+    resume_search.sync(get_store())
+    return {"embedded": embedded, **resume_search.stats()}
@@ -0,0 +1,133 @@
+import os
+import json
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Body, BackgroundTasks
+from pydantic import BaseModel
+
+from storage import get_store
+from cache import content_hash
+from candidates import candidate_table, FilterError
+from identity import CANDIDATE_COLUMN
+from transitions import check_transition, TransitionError
+from sheets_sync import sheets_outbox
+from routers.applications import apply_transitions
+import metrics
+import upstream
+
+router = APIRouter(tags=["sheets"])
+
+SHEETS_WEBAPP_URL = os.getenv("SHEETS_WEBAPP_URL")
+DEPLOYMENT_ID = os.getenv("DEPLOYMENT_ID")
+BASE_URL = os.getenv("APPS_SCRIPT_URL", "https://script.google.com/macros/s/AKfycbyVdjip5gy69aJzo3dOCWC4LJHcXO7Py-diakM-tNog1dUxKBNYh6RkeGQDp0KBpQEH/exec")
+
+# Marking the sheet is best-effort, so a slow or failing script trips the
+# breaker quickly instead of holding /shortlist workers for the full timeout
+apps_script = upstream.Upstream("apps_script", read_timeout=10, retries=0, failure_threshold=3, cooldown=60)
+
+# ============================
+# Google Sheets Integration
+# ============================
+@metrics.timed("send_to_sheets")
+def send_to_sheets(data: dict, key: Optional[str] = None):
+    """Queue structured JSON for the Apps Script Web App (Sheets).
+
+    Rows are upserted on ``key``; without one the row's own Application ID
+    or a hash of its contents is used, so resubmitting the same row
+    doesn't add a duplicate.
+    """
+    if not SHEETS_WEBAPP_URL:
+        raise ValueError("❌ SHEETS_WEBAPP_URL not set in .env")
+    key = key or data.get("Application ID") or content_hash(json.dumps(data, sort_keys=True).encode())
+    sheets_outbox.enqueue(key, data)
+    return {"queued": True, "key": key, "pending": sheets_outbox.stats()["pending"]}
+
+@router.post("/save")
+def save_to_sheets_endpoint(data: dict = Body(...)):
+    try:
+        result = send_to_sheets(data)
+        return {"result": result}
+    except Exception as e:
+        print("Google Sheets error:", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/sheets/status")
+def sheets_status():
+    """Outbox backlog and lag for the Sheets sync, plus the last shortlist marking"""
+    return {**sheets_outbox.stats(), "last_shortlist": last_shortlist}
+
+# ============================
+# Shortlisting Feature
+# ============================
+class ShortlistRequest(BaseModel):
+    filters: dict = {}
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    # One row per candidate (their latest application) instead of one per application
+    distinct: bool = True
+    # Also move the matching applications to "shortlisted" in our own records,
+    # in one batch before responding (never for empty filters)
+    mirror: bool = True
+
+def shortlist_check(record, changes):
+    if record.get("status") == "shortlisted":
+        raise TransitionError("Already shortlisted")
+    check_transition(record.get("status"), "shortlisted")
+
+def mirror_shortlist(filters: dict):
+    """Move every application matching ``filters`` to "shortlisted" in one batch"""
+    # The sheet marks every matching row, so mirror it per application, not per candidate.
+    # Applications already past shortlisting (or not allowed to move) are left as they are.
+    now = datetime.now().isoformat()
+    updates = [(i, {"status": "shortlisted", "lastUpdate": now}, None)
+               for i in candidate_table.matching_ids(filters)]
+    _, results = apply_transitions(updates, shortlist_check) if updates else (True, [])
+    return {"shortlisted": sum(r["ok"] for r in results), "skipped": sum(not r["ok"] for r in results)}
+
+# Our records are the source of truth, so the mirror is written before
+# /shortlist answers and its counts are in the response. Marking the sheet
+# is best-effort and happens after the response goes out, in a background
+# task; its outcome is kept for /sheets/status.
+last_shortlist = None
+
+def mark_shortlist(filters: dict):
+    """POST SHORTLIST so the sheet gets marked"""
+    global last_shortlist
+    marked = False
+    try:
+        post_response = apps_script.post(BASE_URL, json={"method": "SHORTLIST", "criteria": filters})
+        reply = post_response.json()
+        message = reply.get("message", "Shortlisting done")
+        marked = reply.get("status") != "error"
+    except Exception as e:
+        message = f"Shortlisting error: {e}"
+
+    metrics.registry.inc("shortlist_marks", outcome="marked" if marked else "failed")
+    last_shortlist = {
+        "filters": filters,
+        "marked": marked,
+        "message": message,
+        "finishedAt": datetime.now().isoformat()
+    }
+
+@router.post("/shortlist")
+def shortlist_candidates(payload: ShortlistRequest, background_tasks: BackgroundTasks):
+    # Filter locally against the candidate table instead of the sheet
+    try:
+        candidate_table.sync(get_store())
+        headers, rows, total = candidate_table.query(
+            payload.filters, payload.limit, payload.offset, distinct=CANDIDATE_COLUMN if payload.distinct else None
+        )
+    except FilterError as e:
+        return {"error": f"Error fetching data: {e}"}
+
+    # Empty filters would match every application, so they never mirror
+    local = mirror_shortlist(payload.filters) if payload.mirror and payload.filters else None
+    background_tasks.add_task(mark_shortlist, payload.filters)
+    return {
+        "headers": headers,
+        "rows": rows,
+        "total": total,
+        "local": local,
+        "message": "Sheet marking queued; see /sheets/status for the result"
+    }
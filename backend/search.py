@@ -0,0 +1,309 @@
+import os
+import heapq
+import random
+import threading
+from array import array
+from operator import mul
+from collections import OrderedDict
+
+import embeddings
+from embeddings import get_embedder
+
+np = None  # numpy, imported when the first index is built (see _load_numpy)
+
+# ============================
+# Vector Index & Semantic Search
+# ============================
+# Resume vectors live in one contiguous float32 buffer (row i =
+# application i, 4 bytes per dimension, no per-vector Python objects),
+# which numpy reads in place as a matrix. The buffer doubles in size when
+# it fills. It is rebuilt from the store on startup, not kept on disk. Below
+# SEARCH_IVF_MIN_ROWS vectors a search scans every row exactly. Above it
+# an IVF index takes over: spherical k-means picks ~sqrt(n) centroids, each
+# vector is filed under its nearest centroid, and a query only scores the
+# vectors in its SEARCH_NPROBE closest lists. New vectors are filed as they
+# arrive; the centroids are retrained in a background thread once the index
+# has grown 4x since the last training.
+#
+# Vectors are computed once per application (pipeline "embed" step, bulk
+# ingest) and stored in the record store, and each worker's index syncs
+# from there by write sequence, like the candidate table. With numpy the
+# scoring is one matrix product; without it, plain Python. numpy is only
+# imported once a worker builds an index, not when the app starts.
+SEARCH_IVF_MIN_ROWS = int(os.getenv("SEARCH_IVF_MIN_ROWS", "4096"))
+SEARCH_NPROBE = int(os.getenv("SEARCH_NPROBE", "16"))
+SEARCH_KMEANS_ITERATIONS = int(os.getenv("SEARCH_KMEANS_ITERATIONS", "8"))
+SEARCH_QUERY_CACHE = 256
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # pure-Python scoring; fine for tens of thousands of resumes
+            return None
+        np = numpy
+    return np
+
+
+class VectorIndex:
+    def __init__(self, dim, capacity=1024):
+        _load_numpy()
+        self.dim = dim
+        self.ids = []            # row -> id
+        self.rows = {}           # id -> row
+        self.centroids = None    # list of array('f')
+        self.lists = None        # centroid -> list of rows
+        self.assignment = array("i")
+        self.trained_at = 0
+        self._training = False
+        self._centroid_matrix = None
+        self._capacity = capacity
+        self._buf = bytearray(capacity * dim * 4)
+        self._view = memoryview(self._buf).cast("f")
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ----- writes -----
+    def add(self, item_id, vector):
+        if len(vector) != self.dim:
+            raise ValueError(f"expected {self.dim} dimensions, got {len(vector)}")
+        with self._lock:
+            row = self.rows.get(item_id)
+            if row is None:
+                row = len(self.ids)
+                if row == self._capacity:
+                    self._grow()
+                self.ids.append(item_id)
+                self.rows[item_id] = row
+                self.assignment.append(-1)
+            self._view[row * self.dim:(row + 1) * self.dim] = array("f", vector)
+            if self.lists is not None:
+                self._file(row)
+
+    def _grow(self):
+        old = self._buf
+        self._capacity *= 2
+        self._buf = bytearray(self._capacity * self.dim * 4)
+        self._buf[:len(old)] = old
+        # The old buffer may still back a view a reader holds; it is freed with the last one
+        self._view = memoryview(self._buf).cast("f")
+
+    def _file(self, row):
+        previous = self.assignment[row]
+        if previous >= 0:
+            self.lists[previous].remove(row)
+        nearest = max(range(len(self.centroids)), key=lambda c: _dot(self.centroids[c], self.vector(row)))
+        self.assignment[row] = nearest
+        self.lists[nearest].append(row)
+
+    def vector(self, row):
+        return self._view[row * self.dim:(row + 1) * self.dim]
+
+    def _matrix(self):
+        return np.frombuffer(self._buf, dtype=np.float32, count=len(self.ids) * self.dim).reshape(-1, self.dim)
+
+    # ----- IVF training -----
+    def maybe_train(self):
+        """Start (re)building the IVF lists in the background when the index is
+        big enough or has grown 4x; searches stay exact/old until it's done"""
+        n = len(self.ids)
+        if n < SEARCH_IVF_MIN_ROWS or (self.trained_at and n < 4 * self.trained_at) or self._training:
+            return False
+        self._training = True
+        threading.Thread(target=self._train, args=(n, max(16, int(n ** 0.5))), name="ivf-train", daemon=True).start()
+        return True
+
+    def _train(self, n, k):
+        try:
+            centroids, assignment = (_kmeans_np if np is not None else _kmeans)(self, n, k)
+            with self._lock:
+                self.centroids = centroids
+                self._centroid_matrix = np.array(centroids, dtype=np.float32) if np is not None else None
+                self.assignment = array("i", assignment) + array("i", [-1] * (len(self.ids) - n))
+                self.lists = [[] for _ in range(k)]
+                for row, c in enumerate(assignment):
+                    self.lists[c].append(row)
+                for row in range(n, len(self.ids)):
+                    self._file(row)
+                self.trained_at = n
+        finally:
+            self._training = False
+
+    # ----- queries -----
+    def search(self, query, k=10, nprobe=SEARCH_NPROBE, keep=None):
+        """Top ``k`` (id, cosine score) for a unit query vector; ``keep(id)`` filters"""
+        with self._lock:
+            if not self.ids:
+                return []
+            if self.lists is None:
+                rows = None
+            else:
+                if self._centroid_matrix is not None:
+                    closeness = self._centroid_matrix @ np.asarray(query, dtype=np.float32)
+                    probes = np.argsort(-closeness)[:nprobe].tolist()
+                else:
+                    probes = heapq.nlargest(nprobe, range(len(self.centroids)), key=lambda c: _dot(self.centroids[c], query))
+                rows = [r for c in probes for r in self.lists[c]]
+            if np is not None:
+                return self._search_np(query, k, rows, keep)
+            rows = range(len(self.ids)) if rows is None else rows
+            if keep is not None:
+                rows = (r for r in rows if keep(self.ids[r]))
+            scored = ((_dot(self.vector(r), query), r) for r in rows)
+            return [(self.ids[r], round(s, 4)) for s, r in heapq.nlargest(k, scored)]
+
+    def _search_np(self, query, k, rows, keep):
+        matrix = self._matrix()
+        if keep is not None:
+            rows = [r for r in (range(len(self.ids)) if rows is None else rows) if keep(self.ids[r])]
+        if rows is None:
+            rows = np.arange(len(self.ids))
+            scores = matrix @ np.asarray(query, dtype=np.float32)
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            if not len(rows):
+                return []
+            scores = matrix[rows] @ np.asarray(query, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[rows[i]], round(float(scores[i]), 4)) for i in top]
+
+    def stats(self):
+        return {
+            "vectors": len(self.ids),
+            "dim": self.dim,
+            "bytes": len(self.ids) * self.dim * 4,
+            "lists": len(self.lists) if self.lists is not None else 0,
+            "trained_at": self.trained_at,
+            "numpy": np is not None,
+        }
+
+
+def _kmeans_np(index, n, k):
+    """Spherical k-means on a sample of the first ``n`` rows; returns (centroids, assignment of all n)"""
+    rng = random.Random(0)
+    matrix = index._matrix()[:n]
+    points = matrix[rng.sample(range(n), min(n, k * 32))]
+    centroids = points[rng.sample(range(len(points)), k)].copy()
+    for _ in range(SEARCH_KMEANS_ITERATIONS):
+        nearest = (points @ centroids.T).argmax(axis=1)
+        for c in range(k):
+            members = points[nearest == c]
+            if len(members):
+                centroids[c] = _unit_np(members.sum(axis=0))
+    assignment = np.concatenate([
+        (matrix[start:start + 65536] @ centroids.T).argmax(axis=1) for start in range(0, n, 65536)
+    ])
+    return [array("f", c.tolist()) for c in centroids], assignment.tolist()
+
+
+def _kmeans(index, n, k):
+    rng = random.Random(0)
+    points = [index.vector(r) for r in rng.sample(range(n), min(n, k * 32))]
+    centroids = [array("f", points[i]) for i in rng.sample(range(len(points)), k)]
+    for _ in range(SEARCH_KMEANS_ITERATIONS):
+        sums = [[0.0] * index.dim for _ in range(k)]
+        for p in points:
+            c = max(range(k), key=lambda i: _dot(centroids[i], p))
+            sums[c] = list(map(float.__add__, sums[c], p))
+        centroids = [_unit(s) if any(s) else centroids[i] for i, s in enumerate(sums)]
+    assignment = [max(range(k), key=lambda c: _dot(centroids[c], index.vector(r))) for r in range(n)]
+    return centroids, assignment
+
+
+def _dot(a, b):
+    return sum(map(mul, a, b))
+
+
+def _unit(values):
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return array("f", (v / norm for v in values))
+
+
+def _unit_np(vector):
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def resume_text(record):
+    """Fallback text for applications indexed without their parsed resume"""
+    data = record.get("structured_data") or {}
+    return " ".join(str(v) for k, v in data.items() if k not in ("Email", "Phone", "Candidate ID"))
+
+
+def job_text(job):
+    parts = [job.get("title"), job.get("department"), job.get("description")]
+    for field in ("requirements", "skills"):
+        parts.extend(job.get(field) or [])
+    return " ".join(str(p) for p in parts if p)
+
+
+class ResumeSearch:
+    def __init__(self, embedder=None):
+        self._embedder = embedder
+        self.index = None
+        self.seq = 0
+        self._queries = OrderedDict()   # query text -> vector (small LRU)
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def encode(self, texts):
+        """Unit float32 vectors as bytes, ready for store.put_embeddings"""
+        return [vector.tobytes() for vector in self.embedder.embed(texts)]
+
+    def sync(self, store):
+        """Pull vectors stored since the last sync"""
+        with self._lock:
+            if self.index is None:
+                self.index = VectorIndex(self.embedder.dim)
+            items, seq = store.embeddings_changed_since(self.embedder.name, self.seq)
+            for item_id, blob in items:
+                self.index.add(item_id, array("f", blob))
+            self.seq = seq
+            self.index.maybe_train()
+        return len(items)
+
+    def backfill(self, store, batch_size=500):
+        """Embed stored applications that have no vector yet (from their structured data)"""
+        done, after = 0, 0
+        while after is not None:
+            records, after = store.applications_without_embedding(self.embedder.name, after, batch_size)
+            if records:
+                vectors = self.encode([resume_text(r) for r in records])
+                store.put_embeddings(self.embedder.name, [(r["id"], v) for r, v in zip(records, vectors)])
+                done += len(records)
+        return done
+
+    def query_vector(self, text):
+        with self._lock:
+            vector = self._queries.get(text)
+            if vector is not None:
+                self._queries.move_to_end(text)
+                return vector
+        vector = self.embedder.embed([text])[0]
+        with self._lock:
+            self._queries[text] = vector
+            if len(self._queries) > SEARCH_QUERY_CACHE:
+                self._queries.popitem(last=False)
+        return vector
+
+    def search(self, text, k=10, keep=None):
+        if self.index is None:
+            return []
+        return self.index.search(self.query_vector(text), k, keep=keep)
+
+    def stats(self):
+        stats = self.index.stats() if self.index is not None else {"vectors": 0}
+        return {**stats, "embedder": self.embedder.name, "embedder_fallback": embeddings.fallback_reason, "seq": self.seq}
+
+
+resume_search = ResumeSearch()
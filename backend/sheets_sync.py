@@ -0,0 +1,173 @@
+import os
+import time
+import threading
+
+import metrics
+from storage import get_store
+from upstream import Upstream, UpstreamError
+
+# ============================
+# Google Sheets Outbox
+# ============================
+# Rows bound for the Apps Script web app are written to the store's
+# sheets_outbox table instead of being POSTed inline, so Sheets latency
+# never reaches the request path and unsent rows survive a restart. Each
+# row is keyed by its application id: a newer row for the same
+# application replaces the pending one, and the script upserts on the
+# "Application ID" column, so a retried batch can't duplicate rows.
+#
+# A background thread flushes the outbox whenever SHEETS_BATCH_SIZE rows
+# are waiting or SHEETS_FLUSH_INTERVAL seconds have passed. Failed rows
+# back off exponentially (SHEETS_RETRY_BACKOFF doubling, capped at 10
+# minutes). In the default single mode each row is posted on its own as
+# {"method": "UPSERT", "key": "Application ID", "row": {...}}: the script
+# updates the row with that Application ID, or appends it if there is
+# none, so a newer version of an application replaces its old row.
+# SHEETS_BATCH_MODE=batch sends all due rows in one UPSERT_BATCH instead.
+# A flush never reads the sheet, so it costs O(rows sent) whatever the
+# sheet's size. A row only leaves the outbox when the reply confirms the
+# write (status "success", or an upserted count covering the batch); any
+# other reply, such as the unknown-method message of a script that
+# predates UPSERT, is retried like an error.
+SHEETS_WEBAPP_URL = os.getenv("SHEETS_WEBAPP_URL")
+SHEETS_BATCH_SIZE = int(os.getenv("SHEETS_BATCH_SIZE", "50"))
+SHEETS_FLUSH_INTERVAL = float(os.getenv("SHEETS_FLUSH_INTERVAL", "2"))
+SHEETS_RETRY_BACKOFF = float(os.getenv("SHEETS_RETRY_BACKOFF", "5"))
+SHEETS_BATCH_MODE = os.getenv("SHEETS_BATCH_MODE", "single")
+SHEETS_TIMEOUT = int(os.getenv("SHEETS_TIMEOUT", "30"))
+KEY_COLUMN = "Application ID"
+
+
+def _confirmed(result, rows):
+    if not isinstance(result, dict):
+        return False
+    if isinstance(result.get("upserted"), int):
+        return result["upserted"] >= rows
+    return result.get("status") == "success"
+
+
+class SheetsOutbox:
+    def __init__(self, url=SHEETS_WEBAPP_URL, batch_size=SHEETS_BATCH_SIZE,
+                 flush_interval=SHEETS_FLUSH_INTERVAL, mode=SHEETS_BATCH_MODE):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.mode = mode
+        self.upstream = Upstream("sheets", read_timeout=SHEETS_TIMEOUT, retries=0)
+        self.flushed = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_flush = None
+        self._queued = 0
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, key, data):
+        """Queue ``data`` as the sheet row for ``key`` (usually an application id)"""
+        row = self.row(key, data)
+        get_store().outbox_put(key, row)
+        self.queued(1)
+        return row
+
+    def row(self, key, data):
+        """The sheet row for ``key``, for callers that write it to the outbox themselves"""
+        row = dict(data)
+        row.setdefault("Status", "Applied")
+        row[KEY_COLUMN] = key
+        return row
+
+    def queued(self, count):
+        """Count rows written to the outbox; wakes the flusher once a batch is waiting"""
+        self._queued += count
+        if self._queued >= self.batch_size:
+            self._wake.set()
+
+    # ----- flushing -----
+    def flush(self):
+        """Send everything that is due; returns the number of rows delivered"""
+        if not self.url:
+            return 0
+        sent = 0
+        with self._flush_lock:
+            self._queued = 0
+            while True:
+                due = get_store().outbox_due(self.batch_size)
+                if not due:
+                    break
+                delivered = self._send(due)
+                sent += delivered
+                if delivered < len(due):
+                    break
+        self.last_flush = time.time()
+        return sent
+
+    def _send(self, due):
+        if self.mode == "single":
+            delivered = 0
+            for item in due:
+                delivered += self._post([item], {"method": "UPSERT", "key": KEY_COLUMN, "row": item[1]})
+            return delivered
+        return self._post(due, {"method": "UPSERT_BATCH", "key": KEY_COLUMN, "rows": [row for _, row, _ in due]})
+
+    def _post(self, items, body):
+        store = get_store()
+        try:
+            with metrics.span("sheets_post", mode=self.mode):
+                resp = self.upstream.post(self.url, json=body)
+            result = resp.json()
+            if not _confirmed(result, len(items)):
+                message = result.get("message") if isinstance(result, dict) else None
+                raise ValueError(message or f"Apps Script did not confirm the write: {str(result)[:200]}")
+        except (UpstreamError, ValueError) as e:
+            self.failures += 1
+            self.last_error = str(e)
+            store.outbox_retry(items, str(e), SHEETS_RETRY_BACKOFF)
+            return 0
+        store.outbox_ack(items)
+        self.flushed += len(items)
+        return len(items)
+
+    # ----- background thread -----
+    def start(self):
+        if not self.url or self._thread:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="sheets-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.last_error = str(e)
+        # Last attempt so rows queued just before shutdown aren't held until restart
+        try:
+            self.flush()
+        except Exception as e:
+            self.last_error = str(e)
+
+    def stats(self):
+        return {
+            **get_store().outbox_stats(),
+            "enabled": bool(self.url),
+            "mode": self.mode,
+            "flushed": self.flushed,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_flush": self.last_flush,
+        }
+
+
+sheets_outbox = SheetsOutbox()
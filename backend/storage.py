@@ -0,0 +1,1130 @@
+import os
+import json
+import time
+import queue
+import sqlite3
+import argparse
+import tempfile
+import threading
+from uuid import uuid4
+from datetime import datetime, timedelta
+from concurrent.futures import Future
+
+import metrics
+import identity
+
+# ============================
+# Embedded Record Store
+# ============================
+# Applications and jobs live in a single SQLite database (WAL mode).
+# Each record is stored as a JSON document next to the columns we look
+# it up by, so single-record reads and writes go through an index
+# instead of rewriting the whole JSON file.
+#
+# All writes from one process go through a single GroupCommitter thread,
+# which folds whatever is pending into one transaction (one fsync).
+# Across uvicorn workers SQLite's file lock serialises the commits, and
+# each record carries a version so concurrent updates never silently
+# overwrite each other.
+#
+# The resume fields that describe a person (identity.PROFILE_FIELDS) are
+# kept once per candidate, not once per application. Writing an
+# application's structured_data resolves it to a candidate (see
+# identity.py), stores only the application-specific fields on the
+# application row, and reads join the two back together.
+#
+# Every write to an application, job or round also appends (seq, kind,
+# id, op) rows to the ``changes`` table in the same transaction, so the
+# table is an ordered log of what changed that any worker can tail (see
+# changes.py). Only ids are logged; readers fetch the current records.
+DB_PATH = os.getenv("HIREEASE_DB", "hireease.db")
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "256"))
+GROUP_COMMIT_WAIT = float(os.getenv("GROUP_COMMIT_WAIT", "0.002"))
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "300"))
+APPLICATIONS_FILE = "applications.json"
+JOBS_FILE = "jobs.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id TEXT PRIMARY KEY,
+    job_id TEXT,
+    status TEXT,
+    applied_date TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    seq INTEGER NOT NULL DEFAULT 0,
+    candidate_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications(job_id);
+CREATE INDEX IF NOT EXISTS idx_applications_seq ON applications(seq);
+
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY,
+    signature TEXT,
+    created TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS candidate_keys (
+    key TEXT PRIMARY KEY,
+    candidate_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_keys_candidate ON candidate_keys(candidate_id);
+
+CREATE TABLE IF NOT EXISTS candidate_lsh (
+    bucket TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    PRIMARY KEY (bucket, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_candidate_lsh_candidate ON candidate_lsh(candidate_id);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rounds_job_position ON rounds(job_id, position);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    application_id TEXT,
+    status TEXT NOT NULL,
+    step TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    log TEXT NOT NULL DEFAULT '[]',
+    error TEXT,
+    created TEXT,
+    updated TEXT,
+    not_before REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, created);
+CREATE INDEX IF NOT EXISTS idx_tasks_application_id ON tasks(application_id);
+
+CREATE TABLE IF NOT EXISTS sheets_outbox (
+    row_key TEXT PRIMARY KEY,
+    row TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sheets_outbox_not_before ON sheets_outbox(not_before);
+
+CREATE TABLE IF NOT EXISTS embeddings (
+    id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_embeddings_seq ON embeddings(seq);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    op TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_seq ON changes(seq);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class VersionConflict(Exception):
+    """Raised when a record changed since the caller read it"""
+
+
+class BatchRejected(Exception):
+    """Raised when an atomic batch had a failing item; nothing was written"""
+
+    def __init__(self, results):
+        super().__init__("Batch rolled back")
+        self.results = results
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class GroupCommitter:
+    """Single writer thread that commits pending writes in batches.
+
+    ``submit(fn)`` queues ``fn(conn)`` and returns a Future. The writer
+    drains up to ``max_batch`` queued calls, runs each inside its own
+    savepoint (so one failing write doesn't sink the rest) and commits
+    them all with one COMMIT. Callables in ``listeners`` run after each
+    commit; an error in one is printed and counted, never fatal to the
+    writer.
+    """
+
+    def __init__(self, path, max_batch=GROUP_COMMIT_MAX_BATCH, max_wait=GROUP_COMMIT_WAIT):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.writes = 0
+        self.listeners = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn):
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn):
+        with metrics.span("store_write"):
+            return self.submit(fn).result()
+
+    def _drain(self):
+        batch = [self._queue.get()]
+        try:
+            # Give concurrent writers a moment to pile on before committing
+            while len(batch) < self.max_batch:
+                batch.append(self._queue.get(timeout=self.max_wait))
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        conn = _connect(self.path)
+        while True:
+            batch = self._drain()
+            # This is the only writer: nothing a batch or listener raises may end the loop
+            try:
+                self._commit(conn, batch)
+            except Exception as e:
+                print("Group commit error:", e)
+                metrics.registry.inc("store_writer_errors")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for listener in self.listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    print("Store listener error:", e)
+                    metrics.registry.inc("store_listener_errors")
+
+    def _commit(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future in batch:
+                conn.execute("SAVEPOINT op")
+                try:
+                    results.append((future, fn(conn), None))
+                    conn.execute("RELEASE op")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append((future, None, e))
+            with metrics.span("store_commit"):
+                conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self.batches += 1
+        self.writes += len(batch)
+        metrics.registry.inc("store_commit_batches")
+        metrics.registry.inc("store_commit_writes", len(batch))
+        for future, value, error in results:
+            if future.done():  # cancelled by its caller
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+
+class SQLiteStore:
+    """Indexed record store backed by SQLite.
+
+    Any object exposing the same methods can be passed to ``set_store``
+    to swap the storage backend.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        self.writer = GroupCommitter(path)
+
+    def connection(self):
+        """Return the read connection owned by the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    # ----- applications -----
+    @metrics.timed("store_get_application")
+    def get_application(self, application_id):
+        row = self.connection().execute(
+            f"{APPLICATION_SELECT} WHERE a.id = ?", (application_id,)
+        ).fetchone()
+        return _application(*row) if row else None
+
+    def get_applications(self, application_ids):
+        """Applications by id (missing ids are left out), as a dict"""
+        return self._by_ids(
+            "SELECT a.id, a.data, c.data FROM applications a LEFT JOIN candidates c ON c.id = a.candidate_id "
+            "WHERE a.id IN ({})", application_ids, _application,
+        )
+
+    @metrics.timed("store_changed_since")
+    def applications_changed_since(self, seq):
+        """Return (records written after ``seq``, latest seq) for incremental consumers"""
+        rows = self.connection().execute(
+            "SELECT a.data, c.data, a.seq FROM applications a LEFT JOIN candidates c ON c.id = a.candidate_id "
+            "WHERE a.seq > ? ORDER BY a.seq", (seq,)
+        ).fetchall()
+        return [_application(r[0], r[1]) for r in rows], (rows[-1][2] if rows else seq)
+
+    @metrics.timed("store_list_applications")
+    def list_applications(self, job_id=None):
+        sql = APPLICATION_SELECT
+        params = ()
+        if job_id is not None:
+            sql += " WHERE a.job_id = ?"
+            params = (job_id,)
+        sql += " ORDER BY a.rowid"
+        return [_application(*r) for r in self.connection().execute(sql, params)]
+
+    def application_ids(self, job_id, statuses=None):
+        """Ids of a job's applications (optionally only those in ``statuses``), without loading them"""
+        sql, params = "SELECT id FROM applications WHERE job_id = ?", [job_id]
+        if statuses:
+            sql += f" AND status IN ({', '.join('?' * len(statuses))})"
+            params += list(statuses)
+        return {r[0] for r in self.connection().execute(sql, params)}
+
+    @metrics.timed("store_page_applications")
+    def page_applications(self, job_id=None, statuses=None, applied_from=None, applied_to=None,
+                          after=0, limit=None):
+        """One page of applications in insertion order, as (records, last rowid or None).
+
+        ``after`` is the rowid cursor returned by the previous page; the
+        filters run against the indexed columns, not the JSON documents.
+        """
+        where, params = ["a.rowid > ?"], [after]
+        if job_id is not None:
+            where.append("a.job_id = ?")
+            params.append(job_id)
+        if statuses:
+            where.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if applied_from:
+            where.append("a.applied_date >= ?")
+            params.append(applied_from)
+        if applied_to:
+            where.append("a.applied_date <= ?")
+            params.append(applied_to)
+        return self._page(
+            "SELECT a.rowid, a.data, c.data FROM applications a LEFT JOIN candidates c ON c.id = a.candidate_id "
+            f"WHERE {' AND '.join(where)} ORDER BY a.rowid", params, limit, _application
+        )
+
+    def insert_application(self, record):
+        record.setdefault("version", 1)
+
+        def write(conn):
+            _insert_application(conn, record)
+            return record
+        return self.writer.run(write)
+
+    def insert_applications(self, records, embeddings=None, outbox=None):
+        """Insert many applications in a single transaction.
+
+        ``embeddings`` (model, [(id, vector bytes)]) and ``outbox`` rows
+        [(row key, row)] for them are written in the same transaction, so a
+        failed batch leaves no vectors or Sheets rows behind.
+        """
+        for record in records:
+            record.setdefault("version", 1)
+
+        def write(conn):
+            for record in records:
+                _insert_application(conn, record)
+            if embeddings:
+                _put_embeddings(conn, *embeddings)
+            if outbox:
+                _outbox_put(conn, outbox)
+            return records
+        return self.writer.run(write)
+
+    def update_application(self, application_id, changes, expected_version=None):
+        """Merge ``changes`` into one application and return it (None if missing).
+
+        With ``expected_version`` the update only applies if nobody else
+        wrote the record in between, otherwise VersionConflict is raised.
+        Without it the merge is applied to the latest committed version.
+        """
+        return self.writer.run(lambda conn: _update_application(conn, application_id, changes, expected_version))
+
+    def update_applications(self, updates, check=None, atomic=False):
+        """Apply many (application id, changes, expected version) updates in one transaction.
+
+        ``check(record, changes)`` sees each current record first and may
+        raise ValueError to refuse that update. Returns one (record, error)
+        per update; a failed update leaves its application untouched. With
+        ``atomic`` any failure rolls back the whole batch and raises
+        BatchRejected carrying the results.
+        """
+        def write(conn):
+            results = []
+            for application_id, changes, expected_version in updates:
+                conn.execute("SAVEPOINT item")
+                try:
+                    record = _update_application(conn, application_id, changes, expected_version, check)
+                    if record is None:
+                        raise LookupError(f"Application {application_id} not found")
+                    results.append((record, None))
+                    conn.execute("RELEASE item")
+                except (LookupError, ValueError, VersionConflict) as e:
+                    conn.execute("ROLLBACK TO item")
+                    conn.execute("RELEASE item")
+                    results.append((None, e))
+            if atomic and any(error for _, error in results):
+                raise BatchRejected(results)
+            return results
+        return self.writer.run(write)
+
+    # ----- candidates -----
+    def get_candidate(self, candidate_id):
+        """Shared profile of one candidate plus the ids of their applications"""
+        conn = self.connection()
+        row = conn.execute("SELECT data, created FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        if not row:
+            return None
+        applications = [r[0] for r in conn.execute(
+            "SELECT id FROM applications WHERE candidate_id = ? ORDER BY rowid", (candidate_id,)
+        )]
+        return {"id": candidate_id, "created": row[1], "profile": json.loads(row[0]), "applications": applications}
+
+    def page_candidates(self, after=0, limit=None):
+        return self._page(
+            "SELECT rowid, id, created, data FROM candidates WHERE rowid > ? ORDER BY rowid", [after], limit,
+            lambda candidate_id, created, data: {"id": candidate_id, "created": created, "profile": json.loads(data)},
+        )
+
+    def candidate_stats(self):
+        conn = self.connection()
+        candidates = conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        linked = conn.execute("SELECT COUNT(*) FROM applications WHERE candidate_id IS NOT NULL").fetchone()[0]
+        return {
+            "candidates": candidates,
+            "linked_applications": linked,
+            "unlinked_applications": conn.execute(
+                "SELECT COUNT(*) FROM applications WHERE candidate_id IS NULL"
+            ).fetchone()[0],
+            "applications_per_candidate": round(linked / candidates, 2) if candidates else 0.0,
+        }
+
+    def backfill_candidates(self, batch_size=500):
+        """Link applications written before identity resolution existed; returns how many were linked"""
+        def write(conn, after):
+            rows = conn.execute(
+                "SELECT rowid, data FROM applications WHERE candidate_id IS NULL AND rowid > ? "
+                "AND json_extract(data, '$.structured_data') IS NOT NULL ORDER BY rowid LIMIT ?",
+                (after, batch_size),
+            ).fetchall()
+            count = 0
+            for rowid, data in rows:
+                stored = _attach_candidate(conn, json.loads(data))
+                if stored.get("candidateId"):
+                    conn.execute(
+                        "UPDATE applications SET candidate_id = ?, data = ?, seq = ? WHERE rowid = ?",
+                        (stored["candidateId"], json.dumps(stored), _changed(conn, "application", [stored["id"]]), rowid),
+                    )
+                    count += 1
+            return count, (rows[-1][0] if len(rows) == batch_size else None)
+
+        linked, after = 0, 0
+        while after is not None:
+            count, after = self.writer.run(lambda conn: write(conn, after))
+            linked += count
+        return linked
+
+    # ----- jobs -----
+    def get_job(self, job_id):
+        row = self.connection().execute(
+            "SELECT data FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_jobs(self, job_ids):
+        return self._by_ids("SELECT id, data FROM jobs WHERE id IN ({})", job_ids, json.loads)
+
+    def list_jobs(self):
+        return [json.loads(r[0]) for r in self.connection().execute("SELECT data FROM jobs ORDER BY rowid")]
+
+    def page_jobs(self, after=0, limit=None):
+        return self._page("SELECT rowid, data FROM jobs WHERE rowid > ? ORDER BY rowid", [after], limit)
+
+    def _page(self, sql, params, limit, decode=json.loads):
+        # Fetch one extra row to know whether another page follows
+        if limit:
+            sql += " LIMIT ?"
+            params = [*params, limit + 1]
+        rows = self.connection().execute(sql, params).fetchall()
+        more = bool(limit) and len(rows) > limit
+        rows = rows[:limit] if limit else rows
+        return [decode(*r[1:]) for r in rows], (rows[-1][0] if more else None)
+
+    def _by_ids(self, sql, ids, decode):
+        # ``sql`` selects the id first and has one "{}" for the IN list
+        records, ids = {}, list(ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.connection().execute(sql.format(", ".join("?" * len(chunk))), chunk)
+            records.update((r[0], decode(*r[1:])) for r in rows)
+        return records
+
+    def write_seq(self):
+        """Current store-wide write sequence; changes whenever any record is written"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()
+        return int(row[0]) if row else 0
+
+    def insert_job(self, record):
+        def write(conn):
+            conn.execute(
+                "INSERT INTO jobs (id, data) VALUES (?, ?)",
+                (record["id"], json.dumps(record)),
+            )
+            _changed(conn, "job", [record["id"]])
+            return record
+        return self.writer.run(write)
+
+    # ----- interview rounds -----
+    # A job's rounds are always numbered 1..n by ``order``; every insert,
+    # move or delete renumbers that job's rounds in the same transaction.
+    def list_rounds(self, job_id):
+        rows = self.connection().execute(
+            "SELECT data, position FROM rounds WHERE job_id = ? ORDER BY position", (job_id,)
+        ).fetchall()
+        return [_round(data, position) for data, position in rows]
+
+    def get_rounds(self, round_ids):
+        return self._by_ids("SELECT id, data, position FROM rounds WHERE id IN ({})", round_ids, _round)
+
+    def insert_rounds(self, job_id, records):
+        """Insert rounds for one job; each lands at its ``order`` (or the end) and the rest shift"""
+        def write(conn):
+            ids = _round_ids(conn, job_id)
+            for record in records:
+                record["jobId"] = job_id
+                ids.insert(_slot(record.get("order"), len(ids)), record["id"])
+                conn.execute(
+                    "INSERT INTO rounds (id, job_id, position, data) VALUES (?, ?, 0, ?)",
+                    (record["id"], job_id, json.dumps({k: v for k, v in record.items() if k != "order"})),
+                )
+            positions = _renumber(conn, ids)
+            return [{**r, "order": positions[r["id"]]} for r in records]
+        return self.writer.run(write)
+
+    def update_round(self, round_id, changes):
+        """Merge ``changes`` into a round, moving it if ``order`` changed; None if missing"""
+        def write(conn):
+            row = conn.execute("SELECT job_id, data FROM rounds WHERE id = ?", (round_id,)).fetchone()
+            if not row:
+                return None
+            job_id, record = row[0], json.loads(row[1])
+            record.update({k: v for k, v in changes.items() if k not in ("id", "jobId", "order")})
+            conn.execute("UPDATE rounds SET data = ? WHERE id = ?", (json.dumps(record), round_id))
+            ids = _round_ids(conn, job_id)
+            if changes.get("order") is not None:
+                ids.remove(round_id)
+                ids.insert(_slot(changes["order"], len(ids)), round_id)
+            return _round(json.dumps(record), _renumber(conn, ids)[round_id])
+        return self.writer.run(write)
+
+    def reorder_rounds(self, job_id, round_ids):
+        """Set a job's round order from a full list of its round ids"""
+        def write(conn):
+            current = _round_ids(conn, job_id)
+            if sorted(current) != sorted(round_ids):
+                raise ValueError("round_ids must list every round of the job exactly once")
+            _renumber(conn, list(round_ids))
+            return [_round(d, p) for d, p in conn.execute(
+                "SELECT data, position FROM rounds WHERE job_id = ? ORDER BY position", (job_id,)
+            )]
+        return self.writer.run(write)
+
+    def delete_round(self, round_id):
+        def write(conn):
+            row = conn.execute("SELECT job_id FROM rounds WHERE id = ?", (round_id,)).fetchone()
+            if not row:
+                return False
+            conn.execute("DELETE FROM rounds WHERE id = ?", (round_id,))
+            _changed(conn, "round", [round_id], "delete")
+            _renumber(conn, _round_ids(conn, row[0]))
+            return True
+        return self.writer.run(write)
+
+    # ----- background tasks -----
+    def enqueue_task(self, task_id, application_id, payload, application=None):
+        """Queue a task for ``application_id``.
+
+        A new ``application`` record can be passed to insert it in the same
+        transaction, so there is never an application without its task.
+        """
+        now = datetime.now().isoformat()
+        if application is not None:
+            application.setdefault("version", 1)
+
+        def write(conn):
+            if application is not None:
+                _insert_application(conn, application)
+            conn.execute(
+                "INSERT INTO tasks (id, application_id, status, payload, created, updated) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (task_id, application_id, json.dumps(payload), now, now),
+            )
+        self.writer.run(write)
+
+    def claim_task(self, lease_seconds=TASK_LEASE_SECONDS):
+        """Atomically move the oldest runnable task to running and return it.
+
+        A running task whose worker hasn't touched it within the lease
+        (the worker died or the server restarted) is runnable again. A
+        requeued task waits until its retry backoff has passed.
+        """
+        now = datetime.now()
+        expired = (now - timedelta(seconds=lease_seconds)).isoformat()
+
+        def write(conn):
+            row = conn.execute(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, updated = ? "
+                "WHERE id = (SELECT id FROM tasks WHERE (status = 'queued' AND not_before <= ?) "
+                "OR (status = 'running' AND updated < ?) ORDER BY created LIMIT 1) "
+                "RETURNING id, application_id, attempts, payload, log",
+                (now.isoformat(), time.time(), expired),
+            ).fetchone()
+            if not row:
+                return None
+            return {
+                "id": row[0],
+                "application_id": row[1],
+                "attempts": row[2],
+                "payload": json.loads(row[3]),
+                "log": json.loads(row[4]),
+            }
+        return self.writer.run(write)
+
+    def update_task(self, task_id, **fields):
+        """Set task columns; ``log`` and ``payload`` are JSON-encoded"""
+        fields["updated"] = datetime.now().isoformat()
+        for key in ("log", "payload"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+
+        def write(conn):
+            conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*fields.values(), task_id))
+        self.writer.run(write)
+
+    def retry_task(self, task_id, error, log, backoff):
+        """Requeue a failed attempt; it runs again after ``backoff`` seconds, doubling per attempt (max 10 minutes)"""
+        def write(conn):
+            conn.execute(
+                "UPDATE tasks SET status = 'queued', error = ?, log = ?, updated = ?, "
+                "not_before = ? + MIN(? * (1 << MIN(attempts - 1, 6)), 600) WHERE id = ?",
+                (error, json.dumps(log), datetime.now().isoformat(), time.time(), backoff, task_id),
+            )
+        self.writer.run(write)
+
+    def get_task_for_application(self, application_id):
+        row = self.connection().execute(
+            "SELECT id, status, step, attempts, log, error, created, updated FROM tasks "
+            "WHERE application_id = ? ORDER BY created DESC LIMIT 1",
+            (application_id,),
+        ).fetchone()
+        if not row:
+            return None
+        keys = ("id", "status", "step", "attempts", "log", "error", "created", "updated")
+        task = dict(zip(keys, row))
+        task["log"] = json.loads(task["log"])
+        return task
+
+    # ----- Sheets outbox -----
+    def outbox_put(self, row_key, row):
+        """Queue a row for Sheets; a newer row for the same key replaces the pending one"""
+        self.writer.run(lambda conn: _outbox_put(conn, [(row_key, row)]))
+
+    def outbox_due(self, limit):
+        """Rows ready to send, oldest first, as (row_key, row, updated)"""
+        rows = self.connection().execute(
+            "SELECT row_key, row, updated FROM sheets_outbox WHERE not_before <= ? ORDER BY created LIMIT ?",
+            (time.time(), limit),
+        ).fetchall()
+        return [(key, json.loads(row), updated) for key, row, updated in rows]
+
+    def outbox_ack(self, sent):
+        """Drop sent rows unless they were replaced while in flight"""
+        def write(conn):
+            conn.executemany(
+                "DELETE FROM sheets_outbox WHERE row_key = ? AND updated = ?",
+                [(key, updated) for key, _, updated in sent],
+            )
+        self.writer.run(write)
+
+    def outbox_retry(self, failed, error, backoff):
+        def write(conn):
+            for key, _, _ in failed:
+                conn.execute(
+                    "UPDATE sheets_outbox SET attempts = attempts + 1, last_error = ?, "
+                    "not_before = ? + MIN(? * (1 << MIN(attempts, 6)), 600) WHERE row_key = ?",
+                    (error, time.time(), backoff, key),
+                )
+        self.writer.run(write)
+
+    def outbox_stats(self):
+        count, oldest, failing = self.connection().execute(
+            "SELECT COUNT(*), MIN(created), SUM(attempts > 0) FROM sheets_outbox"
+        ).fetchone()
+        return {
+            "pending": count,
+            "failing": failing or 0,
+            "lag_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+        }
+
+    # ----- embeddings -----
+    # Resume vectors for semantic search, stored as raw float32 bytes and
+    # keyed by application id. ``model`` names the embedder that produced
+    # them, so switching embedders never mixes vector spaces.
+    def put_embeddings(self, model, items):
+        """Store (id, vector bytes) pairs in one transaction"""
+        return self.writer.run(lambda conn: _put_embeddings(conn, model, items))
+
+    def embeddings_changed_since(self, model, seq):
+        """Return ((id, vector bytes) written after ``seq``, latest seq) for one embedder"""
+        rows = self.connection().execute(
+            "SELECT id, vector, seq FROM embeddings WHERE seq > ? AND model = ? ORDER BY seq", (seq, model)
+        ).fetchall()
+        return [(r[0], r[1]) for r in rows], (rows[-1][2] if rows else seq)
+
+    def applications_without_embedding(self, model, after=0, limit=500):
+        """One page of applications with structured data but no ``model`` vector, as (records, last rowid or None)"""
+        return self._page(
+            "SELECT a.rowid, a.data, c.data FROM applications a LEFT JOIN candidates c ON c.id = a.candidate_id "
+            "WHERE a.rowid > ? AND json_extract(a.data, '$.structured_data') IS NOT NULL "
+            "AND NOT EXISTS (SELECT 1 FROM embeddings e WHERE e.id = a.id AND e.model = ?) ORDER BY a.rowid",
+            [after, model], limit, _application,
+        )
+
+    # ----- change log -----
+    def changes_since(self, seq, limit=1000):
+        """(seq, kind, id, op) rows logged after ``seq``, oldest first.
+
+        Stops after about ``limit`` rows but never splits one write's rows.
+        """
+        conn = self.connection()
+        sql, params = "SELECT seq, kind, id, op FROM changes WHERE seq > ?", [seq]
+        row = conn.execute("SELECT seq FROM changes WHERE seq > ? ORDER BY seq LIMIT 1 OFFSET ?", (seq, limit - 1)).fetchone()
+        if row:
+            sql += " AND seq <= ?"
+            params.append(row[0])
+        return conn.execute(sql + " ORDER BY seq, rowid", params).fetchall()
+
+    def changes_floor(self):
+        """Sequence up to which the log may be incomplete (pruned, or written before it existed)"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = 'changes_floor'").fetchone()
+        return int(row[0]) if row else 0
+
+    def prune_changes(self, keep):
+        """Drop all but roughly the newest ``keep`` log rows; returns how many were dropped"""
+        def write(conn):
+            row = conn.execute("SELECT seq FROM changes ORDER BY seq DESC LIMIT 1 OFFSET ?", (keep,)).fetchone()
+            if not row:
+                return 0
+            deleted = conn.execute("DELETE FROM changes WHERE seq <= ?", (row[0],)).rowcount
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('changes_floor', ?)", (row[0],))
+            return deleted
+        return self.writer.run(write)
+
+    # ----- migration -----
+    def import_json(self, applications_file=APPLICATIONS_FILE, jobs_file=JOBS_FILE, force=False):
+        """Import the legacy JSON files once; records already present are skipped"""
+        def write(conn):
+            imported = {"applications": 0, "jobs": 0}
+            done = conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone()
+            if done and not force:
+                return imported
+            for record in _read_json_list(applications_file):
+                imported["applications"] += _insert_application(conn, record, "INSERT OR IGNORE")
+            job_ids = []
+            for record in _read_json_list(jobs_file):
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (id, data) VALUES (?, ?)",
+                    (record["id"], json.dumps(record)),
+                )
+                if cur.rowcount:
+                    job_ids.append(record["id"])
+            imported["jobs"] = len(job_ids)
+            _changed(conn, "job", job_ids)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', '1')")
+            return imported
+        return self.writer.run(write)
+
+    def export_json(self, applications_file=APPLICATIONS_FILE, jobs_file=JOBS_FILE):
+        """Write a consistent JSON snapshot of the store"""
+        atomic_write_json(applications_file, self.list_applications())
+        atomic_write_json(jobs_file, self.list_jobs())
+
+
+def next_seq(conn):
+    """Next value of the store-wide write sequence (call inside a write)"""
+    row = conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'seq' RETURNING value").fetchone()
+    if row:
+        return int(row[0])
+    conn.execute("INSERT INTO meta (key, value) VALUES ('seq', 1)")
+    return 1
+
+
+def _changed(conn, kind, ids, op="upsert"):
+    """Take the next write sequence and log ``ids`` of ``kind`` as changed under it"""
+    seq = next_seq(conn)
+    conn.executemany("INSERT INTO changes (seq, kind, id, op) VALUES (?, ?, ?, ?)", [(seq, kind, i, op) for i in ids])
+    return seq
+
+
+def _round(data, position):
+    return {**json.loads(data), "order": position}
+
+
+def _round_ids(conn, job_id):
+    return [r[0] for r in conn.execute("SELECT id FROM rounds WHERE job_id = ? ORDER BY position", (job_id,))]
+
+
+def _slot(order, count):
+    """List index for a 1-based ``order``; missing or out of range appends"""
+    if not order or order < 1 or order > count:
+        return count
+    return order - 1
+
+
+def _renumber(conn, ids):
+    """Write positions 1..n for ``ids`` in list order; returns id -> position.
+
+    Every write to a job's rounds ends here, so this also logs the change
+    for all of them: their positions may have moved.
+    """
+    positions = {round_id: i for i, round_id in enumerate(ids, 1)}
+    conn.executemany("UPDATE rounds SET position = ? WHERE id = ?", [(p, i) for i, p in positions.items()])
+    _changed(conn, "round", ids)
+    return positions
+
+
+def _insert_application(conn, record, verb="INSERT"):
+    if verb == "INSERT OR IGNORE" and conn.execute(
+        "SELECT 1 FROM applications WHERE id = ?", (record["id"],)
+    ).fetchone():
+        return 0
+    cur = conn.execute(
+        f"{verb} INTO applications (id, job_id, status, applied_date, candidate_id, data, seq) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (*_application_row(_attach_candidate(conn, record)), _changed(conn, "application", [record["id"]])),
+    )
+    _with_candidate_column(record)
+    return cur.rowcount
+
+
+def _update_application(conn, application_id, changes, expected_version=None, check=None):
+    row = conn.execute(
+        "SELECT data, version FROM applications WHERE id = ?", (application_id,)
+    ).fetchone()
+    if not row:
+        return None
+    record, version = json.loads(row[0]), row[1]
+    if expected_version is not None and version != expected_version:
+        raise VersionConflict(
+            f"Application {application_id} is at version {version}, expected {expected_version}"
+        )
+    if check is not None:
+        check(record, changes)
+    if "status" in changes and changes["status"] != record.get("status"):
+        # Keep when each status was entered, for time-in-stage analytics
+        history = record.get("statusHistory") or [{"status": record.get("status"), "at": record.get("appliedDate")}]
+        at = changes.get("lastUpdate") or datetime.now().isoformat()
+        record["statusHistory"] = history + [{"status": changes["status"], "at": at}]
+    record.update(changes)
+    record["version"] = version + 1
+    stored = _attach_candidate(conn, record) if "structured_data" in changes else record
+    _, job_id, status, applied_date, candidate_id, data = _application_row(stored)
+    conn.execute(
+        "UPDATE applications SET job_id = ?, status = ?, applied_date = ?, candidate_id = ?, data = ?, "
+        "version = ?, seq = ? WHERE id = ?",
+        (job_id, status, applied_date, candidate_id, data, version + 1,
+         _changed(conn, "application", [application_id]), application_id),
+    )
+    if candidate_id and "structured_data" not in changes:
+        return _application(data, _candidate_data(conn, candidate_id))
+    return _with_candidate_column(record)
+
+
+def _put_embeddings(conn, model, items):
+    seq = next_seq(conn)
+    conn.executemany(
+        "INSERT OR REPLACE INTO embeddings (id, model, seq, vector) VALUES (?, ?, ?, ?)",
+        [(item_id, model, seq, vector) for item_id, vector in items],
+    )
+    return len(items)
+
+
+def _outbox_put(conn, rows):
+    now = time.time()
+    conn.executemany(
+        "INSERT INTO sheets_outbox (row_key, row, created, updated) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(row_key) DO UPDATE SET row = excluded.row, updated = excluded.updated, "
+        "attempts = 0, not_before = 0",
+        [(row_key, json.dumps(row), now, now) for row_key, row in rows],
+    )
+
+
+def _application_row(record):
+    return (
+        record["id"],
+        record.get("jobId"),
+        record.get("status"),
+        record.get("appliedDate"),
+        record.get("candidateId"),
+        json.dumps(record),
+    )
+
+
+APPLICATION_SELECT = "SELECT a.data, c.data FROM applications a LEFT JOIN candidates c ON c.id = a.candidate_id"
+
+
+def _application(data, candidate_data):
+    """Application record with its candidate's profile merged back into structured_data"""
+    record = json.loads(data)
+    if candidate_data:
+        profile = json.loads(candidate_data)
+        record["structured_data"] = {**profile, **(record.get("structured_data") or {})}
+        _with_candidate_column(record)
+    return record
+
+
+def _with_candidate_column(record):
+    if record.get("candidateId") and isinstance(record.get("structured_data"), dict):
+        record["structured_data"][identity.CANDIDATE_COLUMN] = record["candidateId"]
+    return record
+
+
+def _candidate_data(conn, candidate_id):
+    row = conn.execute("SELECT data FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+    return row[0] if row else None
+
+
+# ============================
+# Candidate Identity Resolution
+# ============================
+def _resolve_candidate(conn, ids):
+    """(candidate id, how it matched) for identity keys, or (None, "new")"""
+    for key in ids["keys"]:
+        row = conn.execute("SELECT candidate_id FROM candidate_keys WHERE key = ?", (key,)).fetchone()
+        if not row:
+            continue
+        if key.startswith("e:"):
+            return row[0], "email"
+        # A shared phone (family, office line) only merges when the emails don't disagree
+        existing = [r[0] for r in conn.execute("SELECT key FROM candidate_keys WHERE candidate_id = ?", (row[0],))]
+        if not identity.conflicts(ids["keys"], existing):
+            return row[0], "phone"
+    # A new email is a new person; only resumes without one are fuzzy-matched
+    if not ids["buckets"] or any(key.startswith("e:") for key in ids["keys"]):
+        return None, "new"
+    shortlist = conn.execute(
+        f"SELECT candidate_id, COUNT(*) AS hits FROM candidate_lsh WHERE bucket IN ({', '.join('?' * len(ids['buckets']))}) "
+        "GROUP BY candidate_id ORDER BY hits DESC LIMIT 5",
+        ids["buckets"],
+    ).fetchall()
+    for candidate_id, _ in shortlist:
+        row = conn.execute("SELECT signature FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        if not row or not row[0]:
+            continue
+        if identity.similarity(ids["signature"], json.loads(row[0])) < identity.IDENTITY_FUZZY_THRESHOLD:
+            continue
+        existing = [r[0] for r in conn.execute("SELECT key FROM candidate_keys WHERE candidate_id = ?", (candidate_id,))]
+        if not identity.conflicts(ids["keys"], existing):
+            return candidate_id, "fuzzy"
+    return None, "new"
+
+
+def _attach_candidate(conn, record):
+    """Resolve ``record`` to a candidate and return the row to store.
+
+    Sets record["candidateId"]; the returned copy carries only the
+    application-specific part of structured_data. The candidate profile
+    takes the newest non-empty value of each field, except that an
+    application resolved onto an existing candidate never replaces that
+    candidate's name or email (identity.IDENTITY_FIELDS).
+    """
+    data = record.get("structured_data")
+    if not isinstance(data, dict):
+        return record
+    profile, rest = identity.split_profile(data)
+    profile = {k: v for k, v in profile.items() if v not in (None, "", [])}
+    if not profile:
+        return record
+
+    candidate_id = record.get("candidateId")
+    old = _candidate_data(conn, candidate_id) if candidate_id else None
+    ids = None
+    if old is None:
+        ids = identity.identity_keys(profile)
+        candidate_id, match = _resolve_candidate(conn, ids)
+        old = _candidate_data(conn, candidate_id) if candidate_id else None
+        record["candidateMatch"] = match
+    old = json.loads(old) if old else None
+    merged = {**(old or {}), **profile}
+    if old and ids is not None:
+        merged.update({k: old[k] for k in identity.IDENTITY_FIELDS if old.get(k) not in (None, "", [])})
+
+    if merged != old:
+        if ids is None or merged != profile:
+            ids = identity.identity_keys(merged)
+        signature = json.dumps(ids["signature"]) if ids["signature"] else None
+        if old is None:
+            candidate_id = candidate_id or str(uuid4())
+            conn.execute(
+                "INSERT INTO candidates (id, signature, created, data) VALUES (?, ?, ?, ?)",
+                (candidate_id, signature, datetime.now().isoformat(), json.dumps(merged)),
+            )
+        else:
+            conn.execute(
+                "UPDATE candidates SET signature = ?, data = ? WHERE id = ?",
+                (signature, json.dumps(merged), candidate_id),
+            )
+            # The other applications now read a different profile; let incremental consumers see them
+            others = [r[0] for r in conn.execute(
+                "SELECT id FROM applications WHERE candidate_id = ? AND id != ?", (candidate_id, record["id"])
+            )]
+            if others:
+                conn.execute(
+                    "UPDATE applications SET seq = ? WHERE candidate_id = ? AND id != ?",
+                    (_changed(conn, "application", others), candidate_id, record["id"]),
+                )
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_keys (key, candidate_id) VALUES (?, ?)",
+            [(key, candidate_id) for key in ids["keys"]],
+        )
+        conn.execute("DELETE FROM candidate_lsh WHERE candidate_id = ?", (candidate_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_lsh (bucket, candidate_id) VALUES (?, ?)",
+            [(bucket, candidate_id) for bucket in ids["buckets"]],
+        )
+
+    record["candidateId"] = candidate_id
+    return {**record, "structured_data": rest}
+
+
+def _migrate(conn):
+    """Bring databases created by older versions up to the current schema"""
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(applications)")}
+    if "candidate_id" not in columns:
+        conn.execute("ALTER TABLE applications ADD COLUMN candidate_id TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_candidate_id ON applications(candidate_id)")
+    if "not_before" not in {r[1] for r in conn.execute("PRAGMA table_info(tasks)")}:
+        conn.execute("ALTER TABLE tasks ADD COLUMN not_before REAL NOT NULL DEFAULT 0")
+    # Writes made before the change log existed aren't in it
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) "
+        "VALUES ('changes_floor', COALESCE((SELECT value FROM meta WHERE key = 'seq'), 0))"
+    )
+
+
+def atomic_write_json(path, data):
+    """Write JSON to a temp file, fsync it and rename it over ``path``.
+
+    Readers see either the old file or the new one, never a truncated mix.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_json_list(path):
+    if not path or not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# ============================
+# Store accessor
+# ============================
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide store, importing legacy JSON and linking
+    pre-existing applications to candidates on first open"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = SQLiteStore()
+                store.import_json()
+                store.backfill_candidates()
+                _store = store
+    return _store
+
+
+def set_store(store):
+    global _store
+    _store = store
+
+
+# ============================
+# One-shot migrator
+# python storage.py --applications applications.json --jobs jobs.json
+# python storage.py --export   (write the store back out as JSON)
+# ============================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import HireEase JSON files into the record store")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--applications", default=APPLICATIONS_FILE)
+    parser.add_argument("--jobs", default=JOBS_FILE)
+    parser.add_argument("--export", action="store_true", help="export the store to the JSON files instead")
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.db)
+    if args.export:
+        store.export_json(args.applications, args.jobs)
+        print(f"✅ Exported {args.db} to {args.applications} and {args.jobs}")
+    else:
+        counts = store.import_json(args.applications, args.jobs, force=True)
+        print(f"✅ Imported {counts['applications']} applications and {counts['jobs']} jobs into {args.db}")
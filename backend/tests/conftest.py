@@ -0,0 +1,31 @@
+import os
+import sys
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A fresh SQLite store, also installed as the process-wide store"""
+    st = storage.SQLiteStore(str(tmp_path / "hireease.db"))
+    storage.set_store(st)
+    yield st
+    storage.set_store(None)
+
+
+def make_application(job_id="j1", status="applied", **structured):
+    """An application record with its structured_data built from keyword fields"""
+    data = {"Full Name": "Ada Lovelace", "Skills": "Python, SQL", "Years of Experience": 3}
+    data.update({key.replace("_", " "): value for key, value in structured.items()})
+    return {
+        "id": str(uuid4()),
+        "jobId": job_id,
+        "status": status,
+        "appliedDate": "2026-01-01T00:00:00",
+        "structured_data": data,
+    }
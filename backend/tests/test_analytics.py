@@ -0,0 +1,24 @@
+from analytics import RecruitmentAnalytics
+from conftest import make_application
+
+
+def test_status_history_records_each_move(store):
+    record = store.insert_application(make_application())
+    store.update_application(record["id"], {"status": "screening", "lastUpdate": "2026-01-02"})
+    history = store.get_application(record["id"])["statusHistory"]
+    assert [h["status"] for h in history] == ["applied", "screening"]
+
+
+def test_sync_moves_a_changed_application_between_counts(store):
+    a, b = store.insert_applications([make_application(job_id="j1"), make_application(job_id="j2")])
+    analytics = RecruitmentAnalytics()
+    assert analytics.sync(store) == 2
+    store.update_application(a["id"], {"status": "hired"})
+    assert analytics.sync(store) == 1
+    assert analytics.statuses == {"applied": 1, "hired": 1}
+    assert analytics.job("j1") == {"jobId": "j1", "total": 1, "statuses": {"hired": 1}}
+    assert analytics.sync(store) == 0
+
+    rebuilt = RecruitmentAnalytics()
+    rebuilt.rebuild(store)
+    assert rebuilt.summary() == analytics.summary()
@@ -0,0 +1,71 @@
+import os
+import time
+
+from cache import DiskCache, content_hash
+
+
+def test_round_trip_and_stats(tmp_path):
+    cache = DiskCache("ns", root=str(tmp_path))
+    key = content_hash("resume", b"bytes")
+    assert cache.get(key) is None
+    cache.set(key, {"text": "hello"})
+    assert cache.get(key) == {"text": "hello"}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = DiskCache("ns", ttl=0, root=str(tmp_path))
+    cache.set("k1", "v")
+    time.sleep(0.01)
+    assert cache.get("k1") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiskCache("ns", max_bytes=10_000, root=str(tmp_path))
+    value = "x" * 3000
+    for i, key in enumerate(("old", "used", "new")):
+        cache.set(key, value)
+        os.utime(cache._entry_path(key), (i, i))
+    cache.get("used")  # touched: now the most recent
+    cache.set("newest", value)
+    assert cache.get("old") is None
+    assert cache.get("used") == value
+    assert cache.evictions >= 1
+    assert cache.stats()["bytes"] <= 10_000
+
+
+def test_size_is_counted_from_disk_on_first_use(tmp_path):
+    DiskCache("ns", root=str(tmp_path)).set("k1", "v" * 100)
+    assert DiskCache("ns", root=str(tmp_path)).stats()["bytes"] > 100
+
+
+def test_version_change_clears_the_namespace(tmp_path):
+    cache = DiskCache("ns", root=str(tmp_path))
+    cache.ensure_version("1")
+    cache.set("k1", "v")
+    cache.ensure_version("1")
+    assert cache.get("k1") == "v"
+    cache.ensure_version("2")
+    assert cache.get("k1") is None
+
+
+def test_other_writers_temp_files_are_not_entries(tmp_path):
+    cache = DiskCache("ns", max_bytes=10, root=str(tmp_path))
+    tmp = os.path.join(cache.path, "k2", "k2.json.123.tmp")
+    os.makedirs(os.path.dirname(tmp))
+    with open(tmp, "w") as f:
+        f.write("x" * 100)
+    assert cache.stats()["bytes"] == 0
+    cache.set("k1", "v")
+    assert os.path.exists(tmp)
+
+
+def test_entry_evicted_after_reading_is_still_a_hit(tmp_path, monkeypatch):
+    cache = DiskCache("ns", root=str(tmp_path))
+    cache.set("k1", "v")
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("k1") == "v"
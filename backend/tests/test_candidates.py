@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from candidates import CandidateTable, FilterError
+from conftest import make_application
+
+
+@pytest.fixture
+def table(store):
+    people = [
+        ("Ada", "Python, SQL", 3, "London"),
+        ("Grace", "COBOL", 10, "Arlington"),
+        ("Linus", "C, Python", 7, "Portland"),
+        ("Margaret", "Assembly", "about 5 years", "Boston"),
+    ]
+    store.insert_applications([
+        make_application(Email=f"{name.lower()}@x.com", Full_Name=name, Skills=skills,
+                         Years_of_Experience=years, Preferred_Location=city)
+        for name, skills, years, city in people
+    ])
+    t = CandidateTable()
+    t.sync(store)
+    return t
+
+
+def names(table, filters, **kwargs):
+    headers, rows, total = table.query(filters, **kwargs)
+    column = headers.index("Full Name")
+    assert total >= len(rows)
+    return [row[column] for row in rows]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"Years of Experience": {">=": 5}}, ["Grace", "Linus", "Margaret"]),
+    ({"Years of Experience": {">": 5}}, ["Grace", "Linus"]),
+    ({"Years of Experience": {"<": 5}}, ["Ada"]),
+    ({"Years of Experience": {"<=": 5}}, ["Ada", "Margaret"]),
+    ({"Years of Experience": {"=": 7}}, ["Linus"]),
+    ({"Years of Experience": {"!=": 7}}, ["Ada", "Grace", "Margaret"]),
+    ({"Skills": {"contains": "python"}}, ["Ada", "Linus"]),
+    ({"Preferred Location": "london"}, ["Ada"]),
+    ({"Preferred Location": {"contains": "port"}}, ["Linus"]),
+    ({"Skills": {"contains": "python"}, "Years of Experience": {">=": 5}}, ["Linus"]),
+])
+def test_operators(table, filters, expected):
+    assert names(table, filters) == expected
+
+
+def test_limit_offset_and_total(table):
+    headers, rows, total = table.query({}, limit=2, offset=1)
+    assert total == 4 and len(rows) == 2
+    assert names(table, {}, limit=2, offset=1) == ["Grace", "Linus"]
+
+
+def test_unknown_column_or_operator(table):
+    with pytest.raises(FilterError):
+        table.query({"Shoe Size": 9})
+    with pytest.raises(FilterError):
+        table.query({"Skills": {"~": "python"}})
+
+
+def test_sync_picks_up_updates(store, table):
+    ada = table.matching_ids({"Full Name": "ada"})[0]
+    store.update_application(ada, {"structured_data": {**store.get_application(ada)["structured_data"], "Skills": "Go"}})
+    table.sync(store)
+    assert names(table, {"Skills": {"contains": "python"}}) == ["Linus"]
+
+
+def test_distinct_keeps_the_newest_row_per_candidate(store, table):
+    store.insert_application(make_application(Email="ada@x.com", Full_Name="Ada", Skills="Python", Position_Applied="Ops"))
+    table.sync(store)
+    assert names(table, {"Full Name": "ada"}) == ["Ada", "Ada"]
+    _, rows, total = table.query({"Full Name": "ada"}, distinct="Candidate ID")
+    assert total == 1
+
+
+def test_changed_since_returns_each_record_once(store):
+    record = store.insert_application(make_application())
+    _, seq = store.applications_changed_since(0)
+    store.update_application(record["id"], {"status": "screening"})
+    store.update_application(record["id"], {"status": "interview"})
+    records, latest = store.applications_changed_since(seq)
+    assert [r["status"] for r in records] == ["interview"]
+    assert latest == store.write_seq()
+
+
+def test_overlapping_syncs_never_apply_an_older_read(store):
+    record = store.insert_application(make_application(Full_Name="Ada"))
+    t = CandidateTable()
+    reads = []
+
+    class SlowStore:
+        def applications_changed_since(self, seq):
+            result = store.applications_changed_since(seq)
+            reads.append(seq)
+            if len(reads) == 1:
+                # A write lands while the first sync is still holding its read
+                store.update_application(record["id"], {"structured_data": {"Full Name": "Augusta"}})
+            return result
+
+    threads = [threading.Thread(target=t.sync, args=(SlowStore(),)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert t.seq == store.write_seq()
+    assert reads[1] > reads[0]
+    assert t.matching_ids({"Full Name": "augusta"}) == [record["id"]]
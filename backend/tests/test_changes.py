@@ -0,0 +1,17 @@
+from conftest import make_application
+
+
+def test_every_write_takes_a_sequence_and_logs_its_ids(store):
+    first, second = make_application(), make_application()
+    store.insert_applications([first, second])
+    store.update_application(first["id"], {"status": "screening"})
+    store.insert_job({"id": "j1", "title": "Dev"})
+
+    changes = store.changes_since(0)
+    assert [(kind, i) for _, kind, i, _ in changes] == [
+        ("application", first["id"]), ("application", second["id"]), ("application", first["id"]), ("job", "j1"),
+    ]
+    seqs = [seq for seq, *_ in changes]
+    assert seqs == sorted(seqs) and len(set(seqs)) == 4
+    assert store.write_seq() == seqs[-1]
+    assert [i for _, _, i, _ in store.changes_since(seqs[1])] == [first["id"], "j1"]
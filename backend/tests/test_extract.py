@@ -0,0 +1,26 @@
+import io
+import zipfile
+
+from extract import extract_docx
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def docx(document_xml):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document_xml)
+    return buf.getvalue()
+
+
+def test_docx_paragraphs_become_lines():
+    xml = f"<w:document {W}><w:body><w:p><w:r><w:t>Ada</w:t></w:r></w:p><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:body></w:document>"
+    assert extract_docx(docx(xml)) == "Ada\nPython"
+
+
+def test_oversized_document_xml_is_not_inflated():
+    padding = " " * 3_000_000
+    data = docx(f"<w:document {W}><w:body><w:p><w:r><w:t>Ada</w:t></w:r></w:p></w:body>{padding}</w:document>")
+    assert len(data) < 100_000
+    assert extract_docx(data, max_bytes=1_000_000) == ""
+    assert extract_docx(data, max_bytes=4_000_000) == "Ada"
@@ -0,0 +1,66 @@
+import identity
+from conftest import make_application
+
+
+def resolve(store, **fields):
+    record = store.insert_application(make_application(**fields))
+    return store.get_application(record["id"])
+
+
+def test_normalised_keys():
+    assert identity.normalize_email("mailto:Ada.Love+cv@GoogleMail.com") == "adalove@gmail.com"
+    assert identity.normalize_email("not an email") is None
+    assert identity.normalize_phone("+91 98765 43210") == identity.normalize_phone("098765 43210")
+    assert identity.normalize_phone("123") is None
+
+
+def test_conflicts_only_when_both_sides_disagree():
+    assert identity.conflicts(["e:a@x.com"], ["e:b@x.com"])
+    assert not identity.conflicts(["e:a@x.com"], ["e:a@x.com", "e:b@x.com"])
+    assert not identity.conflicts(["e:a@x.com"], ["p:5550001111"])
+
+
+def test_same_email_or_phone_is_one_candidate(store):
+    first = resolve(store, Email="Ada.Lovelace@gmail.com", Phone="+44 20 7946 0000")
+    by_email = resolve(store, Email="adalovelace@gmail.com", Full_Name="A. Lovelace")
+    by_phone = resolve(store, Email="", Phone="020 7946 0000", Full_Name="Augusta King")
+    assert by_email["candidateId"] == first["candidateId"] and by_email["candidateMatch"] == "email"
+    assert by_phone["candidateId"] == first["candidateId"] and by_phone["candidateMatch"] == "phone"
+    profile = store.get_candidate(first["candidateId"])["profile"]
+    assert profile["Full Name"] == "Ada Lovelace" and profile["Email"] == "Ada.Lovelace@gmail.com"
+
+
+def test_shared_phone_with_different_emails_stays_apart(store):
+    alice = resolve(store, Email="alice@x.com", Phone="+1 555 123 4567", Full_Name="Alice Smith", Skills="Python")
+    bob = resolve(store, Email="bob@y.com", Phone="+1 555 123 4567", Full_Name="Bob Jones", Skills="Java")
+    assert bob["candidateMatch"] == "new" and bob["candidateId"] != alice["candidateId"]
+    alice = store.get_application(alice["id"])
+    assert alice["structured_data"]["Full Name"] == "Alice Smith"
+    assert alice["structured_data"]["Email"] == "alice@x.com"
+    assert alice["structured_data"]["Skills"] == "Python"
+    assert bob["structured_data"]["Full Name"] == "Bob Jones"
+    assert store.candidate_stats()["candidates"] == 2
+
+
+def test_profile_is_shared_but_application_fields_are_not(store):
+    first = resolve(store, Email="ada@x.com", Position_Applied="Dev")
+    second = resolve(store, Email="ada@x.com", Skills="Rust", Position_Applied="Ops")
+    first = store.get_application(first["id"])
+    assert first["structured_data"]["Skills"] == second["structured_data"]["Skills"] == "Rust"
+    assert first["structured_data"]["Position Applied"] == "Dev"
+    assert second["structured_data"][identity.CANDIDATE_COLUMN] == second["candidateId"]
+
+
+def test_fuzzy_match_only_without_an_email(store):
+    known = resolve(store, Email="", Phone="", Full_Name="Grace Hopper", Skills="COBOL, Fortran")
+    fuzzy = resolve(store, Email="", Phone="", Full_Name="Grace  Hopper", Skills="COBOL, Fortran")
+    assert fuzzy["candidateMatch"] == "fuzzy" and fuzzy["candidateId"] == known["candidateId"]
+
+    emailed = resolve(store, Email="grace@navy.mil", Phone="", Full_Name="Grace Hopper", Skills="COBOL, Fortran")
+    assert emailed["candidateMatch"] == "new" and emailed["candidateId"] != known["candidateId"]
+
+
+def test_fuzzy_match_respects_a_contradicting_phone(store):
+    known = resolve(store, Email="", Phone="5550001111", Full_Name="Grace Hopper", Skills="COBOL, Fortran")
+    other = resolve(store, Email="", Phone="5550002222", Full_Name="Grace Hopper", Skills="COBOL, Fortran")
+    assert other["candidateId"] != known["candidateId"]
@@ -0,0 +1,19 @@
+import io
+import zipfile
+
+from ingest import iter_zip
+
+
+def test_zip_entries_are_capped_and_sniffed():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("bomb.pdf", b"%PDF-" + b"0" * 1_000_000)
+        archive.writestr("renamed.pdf", b"not a pdf")
+        archive.writestr("ok.pdf", b"%PDF-1.4")
+        archive.writestr("notes.txt", b"skipped")
+    buf.seek(0)
+    entries = dict(iter_zip(buf, max_bytes=1024))
+    assert entries["ok.pdf"] == b"%PDF-1.4"
+    assert entries["bomb.pdf"].status_code == 413
+    assert entries["renamed.pdf"].status_code == 415
+    assert "notes.txt" not in entries
@@ -0,0 +1,31 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import llamaparse
+from upstream import UpstreamError
+
+
+def entry():
+    return {"future": Future(), "due": 0, "delay": 0.5, "deadline": time.monotonic() + 60, "in_flight": True}
+
+
+@pytest.mark.parametrize("status, gives_up", [
+    (401, True), (403, True), (404, True),
+    (408, False), (429, False), (503, False), (None, False),
+])
+def test_only_retryable_errors_keep_polling(monkeypatch, status, gives_up):
+    def get(url, **kwargs):
+        raise UpstreamError("llamaparse", "boom", status)
+    monkeypatch.setattr(llamaparse.upstream, "get", get)
+    tracker, job = llamaparse.CompletionTracker(concurrency=1), entry()
+    tracker._pending["job"] = job
+
+    tracker._check("job", job)
+    assert job["future"].done() is gives_up
+    if gives_up:
+        assert job["future"].exception().status_code == status
+        assert tracker.outstanding() == 0
+    else:
+        assert not job["in_flight"] and tracker.outstanding() == 1
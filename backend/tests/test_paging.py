@@ -0,0 +1,63 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from storage import get_store
+from routers.common import paged_response, decode_cursor
+from conftest import make_application
+
+
+def client():
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request, cursor: str = None, limit: int = 2, fields: str = None):
+        return paged_response(request, lambda: get_store().page_applications(after=decode_cursor(cursor), limit=limit), fields)
+    return TestClient(app)
+
+
+def test_cursor_header_walks_every_page(store):
+    ids = [a["id"] for a in store.insert_applications([make_application() for _ in range(5)])]
+    c, seen, cursor = client(), [], None
+    while True:
+        response = c.get("/items", params={"cursor": cursor} if cursor else {})
+        seen += [r["id"] for r in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == ids
+    assert c.get("/items", params={"cursor": "nope"}).status_code == 400
+
+
+def test_etag_answers_304_until_a_write(store):
+    record = store.insert_application(make_application())
+    c = client()
+    first = c.get("/items", params={"fields": "id,status"})
+    assert first.json() == [{"id": record["id"], "status": "applied"}]
+    assert first.headers["X-Change-Seq"] == str(store.write_seq())
+    etag = first.headers["ETag"]
+    assert c.get("/items", params={"fields": "id,status"}, headers={"If-None-Match": etag}).status_code == 304
+    assert c.get("/items", params={"fields": "id"}, headers={"If-None-Match": etag}).status_code == 200
+
+    store.update_application(record["id"], {"status": "screening"})
+    changed = c.get("/items", params={"fields": "id,status"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()[0]["status"] == "screening"
+
+
+# ----- store pages -----
+def test_pages_follow_the_cursor_without_gaps(store):
+    ids = [a["id"] for a in store.insert_applications([make_application(job_id="j1") for _ in range(5)])]
+    store.insert_application(make_application(job_id="j2"))
+    seen, cursor = [], 0
+    while True:
+        records, cursor = store.page_applications(job_id="j1", after=cursor, limit=2)
+        seen += [r["id"] for r in records]
+        if cursor is None:
+            break
+    assert seen == ids
+
+
+def test_page_filters_by_status(store):
+    a, b = store.insert_applications([make_application(), make_application()])
+    store.update_application(b["id"], {"status": "screening"})
+    records, cursor = store.page_applications(statuses=["screening"])
+    assert [r["id"] for r in records] == [b["id"]] and cursor is None
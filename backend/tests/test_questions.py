@@ -0,0 +1,43 @@
+import metrics
+from cache import DiskCache
+from questions import QuestionBank, QUESTION_CHUNK_SIZE
+
+
+def numbered(prompt, generation_config):
+    size = int(prompt.split()[1])
+    angle = prompt.split("emphasising ")[1]
+    return "\n".join(f"{i}. {angle} question {i}?" for i in range(1, size + 1))
+
+
+def test_bank_generates_only_the_shortfall(tmp_path):
+    calls = []
+
+    def generate(prompt, generation_config):
+        calls.append(prompt)
+        return numbered(prompt, generation_config)
+    bank = QuestionBank(DiskCache("questions", root=str(tmp_path)), generate)
+    assert len(bank.get("Dev", None, QUESTION_CHUNK_SIZE + 2)) == QUESTION_CHUNK_SIZE + 2
+    assert len(calls) == 2
+    assert len(bank.get(" dev ", None, 5)) == 5
+    assert len(calls) == 2
+
+    reopened = QuestionBank(DiskCache("questions", root=str(tmp_path)), generate)
+    assert reopened.get("Dev", None, 3) == bank.get("Dev", None, 3)
+    assert len(calls) == 2
+
+
+def test_bank_is_usable_after_shutdown(tmp_path):
+    bank = QuestionBank(DiskCache("questions", root=str(tmp_path)), numbered)
+    bank.get("Dev", None, 2)
+    bank.shutdown()
+    assert len(bank.get("Ops", None, 2)) == 2
+
+
+def test_warm_up_failures_are_counted(tmp_path):
+    def broken(prompt, generation_config):
+        raise RuntimeError("quota")
+    bank = QuestionBank(DiskCache("questions", root=str(tmp_path)), broken)
+    before = metrics.registry.counters[("question_warmup_failures", ())]
+    bank.warm(["Dev", "Ops"], count=2)
+    assert metrics.registry.counters[("question_warmup_failures", ())] == before + 2
+    assert "Ops" in bank.last_error and "quota" in bank.last_error
@@ -0,0 +1,41 @@
+import math
+
+import embeddings
+import metrics
+from search import VectorIndex
+
+
+def unit(*values):
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values]
+
+
+def test_index_grows_and_ranks_by_cosine():
+    index = VectorIndex(dim=3, capacity=2)
+    for i, vector in enumerate([(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0), (1, 0, 1)]):
+        index.add(f"r{i}", unit(*vector))
+    assert len(index) == 5
+    ranked = index.search(unit(1, 0.1, 0), k=3)
+    assert [item_id for item_id, _ in ranked] == ["r0", "r3", "r4"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_re_adding_an_id_replaces_its_vector():
+    index = VectorIndex(dim=2)
+    index.add("a", unit(1, 0))
+    index.add("b", unit(0, 1))
+    index.add("a", unit(0, 1))
+    assert len(index) == 2
+    assert index.search(unit(1, 0), k=1, keep=lambda item_id: item_id != "b")[0][0] == "a"
+    assert [round(v, 4) for v in index.vector(index.rows["a"])] == [0.0, 1.0]
+
+
+def test_missing_model_falls_back_to_hashing(monkeypatch):
+    monkeypatch.setattr(embeddings, "EMBEDDING_MODEL", "no-such-model")
+    monkeypatch.setattr(embeddings, "_embedder", None)
+    monkeypatch.setattr(embeddings, "fallback_reason", None)
+    monkeypatch.setattr(embeddings, "SentenceTransformerEmbedder", lambda name: (_ for _ in ()).throw(ImportError(name)))
+    before = metrics.registry.counters[("embedder_fallback", (("model", "no-such-model"),))]
+    assert isinstance(embeddings.get_embedder(), embeddings.HashingEmbedder)
+    assert metrics.registry.counters[("embedder_fallback", (("model", "no-such-model"),))] == before + 1
+    assert "no-such-model" in embeddings.fallback_reason
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.stub_apps_script import StubAppsScript
+from sheets_sync import SheetsOutbox
+
+
+@pytest.fixture
+def stub():
+    s = StubAppsScript()
+    yield s
+    s.stop()
+
+
+@pytest.mark.parametrize("mode", ["single", "batch"])
+def test_a_changed_row_replaces_the_one_on_the_sheet(store, stub, mode):
+    outbox = SheetsOutbox(url=stub.start(), mode=mode)
+    outbox.enqueue("a1", {"Full Name": "Ada", "Status": "Applied"})
+    outbox.enqueue("a2", {"Full Name": "Grace"})
+    assert outbox.flush() == 2
+    outbox.enqueue("a1", {"Full Name": "Ada", "Status": "Shortlisted"})
+    assert outbox.flush() == 1
+
+    assert [(r["Application ID"], r["Status"]) for r in stub.rows] == [("a1", "Shortlisted"), ("a2", "Applied")]
+    assert outbox.stats()["pending"] == 0
+
+
+def test_unconfirmed_rows_stay_in_the_outbox(store, stub, monkeypatch):
+    monkeypatch.setattr(stub, "handle", lambda body: {"status": "error", "message": "Unknown method"})
+    outbox = SheetsOutbox(url=stub.start())
+    outbox.enqueue("a1", {"Full Name": "Ada"})
+    assert outbox.flush() == 0
+    assert outbox.stats()["pending"] == 1 and outbox.last_error == "Unknown method"
@@ -0,0 +1,53 @@
+import pytest
+
+from storage import VersionConflict
+from conftest import make_application
+
+
+def insert_marker(value):
+    def write(conn):
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (value, "1"))
+        return value
+    return write
+
+
+def fail(conn):
+    conn.execute("INSERT INTO meta (key, value) VALUES ('half-written', '1')")
+    raise RuntimeError("boom")
+
+
+def marker_exists(store, key):
+    return store.connection().execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is not None
+
+
+# ----- group commit -----
+def test_failing_write_rolls_back_only_its_savepoint(store):
+    futures = [store.writer.submit(insert_marker("a")), store.writer.submit(fail), store.writer.submit(insert_marker("b"))]
+    assert futures[0].result() == "a"
+    with pytest.raises(RuntimeError):
+        futures[1].result()
+    assert futures[2].result() == "b"
+    assert marker_exists(store, "a") and marker_exists(store, "b")
+    assert not marker_exists(store, "half-written")
+
+
+def test_raising_listener_does_not_stop_the_writer(store):
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise RuntimeError("listener failed")
+    store.writer.listeners.append(broken)
+    assert store.writer.run(insert_marker("a")) == "a"
+    assert store.writer.run(insert_marker("b")) == "b"
+    assert marker_exists(store, "b") and len(calls) == 2
+
+
+# ----- versions -----
+def test_update_with_stale_version_conflicts(store):
+    record = store.insert_application(make_application())
+    updated = store.update_application(record["id"], {"status": "screening"}, expected_version=1)
+    assert updated["version"] == 2
+    with pytest.raises(VersionConflict):
+        store.update_application(record["id"], {"status": "rejected"}, expected_version=1)
+    assert store.get_application(record["id"])["status"] == "screening"
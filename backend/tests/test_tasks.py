@@ -0,0 +1,70 @@
+import time
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+import metrics
+from pipeline import ResumePipeline, TaskFailed
+from conftest import make_application
+
+
+def test_claimed_task_is_leased_until_it_expires(store):
+    store.enqueue_task("t1", "a1", {"n": 1})
+    task = store.claim_task()
+    assert task["id"] == "t1" and task["attempts"] == 1 and task["payload"] == {"n": 1}
+    assert store.claim_task() is None
+    time.sleep(0.01)
+    again = store.claim_task(lease_seconds=0)
+    assert again["id"] == "t1" and again["attempts"] == 2
+
+
+def test_retried_task_waits_for_its_backoff(store):
+    store.enqueue_task("t1", "a1", {})
+    store.claim_task()
+    store.retry_task("t1", "flaky", ["first try"], backoff=60)
+    assert store.claim_task() is None
+    assert store.get_task_for_application("a1")["status"] == "queued"
+
+    store.enqueue_task("t2", "a2", {})
+    store.claim_task()
+    store.retry_task("t2", "flaky", [], backoff=0)
+    assert store.claim_task()["id"] == "t2"
+
+
+def test_application_and_task_are_written_together(store):
+    record = make_application(status="processing")
+    store.enqueue_task(str(uuid4()), record["id"], {"file_path": "x"}, record)
+    assert store.get_application(record["id"])["status"] == "processing"
+    assert store.get_task_for_application(record["id"])["status"] == "queued"
+
+    with pytest.raises(Exception):
+        store.enqueue_task(str(uuid4()), record["id"], {}, dict(record))
+    assert store.connection().execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1
+
+
+def test_a_raising_on_failure_does_not_stop_the_worker(store):
+    def handler(ctx):
+        if ctx.payload["fail"]:
+            raise TaskFailed("unreadable resume")
+
+    def on_failure(ctx, error):
+        raise RuntimeError("could not record the failure")
+
+    async def run():
+        pipeline = ResumePipeline(handler, on_failure, workers=1)
+        await pipeline.start()
+        await pipeline.submit("a1", {"fail": True})
+        await pipeline.submit("a2", {"fail": False})
+        for _ in range(200):
+            if store.get_task_for_application("a2")["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        await pipeline.stop()
+
+    key = ("pipeline_worker_errors", (("stage", "task"),))
+    before = metrics.registry.counters[key]
+    asyncio.run(run())
+    assert metrics.registry.counters[key] == before + 1
+    assert store.get_task_for_application("a1")["status"] == "failed"
+    assert store.get_task_for_application("a2")["status"] == "done"
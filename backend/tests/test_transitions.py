@@ -0,0 +1,79 @@
+import pytest
+
+from storage import VersionConflict, BatchRejected
+from transitions import check_transition, TransitionError, TRANSITIONS
+from conftest import make_application
+
+
+def test_allowed_moves_pass():
+    check_transition("applied", "screening")
+    check_transition("interview", "interview")
+    check_transition("rejected", "rejected")
+
+
+def test_disallowed_moves_raise():
+    with pytest.raises(TransitionError, match="allowed: nothing"):
+        check_transition("hired", "applied")
+    with pytest.raises(TransitionError):
+        check_transition("applied", "hired")
+
+
+def test_unknown_target_raises_but_legacy_source_moves_anywhere():
+    with pytest.raises(TransitionError, match="Unknown status"):
+        check_transition("applied", "ghosted")
+    check_transition("legacy-status", "offer")
+
+
+def test_every_target_is_a_known_status():
+    for targets in TRANSITIONS.values():
+        assert targets <= set(TRANSITIONS)
+
+
+def test_batch_items_fail_independently(store):
+    a, b = (store.insert_application(make_application()) for _ in range(2))
+    results = store.update_applications([
+        (a["id"], {"status": "screening"}, None),
+        (b["id"], {"status": "screening"}, 99),
+        ("missing", {"status": "screening"}, None),
+    ])
+    assert results[0][1] is None
+    assert isinstance(results[1][1], VersionConflict)
+    assert isinstance(results[2][1], LookupError)
+    assert store.get_application(a["id"])["status"] == "screening"
+    assert store.get_application(b["id"])["status"] == "applied"
+
+
+def test_atomic_batch_rejects_everything(store):
+    a, b = (store.insert_application(make_application()) for _ in range(2))
+    seq = store.write_seq()
+    with pytest.raises(BatchRejected) as rejected:
+        store.update_applications([(a["id"], {"status": "screening"}, None), (b["id"], {"status": "x"}, 99)], atomic=True)
+    assert [error is None for _, error in rejected.value.results] == [True, False]
+    assert store.get_application(a["id"])["status"] == "applied"
+    assert store.write_seq() == seq
+
+
+def test_check_can_refuse_an_update(store):
+    record = store.insert_application(make_application())
+
+    def check(current, changes):
+        raise ValueError("not allowed")
+    (_, error), = store.update_applications([(record["id"], {"status": "hired"}, None)], check=check)
+    assert isinstance(error, ValueError)
+    assert store.get_application(record["id"])["version"] == 1
+
+
+def test_shortlist_mirrors_locally_before_responding(store, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from routers import sheets
+
+    monkeypatch.setattr(sheets, "mark_shortlist", lambda filters: None)
+    app = FastAPI()
+    app.include_router(sheets.router)
+    ada, grace = store.insert_applications([make_application(Full_Name="Ada"), make_application(Full_Name="Grace")])
+
+    body = TestClient(app).post("/shortlist", json={"filters": {"Full Name": "ada"}}).json()
+    assert body["local"] == {"shortlisted": 1, "skipped": 0}
+    assert store.get_application(ada["id"])["status"] == "shortlisted"
+    assert store.get_application(grace["id"])["status"] == "applied"
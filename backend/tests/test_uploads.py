@@ -0,0 +1,74 @@
+import io
+import asyncio
+import zipfile
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from uploads import UploadRejected, check_resume, receive_upload
+from extract import sniff_kind
+
+
+def docx_bytes():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("word/document.xml", "<w:document/>")
+    return buf.getvalue()
+
+
+def plain_zip():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("notes.txt", "hi")
+    return buf.getvalue()
+
+
+def receive(data, filename="cv", max_bytes=1024 * 1024):
+    upload = UploadFile(io.BytesIO(data), filename=filename)
+    return asyncio.run(receive_upload(upload, max_bytes))
+
+
+def test_kind_comes_from_magic_bytes():
+    assert sniff_kind(b"%PDF-1.7") == "pdf"
+    assert sniff_kind(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1") == "doc"
+    assert sniff_kind(b"PK\x03\x04") == "docx"
+    assert sniff_kind(b"hello") is None
+
+
+def test_received_upload_is_hashed_and_typed():
+    with receive(b"%PDF-1.4 resume", filename="resume.txt") as upload:
+        assert upload.kind == "pdf" and upload.size == 15
+        assert upload.data == b"%PDF-1.4 resume"
+    with receive(docx_bytes()) as upload:
+        assert upload.kind == "docx"
+
+
+def test_upload_spool_is_passed_on_without_a_copy():
+    source = io.BytesIO(b"%PDF-1.4 " + b"0" * 600_000)
+    with asyncio.run(receive_upload(UploadFile(source, filename="cv.pdf"))) as upload:
+        assert upload.file is source and upload.size == 600_009
+        stream = upload.stream()
+        assert stream is source and stream.tell() == 0
+
+
+def test_reading_stops_at_the_limit():
+    source = io.BytesIO(b"%PDF-" + b"0" * 5_000_000)
+    with pytest.raises(UploadRejected) as rejected:
+        asyncio.run(receive_upload(UploadFile(source, filename="cv.pdf"), max_bytes=1024))
+    assert rejected.value.status_code == 413
+    assert source.tell() <= 2 * 256 * 1024
+
+
+@pytest.mark.parametrize("data, status", [
+    (b"just text", 415),
+    (plain_zip(), 415),
+    (b"", 400),
+    (b"%PDF-" + b"0" * 2048, 413),
+])
+def test_rejected_uploads(data, status):
+    with pytest.raises(UploadRejected) as rejected:
+        receive(data, max_bytes=1024)
+    assert rejected.value.status_code == status
+    with pytest.raises(UploadRejected) as rejected:
+        check_resume(data, max_bytes=1024)
+    assert rejected.value.status_code == status
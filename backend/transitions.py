@@ -0,0 +1,36 @@
+# ============================
+# Application Status Transitions
+# ============================
+# Which status an application may move to from its current one. Batch
+# mutations (POST /applications/batch, the /shortlist mirror) are checked
+# against this table; the pipeline sets processing/applied/failed itself.
+# "interview" -> "interview" is a move between interview rounds. Staying
+# in the same status is always allowed, and an application whose status
+# predates this table may move anywhere.
+TRANSITIONS = {
+    "processing": {"applied", "failed", "withdrawn"},
+    "failed": {"processing", "applied", "rejected", "withdrawn"},
+    "applied": {"screening", "shortlisted", "interview", "rejected", "withdrawn"},
+    "screening": {"shortlisted", "interview", "rejected", "withdrawn"},
+    "shortlisted": {"screening", "interview", "rejected", "withdrawn"},
+    "interview": {"interview", "offer", "hired", "rejected", "withdrawn"},
+    "offer": {"hired", "rejected", "withdrawn"},
+    "hired": set(),
+    "rejected": {"screening", "shortlisted"},
+    "withdrawn": set(),
+}
+STATUSES = tuple(TRANSITIONS)
+
+
+class TransitionError(ValueError):
+    """Raised for a status change the workflow doesn't allow"""
+
+
+def check_transition(current, new):
+    if new not in TRANSITIONS:
+        raise TransitionError(f"Unknown status '{new}'; expected one of {', '.join(STATUSES)}")
+    if current == new or current not in TRANSITIONS:
+        return
+    if new not in TRANSITIONS[current]:
+        allowed = ", ".join(sorted(TRANSITIONS[current])) or "nothing"
+        raise TransitionError(f"Cannot move from '{current}' to '{new}' (allowed: {allowed})")
@@ -0,0 +1,143 @@
+import io
+import os
+import shutil
+import hashlib
+from uuid import uuid4
+
+from extract import sniff_kind, is_docx
+
+# ============================
+# Resume Uploads
+# ============================
+# Uploaded resumes are read from the request in chunks, with the size
+# limit checked as bytes arrive and the content hash (the same key
+# cache.content_hash would give) computed along the way. The type comes
+# from the file's magic bytes, not its name, so a renamed file is
+# rejected and a resume called "cv" is accepted; a ZIP only counts as
+# DOCX if it contains word/document.xml. The framework has already
+# spooled the body (in memory, then on disk once it is large), so that
+# spool is checked in place and handed on as a stream rather than copied;
+# only /apply/ keeps a copy, because its queued task has to survive
+# restarts and retries.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "doc": "application/msword",
+}
+
+
+class UploadRejected(ValueError):
+    """Raised for uploads that are too large or not a PDF/DOC/DOCX; carries an HTTP status"""
+
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ReceivedUpload:
+    """A received resume over the upload's own spool; close it (or use ``with``) when done"""
+
+    def __init__(self, file, size, key, kind, filename):
+        self.file = file
+        self.size = size
+        self.key = key
+        self.kind = kind
+        self.filename = filename
+
+    @property
+    def content_type(self):
+        return CONTENT_TYPES[self.kind]
+
+    @property
+    def data(self):
+        """The whole upload as bytes, for parsers that need it in one piece"""
+        self.file.seek(0)
+        return self.file.read()
+
+    def stream(self):
+        """The upload rewound to its start, to pass on without reading it into memory"""
+        self.file.seek(0)
+        return self.file
+
+    def save(self, directory):
+        """Write the upload under a fresh unique name; returns (name, path)"""
+        name = f"{uuid4()}.{self.kind}"
+        path = os.path.join(directory, name)
+        self.file.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self.file, f, UPLOAD_CHUNK_SIZE)
+        return name, path
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def too_large(max_bytes):
+    return f"File is larger than the {round(max_bytes / (1024 * 1024), 1):g} MB limit"
+
+
+INVALID_TYPE = "Invalid file type. Please upload PDF, DOC, or DOCX files only."
+
+
+def check_resume(data, max_bytes=MAX_UPLOAD_BYTES):
+    """Kind of a resume already in memory (bulk ingest), with the same checks as receive_upload"""
+    if len(data) > max_bytes:
+        raise UploadRejected(413, too_large(max_bytes))
+    if not data:
+        raise UploadRejected(400, "Empty file")
+    kind = sniff_kind(data[:8])
+    if kind is None or (kind == "docx" and not is_docx(io.BytesIO(data))):
+        raise UploadRejected(415, INVALID_TYPE)
+    return kind
+
+
+async def receive_upload(file, max_bytes=MAX_UPLOAD_BYTES):
+    """Check an UploadFile's size and type and wrap its spool as a ReceivedUpload"""
+    if file.size is not None and file.size > max_bytes:
+        raise UploadRejected(413, too_large(max_bytes))
+    invalid = UploadRejected(415, INVALID_TYPE)
+    h = hashlib.sha256()
+    size = 0
+    kind = None
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if not size:
+            kind = sniff_kind(chunk)
+            if kind is None:
+                raise invalid
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadRejected(413, too_large(max_bytes))
+        h.update(chunk)
+    if not size:
+        raise UploadRejected(400, "Empty file")
+    await file.seek(0)
+    if kind == "docx" and not is_docx(file.file):
+        raise invalid
+    await file.seek(0)
+    h.update(b"\0")
+    return ReceivedUpload(file.file, size, h.hexdigest(), kind, file.filename)
+
+
+def content_length_exceeded(headers, max_bytes=MAX_UPLOAD_BYTES):
+    """True when a declared request body is too large to hold an acceptable upload.
+
+    Lets the server refuse before the multipart body is read at all;
+    64 KB of slack covers the form boundaries and other fields.
+    """
+    try:
+        return int(headers.get("content-length", 0)) > max_bytes + 64 * 1024
+    except ValueError:
+        return False
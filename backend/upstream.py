@@ -0,0 +1,278 @@
+import os
+import time
+import random
+import threading
+
+import metrics
+
+# ============================
+# Upstream HTTP Clients
+# ============================
+# Every call to LlamaParse and the Apps Script web app goes through an
+# Upstream, one per service. Each Upstream keeps a keep-alive connection
+# pool, so a call normally reuses a socket instead of paying DNS, TCP and
+# TLS again. When the h2 package is installed (httpx[http2]) the pool is
+# an httpx client that negotiates HTTP/2 with servers that offer it;
+# otherwise it is a requests Session.
+#
+# Each service has its own connect/read timeouts and a retry budget:
+# retries (idempotent requests, connection errors, 429/5xx only) may add
+# at most UPSTREAM_RETRY_BUDGET extra load on top of first attempts. A
+# circuit breaker opens after ``failure_threshold`` consecutive failures.
+# While open, calls fail immediately with CircuitOpen instead of tying up
+# a worker thread until they time out; after ``cooldown`` seconds a single
+# trial request is let through to decide whether to close it again.
+#
+# Settings can be overridden per service, e.g. UPSTREAM_LLAMAPARSE_READ_TIMEOUT=90.
+# The HTTP library is imported and the pool built on a service's first
+# request, so a worker that never calls it never loads either.
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "auto")
+UPSTREAM_RETRY_BUDGET = float(os.getenv("UPSTREAM_RETRY_BUDGET", "0.2"))
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+REGISTRY = {}
+
+
+class UpstreamError(Exception):
+    """A request to an upstream failed (transport error or bad status)"""
+
+    def __init__(self, service, message, status_code=None):
+        super().__init__(f"{service}: {message}")
+        self.service = service
+        self.status_code = status_code
+
+
+class CircuitOpen(UpstreamError):
+    """Raised without calling the upstream while its circuit breaker is open"""
+
+
+def _setting(service, key, default, cast=float):
+    return cast(os.getenv(f"UPSTREAM_{service.upper()}_{key}", default))
+
+
+def _http2_available():
+    if UPSTREAM_HTTP2 == "0":
+        return False
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            self.trial_in_flight = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    self.times_opened += 1
+                self.opened_at = time.monotonic()
+
+
+class Upstream:
+    def __init__(self, name, connect_timeout=5, read_timeout=30, retries=2, pool_size=10,
+                 failure_threshold=5, cooldown=30):
+        self.name = name
+        self.connect_timeout = _setting(name, "CONNECT_TIMEOUT", connect_timeout)
+        self.read_timeout = _setting(name, "READ_TIMEOUT", read_timeout)
+        self.retries = _setting(name, "RETRIES", retries, int)
+        self.pool_size = _setting(name, "POOL_SIZE", pool_size, int)
+        self.breaker = CircuitBreaker(
+            _setting(name, "FAILURE_THRESHOLD", failure_threshold, int),
+            _setting(name, "COOLDOWN", cooldown),
+        )
+        self._http2 = None
+        self.requests = 0
+        self.attempts = 0
+        self.failures = 0
+        self.rejected = 0
+        self._budget = 10.0  # retry tokens; each first attempt adds UPSTREAM_RETRY_BUDGET
+        self._lock = threading.Lock()
+        self._client = None
+        REGISTRY[name] = self
+
+    # ----- transport -----
+    @property
+    def http2(self):
+        if self._http2 is None:
+            self._http2 = _http2_available()
+        return self._http2
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self):
+        if self.http2:
+            import httpx
+
+            return httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _send(self, method, url, timeout, kwargs):
+        if self.http2:
+            import httpx
+
+            if "data" in kwargs and "files" not in kwargs and not isinstance(kwargs["data"], dict):
+                kwargs["content"] = kwargs.pop("data")
+            try:
+                return self.client.request(method, url, timeout=httpx.Timeout(timeout[1], connect=timeout[0]), **kwargs)
+            except httpx.TransportError as e:
+                raise UpstreamError(self.name, str(e))
+        import requests
+
+        try:
+            return self.client.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            raise UpstreamError(self.name, str(e))
+
+    # ----- requests -----
+    def request(self, method, url, timeout=None, retry=None, **kwargs):
+        """Send a request and return the response; raises UpstreamError on failure.
+
+        ``timeout`` overrides the read timeout for this call. Non-idempotent
+        methods are only retried when ``retry=True``.
+        """
+        method = method.upper()
+        timeout = (self.connect_timeout, timeout or self.read_timeout)
+        may_retry = retry if retry is not None else method in IDEMPOTENT_METHODS
+        with self._lock:
+            self.requests += 1
+            self._budget = min(10.0, self._budget + UPSTREAM_RETRY_BUDGET)
+
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                metrics.registry.inc("upstream_requests", service=self.name, outcome="circuit_open")
+                raise CircuitOpen(self.name, "circuit open, not calling upstream")
+            attempt += 1
+            self.attempts += 1
+            error = None
+            try:
+                with metrics.span("upstream", service=self.name):
+                    resp = self._send(method, url, timeout, dict(kwargs))
+                if resp.status_code >= 400:
+                    error = UpstreamError(self.name, f"HTTP {resp.status_code} for {url}", resp.status_code)
+            except UpstreamError as e:
+                error = e
+
+            # 4xx other than 429 is the caller's problem, not an unhealthy upstream
+            healthy = error is None or (error.status_code is not None and error.status_code < 500 and error.status_code != 429)
+            self.breaker.record(healthy)
+            if error is None:
+                metrics.registry.inc("upstream_requests", service=self.name, outcome="ok")
+                return resp
+            self.failures += 1
+            metrics.registry.inc("upstream_requests", service=self.name, outcome="error")
+            retryable = error.status_code is None or error.status_code in RETRYABLE_STATUS
+            if self.breaker.state != "closed" or not (
+                may_retry and retryable and attempt <= self.retries and self._take_retry_token()
+            ):
+                raise error
+            metrics.registry.inc("upstream_retries", service=self.name)
+            time.sleep(min(0.2 * 2 ** attempt, 5) * random.uniform(0.5, 1.0))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def _take_retry_token(self):
+        with self._lock:
+            if self._budget >= 1:
+                self._budget -= 1
+                return True
+            return False
+
+    # ----- stats -----
+    def connections_opened(self):
+        """New connections made so far (requests transport only)"""
+        if self._client is None or self.http2:
+            return None
+        pools = self._client.get_adapter("http://").poolmanager.pools
+        return sum(getattr(pools[key], "num_connections", 0) for key in pools.keys())
+
+    def stats(self):
+        opened = self.connections_opened()
+        return {
+            "service": self.name,
+            # None until the first request builds the pool
+            "transport": None if self._client is None else "httpx-http2" if self.http2 else "requests",
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "failures": self.failures,
+            "rejected_by_circuit": self.rejected,
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "connections_opened": opened,
+            "connection_reuse": round(1 - opened / self.attempts, 3) if opened is not None and self.attempts else None,
+            "timeouts": {"connect": self.connect_timeout, "read": self.read_timeout},
+            "retries": self.retries,
+        }
+
+
+def stats():
+    return [upstream.stats() for upstream in REGISTRY.values()]
+
+
+def render():
+    """Connection pool gauges in Prometheus text format, appended to /metrics"""
+    lines = ["# TYPE hireease_upstream_connections_opened gauge"]
+    for upstream in REGISTRY.values():
+        opened = upstream.connections_opened()
+        if opened is not None:
+            lines.append(f'hireease_upstream_connections_opened{{service="{upstream.name}"}} {opened}')
+    lines.append("# TYPE hireease_upstream_circuit_open gauge")
+    for upstream in REGISTRY.values():
+        lines.append(f'hireease_upstream_circuit_open{{service="{upstream.name}"}} {int(upstream.breaker.state != "closed")}')
+    return "\n".join(lines) + "\n"
@@ -64,6 +64,9 @@ const initialProfile = {
     resume: "",
 };
 
+// Only the columns the history table shows, not every parsed resume
+const APPLICATION_FIELDS = "id,jobId,position,company,status,appliedDate,lastUpdate,version";
+
 const CandidateDashboard = () => {
     // Profile Management
     const [profile, setProfile] = useState(() => {
@@ -91,19 +94,49 @@ const CandidateDashboard = () => {
     const fileInputRef = useRef(null);
     const [pendingJob, setPendingJob] = useState(null);
 
-    // Load data on mount
+    // Load data on mount, then follow changes instead of re-fetching the list
     useEffect(() => {
         setJobs(mockJobs);
-        loadApplicationsFromBackend();
+        let changes = null;
+        let closed = false;
+        const follow = async () => {
+            const seq = await loadApplicationsFromBackend();
+            if (seq === null || closed) return;
+            changes = new EventSource(
+                `http://localhost:8000/changes/stream?kinds=application&fields=${APPLICATION_FIELDS}&after=${seq}`
+            );
+            changes.addEventListener("change", (e) => {
+                const change = JSON.parse(e.data);
+                setApplications((prev) => {
+                    const rest = prev.filter((app) => app.id !== change.id);
+                    if (change.op === "delete") return rest;
+                    const current = prev.find((app) => app.id === change.id);
+                    return current
+                        ? prev.map((app) => (app.id === change.id ? { ...app, ...change.data } : app))
+                        : [change.data, ...rest];
+                });
+            });
+            // The server no longer has every change since our snapshot
+            changes.addEventListener("reset", () => {
+                changes.close();
+                follow();
+            });
+        };
+        follow();
+        return () => {
+            closed = true;
+            if (changes) changes.close();
+        };
     }, []);
 
-    // Load applications from backend
+    // Load applications from backend; returns the change sequence the list reflects (null if unavailable)
     const loadApplicationsFromBackend = async () => {
         try {
-            const response = await fetch("http://localhost:8000/applications");
+            const response = await fetch(`http://localhost:8000/applications?fields=${APPLICATION_FIELDS}`);
             if (response.ok) {
                 const backendApps = await response.json();
                 setApplications(backendApps);
+                return response.headers.get("X-Change-Seq");
             } else {
                 // Fallback to localStorage if backend is unavailable
                 const storedApps = localStorage.getItem("candidateApplications");
@@ -114,6 +147,7 @@ const CandidateDashboard = () => {
             const storedApps = localStorage.getItem("candidateApplications");
             if (storedApps) setApplications(JSON.parse(storedApps));
         }
+        return null;
     };
 
     useEffect(() => {
@@ -209,23 +243,22 @@ const CandidateDashboard = () => {
                 throw new Error("No application ID returned from server");
             }
 
-            setProcessingStatus("Sending data to Google Sheets...");
-
             const newApplication = {
                 id: applicationId,
                 jobId: pendingJob.id,
                 position: pendingJob.title,
                 company: pendingJob.company,
-                status: "applied",
+                status: result.application.status ?? "applied",
                 appliedDate: new Date().toISOString(),
                 lastUpdate: new Date().toISOString(),
                 structured_data: result?.structured_data ?? null,
                 log: result?.log ?? [] // include backend message log if available
             };
 
-            setApplications([newApplication, ...applications]);
+            // The change feed may already have delivered it
+            setApplications((prev) => [newApplication, ...prev.filter((app) => app.id !== applicationId)]);
             setUploadSuccess(`
-                Application submitted successfully! Your resume has been processed and sent to Google Sheets for ${pendingJob.company}.
+                Application submitted successfully! Your resume for ${pendingJob.company} is being processed.
     `);
 
             if (result?.structured_data) {
@@ -264,7 +297,7 @@ const CandidateDashboard = () => {
     const stats = {
         total: applications.length,
         pending: applications.filter((app) =>
-            ["applied", "screening", "interview"].includes(app.status)
+            ["processing", "applied", "screening", "interview"].includes(app.status)
         ).length,
         hired: applications.filter((app) => app.status === "hired").length,
         rejected: applications.filter((app) => app.status === "rejected").length,
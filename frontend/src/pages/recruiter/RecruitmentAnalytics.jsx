@@ -9,8 +9,8 @@ const RecruitmentAnalytics = () => {
         averageTimeToHire: 0
     });
 
-    // Mock data for analytics
-    const stats = {
+    // Mock data for analytics, replaced by /analytics/summary when the backend is up
+    const [stats, setStats] = useState({
         totalApplications: 1247,
         activeJobs: 12,
         candidatesHired: 89,
@@ -37,7 +37,26 @@ const RecruitmentAnalytics = () => {
             { status: 'Hired', count: 89, percentage: 20 },
             { status: 'Rejected', count: 45, percentage: 10 }
         ]
-    };
+    });
+
+    useEffect(() => {
+        const capitalize = (s) => s.charAt(0).toUpperCase() + s.slice(1);
+        fetch("http://localhost:8000/analytics/summary")
+            .then((res) => (res.ok ? res.json() : null))
+            .then((summary) => {
+                if (!summary || !summary.totalApplications) return;
+                setStats((prev) => ({
+                    ...prev,
+                    totalApplications: summary.totalApplications,
+                    activeJobs: summary.activeJobs,
+                    candidatesHired: summary.candidatesHired,
+                    averageTimeToHire: Math.round(summary.averageDaysToHire ?? 0),
+                    roleDistribution: summary.roleDistribution.length ? summary.roleDistribution : prev.roleDistribution,
+                    statusDistribution: summary.statusDistribution.map((s) => ({ ...s, status: capitalize(s.status) }))
+                }));
+            })
+            .catch(() => {});
+    }, []);
 
     // Animate stats on mount
     useEffect(() => {
@@ -69,7 +88,7 @@ const RecruitmentAnalytics = () => {
 
         setTimeout(() => animateValue(0, stats.averageTimeToHire, 1600, (value) =>
             setAnimatedStats(prev => ({ ...prev, averageTimeToHire: value }))), 800);
-    }, []);
+    }, [stats]);
 
     const maxHires = Math.max(...stats.monthlyHires.map(m => m.count));
     const maxRoleCount = Math.max(...stats.roleDistribution.map(r => r.count));
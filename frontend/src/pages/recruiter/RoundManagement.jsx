@@ -11,10 +11,19 @@ import {
     Calendar,
     MessageCircle,
     UploadCloud,
+    ChevronUp,
+    ChevronDown,
+    Layers,
 } from "lucide-react";
 
 const API_BASE = "http://localhost:8000";
 
+const STANDARD_ROUNDS = [
+    { name: "Resume Screening", type: "screening", description: "Initial screening call", duration: 30 },
+    { name: "Technical Interview", type: "technical", description: "Role-specific technical assessment", duration: 60 },
+    { name: "Final Interview", type: "final", description: "Culture fit and final decision", duration: 45 },
+];
+
 const jobs = [
     { id: "job-1", title: "Senior Frontend Developer", department: "Engineering" },
     { id: "job-2", title: "Product Manager", department: "Product" },
@@ -140,10 +149,28 @@ const RoundManagement = () => {
         setRounds(res.data);
     };
 
-    // Delete round
+    // Delete round (the backend renumbers the remaining rounds)
     const handleDelete = async (id) => {
         await axios.delete(`${API_BASE}/rounds/${id}`);
-        setRounds(rounds.filter((r) => r.id !== id));
+        const res = await axios.get(`${API_BASE}/rounds`, { params: { job_id: selectedJob } });
+        setRounds(res.data);
+    };
+
+    // Move a round up or down; the whole new order is saved in one request
+    const handleMove = async (index, delta) => {
+        const target = index + delta;
+        if (target < 0 || target >= rounds.length) return;
+        const ids = rounds.map((r) => r.id);
+        [ids[index], ids[target]] = [ids[target], ids[index]];
+        const res = await axios.post(`${API_BASE}/rounds/reorder`, { jobId: selectedJob, roundIds: ids });
+        setRounds(res.data);
+    };
+
+    // Create the standard interview rounds in one request
+    const handleAddStandardRounds = async () => {
+        await axios.post(`${API_BASE}/rounds/bulk`, { jobId: selectedJob, rounds: STANDARD_ROUNDS });
+        const res = await axios.get(`${API_BASE}/rounds`, { params: { job_id: selectedJob } });
+        setRounds(res.data);
     };
 
     // Resume upload/parse/structure/save handlers
@@ -350,7 +377,7 @@ const RoundManagement = () => {
                 )}
                 {sheetResult && (
                     <div className="mt-4 text-green-700 font-semibold">
-                        ✅ Data saved to Google Sheets!
+                        ✅ Data queued for Google Sheets!
                         <pre>{JSON.stringify(sheetResult, null, 2)}</pre>
                     </div>
                 )}
@@ -499,7 +526,7 @@ const RoundManagement = () => {
                         </div>
 
                         <div className="divide-y divide-gray-200">
-                            {filteredRounds.map((round) => (
+                            {filteredRounds.map((round, index) => (
                                 <div
                                     key={round.id}
                                     className="p-6 hover:bg-gray-50 transition-colors duration-200"
@@ -549,6 +576,20 @@ const RoundManagement = () => {
                                         </div>
 
                                         <div className="flex items-center space-x-2">
+                                            <button
+                                                onClick={() => handleMove(index, -1)}
+                                                disabled={index === 0}
+                                                className="p-2 text-gray-400 hover:text-blue-600 hover:bg-blue-50 rounded-lg transition-colors duration-200 disabled:opacity-30"
+                                            >
+                                                <ChevronUp className="w-4 h-4" />
+                                            </button>
+                                            <button
+                                                onClick={() => handleMove(index, 1)}
+                                                disabled={index === filteredRounds.length - 1}
+                                                className="p-2 text-gray-400 hover:text-blue-600 hover:bg-blue-50 rounded-lg transition-colors duration-200 disabled:opacity-30"
+                                            >
+                                                <ChevronDown className="w-4 h-4" />
+                                            </button>
                                             <button
                                                 onClick={() => openModal(round)}
                                                 className="p-2 text-gray-400 hover:text-blue-600 hover:bg-blue-50 rounded-lg transition-colors duration-200"
@@ -640,6 +681,21 @@ const RoundManagement = () => {
                         </h3>
 
                         <div className="space-y-3">
+                            <button
+                                onClick={handleAddStandardRounds}
+                                className="w-full flex items-center space-x-3 p-3 text-left hover:bg-gray-50 rounded-lg transition-colors duration-200"
+                            >
+                                <Layers className="w-5 h-5 text-purple-600" />
+                                <div>
+                                    <p className="text-sm font-medium text-gray-900">
+                                        Add Standard Rounds
+                                    </p>
+                                    <p className="text-xs text-gray-500">
+                                        Screening, technical and final in one step
+                                    </p>
+                                </div>
+                            </button>
+
                             <button className="w-full flex items-center space-x-3 p-3 text-left hover:bg-gray-50 rounded-lg transition-colors duration-200">
                                 <Calendar className="w-5 h-5 text-blue-600" />
                                 <div>